@@ -22,84 +22,69 @@ Crie um DataFrame que simule as vendas de uma livraria fictícia.
 3. Adicionar uma coluna com descontos aleatórios e calcular o preço final da compra.
 """
 
-from faker import Faker  # Importa a biblioteca Faker para gerar dados falsos
 import pandas as pd  # Importa a biblioteca Pandas para manipulação de dados
 import numpy as np  # Importa a biblioteca NumPy para operações numéricas
-import random  # Importa a biblioteca Random para geração de números aleatórios
-import matplotlib.pyplot as plt  # Importa a biblioteca Matplotlib para criação de gráficos
+from pychallenges.dtypes import memoryReport  # Importa o relatório de memória
+from pychallenges.pipeline import generateBookSales  # Importa a geração vetorizada de vendas de livros em blocos
+from pychallenges.storage import writeSales  # Importa a função de gravação em CSV (comprimido ou não) ou Parquet
 
-def generateData (numRows = 1500, numCustomer = 1270):
+reportDir = None  # Define a pasta do relatório sem interface (gráfico em PNG/SVG e 'report.html'); None exibe o gráfico na tela
+
+def generateData (numRows = 1500, numCustomer = 1270, rng = None, compact = False):
     """Gera um DataFrame com dados de vendas de livros.
 
     Args:
         numRows (int, optional): Número de linhas a serem geradas no DataFrame. Padrão é 1500.
         numCustomer (int, optional): Número de clientes únicos a serem gerados. Padrão é 1270.
+        rng (numpy.random.Generator, optional): Gerador de números aleatórios. Padrão é um gerador sem seed.
+        compact (bool, optional): Se o DataFrame deve usar categorias e tipos numéricos reduzidos. Padrão é False.
 
     Returns:
         pandas.DataFrame: Um DataFrame contendo dados de vendas de livros.
     """
-    fake = Faker('en_US')  # Inicializa o Faker para gerar dados em inglês (EUA)
-    bookList = ["Competing on Analytics", "Data Science for Business", "The Data Warehouse Toolkit",
-                "Analytics at Work", "Naked Statistics", "Data-Driven", "Winning with Data",
-                "Big Data: A Revolution",
-                "Data Smart", "The Analytics Edge", "Storytelling with Data", 
-                "The Art of Data Science", "Lean Analytics", "Data Strategy",
-                "Predictive Analytics", "Data Science for Executives", "Monetizing Data",
-                "The Data Detective", "Analytics in a Big Data World", "Data Science for Business Leaders"]  # Lista de títulos de livros
-
-    publisherList = ["Harvard Business Review Press", "O'Reilly Media", "Wiley",
-                    "Harvard Business Review Press", "W.W. Norton & Company", "O'Reilly Media", "Wiley",
-                    "Eamon Dolan/Houghton Mifflin Harcourt", "Wiley", "MIT Press", "Wiley",
-                    "O'Reilly Media", "O'Reilly Media", "Kogan Page",
-                    "Wiley", "Columbia Business School Publishing", "Harvard Business Review Press",
-                    "Penguin Books", "Wiley", "O'Reilly Media"]  # Lista de editoras
-
-    authorList = [fake.name() for _ in range(len(bookList))]  # Cria uma lista de nomes de autores usando Faker
-    customerName = [fake.first_name() for _ in range(numCustomer)]  # Cria uma lista de nomes de clientes usando Faker
-
-    randomIds = random.sample(range(1001, 2000), len(bookList))  # Gera IDs aleatórios para os livros
-    booksIds = {book: bookId for book, bookId in zip(bookList, randomIds)}  # Cria um dicionário associando títulos de livros a IDs
-
-    df = pd.DataFrame({'book': np.random.choice(bookList,numRows),
-                        'publisher': np.random.choice(publisherList,numRows),
-                        'author': np.random.choice(authorList,numRows),
-                        'unit_price': np.round(np.random.uniform(25, 250,numRows),2),
-                        'sales_quantity': np.random.randint(1,14,numRows),
-                        'sales_date': np.random.choice(pd.date_range(start = '2024-01-01', end = '2024-12-31')),
-                        'customer': np.random.choice(customerName,numRows),
-                        'birth_date': np.random.choice(pd.date_range(start = '1950-01-01', end = '2009-12-31'))
-                        })  # Cria o DataFrame com dados aleatórios
-
-    df["book_id"] = df["book"].map(booksIds)  # Adiciona a coluna 'book_id' mapeando os títulos dos livros para seus IDs
-    df["sales_value"] = df["sales_quantity"]*df["unit_price"]  # Calcula o valor total das vendas
-    df["%_discount"] = np.round(np.random.uniform(0, 10,numRows),1)  # Gera descontos aleatórios
-    df["total_price"] = np.round((df["sales_quantity"]*df["unit_price"])*(1-df["%_discount"]/100),2)  # Calcula o preço total após o desconto
+    chunks = generateBookSales(numRows, numCustomer, rng, compact=compact)  # Cria o gerador de vendas em blocos
+    df = pd.concat(chunks, ignore_index = True)  # Junta os blocos em um único DataFrame
 
     return df  # Retorna o DataFrame gerado
 
-df = generateData()  # Gera os dados chamando a função generateData()
-df.to_csv('C:/Users/santo/Documents/dataBases/salesBooks.csv', index = False)  # Salva o DataFrame em um arquivo CSV
-print("\nExemplo dos dados:")
-print(df.head())  # Imprime as primeiras linhas do DataFrame
-print("\nArquivo carregado com sucesso")
-
-salesBook = df  # Atribui o DataFrame 'df' à variável 'salesBook'
-totalQuant = salesBook.groupby('book')['sales_quantity'].sum()  # Agrupa os dados por livro e soma a quantidade vendida
-sortBook = totalQuant.sort_values(ascending = False)  # Ordena os livros por quantidade vendida em ordem decrescente
-bookRank10 = sortBook[:10]  # Seleciona os 10 livros mais vendidos
-print("\nTOP 10 Livros mais vendidos\n")
-print(bookRank10)  # Imprime os 10 livros mais vendidos
-
-plt.figure(figsize=(12, 6))  # Define o tamanho da figura do gráfico
-bars = plt.bar(totalQuant.index, totalQuant.values, color='skyblue')  # Cria um gráfico de barras com os dados de vendas
-plt.xlabel('Book Title')  # Define o rótulo do eixo x
-plt.ylabel('Total Sales Quantity')  # Define o rótulo do eixo y
-plt.title('Total Sales Quantity by Book')  # Define o título do gráfico
-plt.xticks(rotation=90, ha='right')  # Rotaciona os rótulos do eixo x para melhor legibilidade
-plt.tight_layout()  # Ajusta o layout do gráfico para evitar sobreposição
-
-for bar in bars:  # Itera sobre cada barra no gráfico
-    yval = bar.get_height()  # Obtém a altura da barra
-    plt.text(bar.get_x() + bar.get_width()/2, yval, str(int(yval)), ha='center', va='bottom')  # Adiciona o valor da barra acima dela
-
-plt.show()  # Exibe o gráfico
\ No newline at end of file
+def main():
+    """Executa o desafio: gera, grava e analisa as vendas da livraria."""
+    df = generateData(rng = np.random.default_rng(42), compact = True)  # Gera os dados chamando a função generateData() com um seed fixo, na representação compacta
+    outputPath = 'salesBooks.csv'  # Define o arquivo de saída: '.csv', '.csv.gz' ou uma pasta '.parquet' particionada por mês
+    writeStats = writeSales([df], outputPath)  # Salva o DataFrame no formato definido pela extensão
+    print(f"\nArquivo {outputPath}: {writeStats['bytes'] / 1024:.1f} KB em {writeStats['seconds']:.2f}s")  # Exibe o tamanho e a duração da gravação
+    print("\nExemplo dos dados:")
+    print(df.head())  # Imprime as primeiras linhas do DataFrame
+    print("\nArquivo carregado com sucesso")
+    print("\nMemória por coluna:")
+    print(memoryReport(df))  # Imprime o tipo e a memória de cada coluna
+
+    salesBook = df  # Atribui o DataFrame 'df' à variável 'salesBook'
+    totalQuant = salesBook.groupby('book', observed = True)['sales_quantity'].sum()  # Agrupa os dados por livro e soma a quantidade vendida
+    sortBook = totalQuant.sort_values(ascending = False)  # Ordena os livros por quantidade vendida em ordem decrescente
+    bookRank10 = sortBook[:10]  # Seleciona os 10 livros mais vendidos
+    print("\nTOP 10 Livros mais vendidos\n")
+    print(bookRank10)  # Imprime os 10 livros mais vendidos
+
+    if reportDir is not None:  # Verifica se o gráfico deve ser gravado sem interface
+        from pychallenges.render import renderReport  # Importa a renderização sem interface apenas quando usada (importa o Matplotlib)
+
+        rendered = renderReport(reportDir, bookTotals=totalQuant, formats=('png', 'svg'))  # Desenha o gráfico (reaproveitando o cache) e grava o relatório único
+        print(f"\nRelatório gravado em {rendered['bundle']} em {rendered['seconds']:.2f}s")  # Exibe o caminho do relatório
+        return  # Termina sem abrir janelas
+
+    import matplotlib.pyplot as plt  # Importa a biblioteca Matplotlib apenas ao exibir o gráfico (a importação é lenta)
+
+    plt.figure(figsize=(12, 6))  # Define o tamanho da figura do gráfico
+    bars = plt.bar(totalQuant.index, totalQuant.values, color='skyblue')  # Cria um gráfico de barras com os dados de vendas
+    plt.xlabel('Book Title')  # Define o rótulo do eixo x
+    plt.ylabel('Total Sales Quantity')  # Define o rótulo do eixo y
+    plt.title('Total Sales Quantity by Book')  # Define o título do gráfico
+    plt.xticks(rotation=90, ha='right')  # Rotaciona os rótulos do eixo x para melhor legibilidade
+    plt.bar_label(bars, fmt='%d')  # Adiciona o valor de todas as barras em uma única chamada
+    plt.tight_layout()  # Ajusta o layout do gráfico para evitar sobreposição
+
+    plt.show()  # Exibe o gráfico
+
+if __name__ == '__main__':
+    main()  # Executa o desafio apenas quando o script é executado diretamente
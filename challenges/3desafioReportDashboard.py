@@ -24,147 +24,175 @@ Agora, crie um dashboard interativo usando Streamlit para visualizar os dados de
         III. Tabela interativa com os clientes VIPs.
 """
 
-import pandas as pd  # Importa a biblioteca Pandas para manipulação de dados
-import sqlite3  # Importa a biblioteca SQLite para interação com bancos de dados SQLite
+import sys  # Importa a biblioteca sys para ler o banco de dados informado ao Streamlit
+import time  # Importa a biblioteca time para medir a latência da página
+from concurrent.futures import as_completed  # Importa a função que entrega as consultas na ordem em que terminam
+
 import streamlit as st  # Importa a biblioteca Streamlit para criação de aplicativos web
+from pychallenges.cache import CachedQueryRunner  # Importa o executor de consultas com conexão compartilhada e cache
+from pychallenges.instrumentation import QueryLog  # Importa o registro de medições e de consultas lentas
+from pychallenges.pool import enableWal  # Importa a função que coloca o banco em modo WAL
+from pychallenges.queries import availableMonths, buildWhereClause, monthRange, renderQuery, yearRange  # Importa as consultas SQL e os construtores de filtros de período
+from pychallenges.rollups import rollupsFresh  # Importa a função que verifica se os rollups estão atualizados
+from pychallenges.schema import migrateDateColumns, salesSource  # Importa as funções de atualização do banco e de origem das vendas
+
+slowQuerySeconds = 0.2  # Define a duração a partir da qual uma consulta vai para o registro de consultas lentas
+queryPoolSize = 4  # Define o número de conexões somente leitura usadas pelas consultas concorrentes
 
-conn = sqlite3.connect('salesEcommerce.db')  # Conecta ao banco de dados SQLite 'salesEcommerce.db'
-cursor = conn.cursor()  # Cria um cursor para executar comandos SQL
-
-# Define um dicionário com consultas SQL para diferentes análises
-dicQueries = {
-    "queryTopCustomers": '''
-        SELECT customer, SUM(sales_quantity) AS sum_quantity
-        FROM sales
-        GROUP BY customer
-        ORDER BY SUM(sales_quantity) DESC
-        LIMIT 10
-    ''',  # Consulta para obter os 10 clientes que mais compraram em quantidade
-    "queryTopProducts": '''
-        SELECT product, SUM(total_price) AS total_revenue
-        FROM sales
-        GROUP BY product
-        ORDER BY SUM(total_price) DESC
-        LIMIT 5
-    ''',  # Consulta para obter os 5 produtos que geraram mais receita
-    "queryAvgPriceCategory": '''
-        SELECT category, ROUND(AVG(total_price), 2) AS avg_price
-        FROM sales
-        GROUP BY category
-        ORDER BY AVG(total_price) DESC
-    ''',  # Consulta para obter o preço médio gasto por categoria
-    "queryHalfYear": '''
-        SELECT CASE 
-            WHEN STRFTIME('%m', sales_date) BETWEEN '01' AND '06' THEN 'first half-year'
-            WHEN STRFTIME('%m', sales_date) BETWEEN '07' AND '12' THEN 'second half-year'
-        END AS half_year, ROUND(SUM(total_price), 2) AS total_revenue
-        FROM sales
-        WHERE STRFTIME('%Y', sales_date) = '2024'
-        GROUP BY half_year
-        ORDER BY half_year
-    '''  # Consulta para comparar o faturamento entre o primeiro e o segundo semestre de 2024
-}
-
-def runQuery(queryKey, params=()):
-    """Executa uma consulta SQL e retorna o resultado como um DataFrame.
+@st.cache_resource
+def getRunner(dbPath='salesEcommerce.db', slowSeconds=slowQuerySeconds, poolSize=queryPoolSize):
+    """Cria uma única vez o executor de consultas compartilhado entre execuções e usuários.
 
     Args:
-        queryKey (str): Chave da consulta no dicionário `dicQueries`.
-        params (tuple, optional): Parâmetros para a consulta SQL. Padrão é ().
+        dbPath (str, optional): Caminho do banco de dados SQLite. Padrão é 'salesEcommerce.db'.
+        slowSeconds (float, optional): Limite de consulta lenta em segundos. Padrão é `slowQuerySeconds`.
+        poolSize (int, optional): Número de conexões somente leitura. Padrão é `queryPoolSize`.
 
     Returns:
-        pandas.DataFrame: DataFrame com o resultado da consulta.
+        CachedQueryRunner: Executor com a conexão compartilhada, o pool de leitura e o cache de resultados.
     """
-    query = dicQueries[queryKey]  # Obtém a consulta SQL do dicionário
-    return pd.read_sql(query, conn, params=params)  # Executa a consulta e retorna o resultado como um DataFrame
-
-dfTopCustomers = runQuery("queryTopCustomers")  # Executa a consulta para obter os top 10 clientes
-dfTopProducts = runQuery("queryTopProducts")  # Executa a consulta para obter os top 5 produtos
-dfAvgPriceCategory = runQuery("queryAvgPriceCategory")  # Executa a consulta para obter o preço médio por categoria
-dfHalfYear = runQuery("queryHalfYear")  # Executa a consulta para comparar o faturamento por semestre
-
-print("Top 10 Clientes:")
-print(dfTopCustomers)  # Imprime o DataFrame com os top 10 clientes
-
-print("\nTop 5 Produtos mais rentáveis:")
-print(dfTopProducts)  # Imprime o DataFrame com os top 5 produtos
-
-print("\nMédia de valor gasto por categoria:")
-print(dfAvgPriceCategory)  # Imprime o DataFrame com o preço médio por categoria
-
-print("\nComparação de faturamento Jan-Jun e Jul-Dez:")
-print(dfHalfYear)  # Imprime o DataFrame com a comparação de faturamento por semestre
-
-
-st.title(" Sales Dashboard - E-commerce")  # Define o título do aplicativo Streamlit
-
-monthFilter = st.selectbox("Selecione um mês:", ["Todos"] + [f"{m:02d}/2024" for m in range(1, 13)])  # Cria um selectbox para filtrar os dados por mês
-
-# Define um dicionário com consultas SQL para visualização dos dados
-dicQueriesViz = {
-    "queryBarTopProducts": '''
-        SELECT product, SUM(sales_quantity) AS total_quantity
-        FROM sales
-        {whereClause}
-        GROUP BY product
-        ORDER BY SUM(sales_quantity) DESC
-        LIMIT 10
-    ''',  # Consulta para obter os 10 produtos mais vendidos em quantidade
-    "queryLineMonthRevenue": '''
-        SELECT STRFTIME('%m', sales_date) AS month, SUM(total_price) AS total_revenue
-        FROM sales
-        {whereClause}
-        GROUP BY STRFTIME('%m', sales_date)
-        ORDER BY STRFTIME('%m', sales_date)
-    ''',  # Consulta para obter o faturamento mensal
-    "queryVipCustomers": '''
-        SELECT customer, SUM(sales_quantity) AS total_quantity, SUM(total_price) AS total_amount
-        FROM sales
-        {whereClause}
-        GROUP BY customer
-        ORDER BY SUM(total_price) DESC, SUM(sales_quantity) DESC, customer
-        LIMIT 10
-    '''  # Consulta para obter os 10 clientes VIPs (que mais compraram em valor e quantidade)
-}
-
-whereClause = ""  # Inicializa a cláusula WHERE da consulta SQL
-params = ()  # Inicializa os parâmetros da consulta SQL
-if monthFilter != "Todos":  # Verifica se o filtro de mês foi selecionado
-    selectMonth = monthFilter.split("/")[0]  # Obtém o número do mês selecionado
-    whereClause = "WHERE STRFTIME('%m', sales_date) = ? AND STRFTIME('%Y', sales_date) = '2024'"  # Define a cláusula WHERE para filtrar os dados pelo mês selecionado
-    params = (selectMonth,)  # Define os parâmetros da consulta SQL
-
-def runQueryViz(queryKey):
-    """Executa uma consulta SQL para visualização e retorna o resultado como um DataFrame.
+    enableWal(dbPath)  # Coloca o banco em modo WAL para que as leituras concorrentes não se bloqueiem
+    runner = CachedQueryRunner(dbPath, queryLog=QueryLog(slowSeconds), poolSize=poolSize)  # Conecta ao banco de dados SQLite e cria o cache, o registro de medições e o pool de leitura
+    runner.withConnection(migrateDateColumns)  # Adiciona as colunas inteiras de data e os índices caso o banco seja antigo
+    return runner  # Retorna o executor
 
-    Args:
-        queryKey (str): Chave da consulta no dicionário `dicQueriesViz`.
+def main(dbPath='salesEcommerce.db'):
+    """Monta a página do dashboard (executada pelo Streamlit a cada interação).
 
-    Returns:
-        pandas.DataFrame: DataFrame com o resultado da consulta.
+    Args:
+        dbPath (str, optional): Caminho do banco de dados SQLite. Padrão é 'salesEcommerce.db'.
     """
-    query = dicQueriesViz[queryKey].format(whereClause=whereClause)  # Obtém a consulta SQL do dicionário e formata com a cláusula WHERE
-    return pd.read_sql(query, conn, params=params)  # Executa a consulta e retorna o resultado como um DataFrame
-
-st.write("Gráfico de barras com os produtos mais vendidos.")  # Exibe um texto no aplicativo
-dfBarTopProducts = runQueryViz("queryBarTopProducts")  # Executa a consulta para obter os top 10 produtos mais vendidos
-if not dfBarTopProducts.empty:  # Verifica se o DataFrame não está vazio
-    st.bar_chart(dfBarTopProducts.set_index('product'), x_label="Products", y_label="Quantity")  # Cria um gráfico de barras com os top 10 produtos mais vendidos
-else:
-    st.write("Nenhum dado disponível para o período selecionado.")  # Exibe uma mensagem caso não haja dados para o período selecionado
-
-st.write("Gráfico de linha faturamento mensal.")  # Exibe um texto no aplicativo
-dfLineMonthRevenue = runQueryViz("queryLineMonthRevenue")  # Executa a consulta para obter o faturamento mensal
-if not dfLineMonthRevenue.empty:  # Verifica se o DataFrame não está vazio
-    st.line_chart(dfLineMonthRevenue.set_index('month'), x_label="Months", y_label="Revenue")  # Cria um gráfico de linha com o faturamento mensal
-else:
-    st.write("Nenhum dado disponível para o período selecionado.")  # Exibe uma mensagem caso não haja dados para o período selecionado
-
-st.write("Tabela interativa com os clientes VIPs")  # Exibe um texto no aplicativo
-dfVipCustomers = runQueryViz("queryVipCustomers")  # Executa a consulta para obter os clientes VIPs
-if not dfVipCustomers.empty:  # Verifica se o DataFrame não está vazio
-    st.dataframe(dfVipCustomers.style.highlight_max(subset=['total_quantity', 'total_amount']), hide_index=True)  # Cria uma tabela interativa com os clientes VIPs, destacando os maiores valores
-else:
-    st.write("Nenhum dado disponível para o período selecionado.")  # Exibe uma mensagem caso não haja dados para o período selecionado
-
-conn.close()  # Fecha a conexão com o banco de dados
\ No newline at end of file
+    runner = getRunner(dbPath)  # Obtém o executor de consultas compartilhado
+    pageMark = runner.log.mark()  # Marca o início da página para listar apenas as consultas desta execução
+    pageStart = time.perf_counter()  # Marca o início das consultas da página
+    salesTable = runner.withConnection(salesSource)  # Define se as consultas leem da tabela 'sales' ou da view 'sales_flat'
+    useRollups = runner.withConnection(rollupsFresh)  # Verifica se as consultas podem ser respondidas pelas tabelas de rollup
+    reportYear = 2024  # Define o ano usado na comparação de faturamento por semestre
+
+    def submitQuery(queryKey, params=()):
+        """Agenda uma consulta SQL de relatório no pool de leitura.
+
+        Args:
+            queryKey (str): Chave da consulta no dicionário `dicQueries` (respondida pelos rollups quando atualizados).
+            params (tuple, optional): Parâmetros para a consulta SQL. Padrão é ().
+
+        Returns:
+            concurrent.futures.Future: Futuro com o DataFrame do resultado da consulta.
+        """
+        query = renderQuery(queryKey, salesTable, useRollups=useRollups)  # Obtém a consulta SQL do dicionário (ou a equivalente sobre os rollups)
+        return runner.submit(queryKey, query, params)  # Agenda a consulta (ou reaproveita o resultado do cache)
+
+    reportFutures = {"queryTopCustomers": submitQuery("queryTopCustomers"),
+                     "queryTopProducts": submitQuery("queryTopProducts"),
+                     "queryAvgPriceCategory": submitQuery("queryAvgPriceCategory"),
+                     "queryHalfYear": submitQuery("queryHalfYear", params=yearRange(reportYear))
+                     }  # Agenda as consultas dos relatórios (top 10 clientes, top 5 produtos, preço médio por categoria e semestres)
+
+    st.title(" Sales Dashboard - E-commerce")  # Define o título do aplicativo Streamlit
+
+    monthsSource = 'rollup_daily_category' if useRollups else salesTable  # Lê os meses do rollup de categorias (bem menor que as vendas) quando atualizado
+    monthOptions = [f"{month:02d}/{year}" for year, month in runner.withConnection(lambda conn: availableMonths(conn, monthsSource))]  # Lista os meses (de qualquer ano) que têm vendas no banco
+    monthFilter = st.selectbox("Selecione um mês:", ["Todos"] + monthOptions + ["Período personalizado"])  # Cria um selectbox para filtrar os dados por mês ou por período
+
+    whereClause, params = buildWhereClause()  # Inicializa a cláusula WHERE e os parâmetros da consulta SQL sem filtro
+    if monthFilter == "Período personalizado":  # Verifica se o filtro por período foi selecionado
+        dateRange = st.date_input("Selecione o período:", value=())  # Cria um seletor de intervalo de datas
+        if len(dateRange) == 2:  # Verifica se as duas datas do intervalo foram escolhidas
+            whereClause, params = buildWhereClause(dateRange[0], dateRange[1])  # Define a cláusula WHERE para filtrar os dados pelo período selecionado
+    elif monthFilter != "Todos":  # Verifica se o filtro de mês foi selecionado
+        selectMonth, selectYear = (int(part) for part in monthFilter.split("/"))  # Obtém o mês e o ano selecionados
+        whereClause, params = buildWhereClause(*monthRange(selectYear, selectMonth))  # Define a cláusula WHERE para filtrar os dados pelo mês selecionado
+
+    def submitQueryViz(queryKey):
+        """Agenda uma consulta SQL de visualização no pool de leitura.
+
+        Args:
+            queryKey (str): Chave da consulta no dicionário `dicQueriesViz` (respondida pelos rollups quando atualizados).
+
+        Returns:
+            concurrent.futures.Future: Futuro com o DataFrame do resultado da consulta.
+        """
+        query = renderQuery(queryKey, salesTable, whereClause, useRollups)  # Obtém a consulta SQL do dicionário (ou a equivalente sobre os rollups) e formata com a cláusula WHERE
+        return runner.submit(queryKey, query, params)  # Agenda a consulta (ou reaproveita o resultado do cache)
+
+    def showBarTopProducts(dfBarTopProducts):
+        """Exibe o gráfico de barras com os produtos mais vendidos.
+
+        Args:
+            dfBarTopProducts (pandas.DataFrame): Resultado da consulta 'queryBarTopProducts'.
+        """
+        st.write("Gráfico de barras com os produtos mais vendidos.")  # Exibe um texto no aplicativo
+        if not dfBarTopProducts.empty:  # Verifica se o DataFrame não está vazio
+            st.bar_chart(dfBarTopProducts.set_index('product'), x_label="Products", y_label="Quantity")  # Cria um gráfico de barras com os top 10 produtos mais vendidos
+        else:
+            st.write("Nenhum dado disponível para o período selecionado.")  # Exibe uma mensagem caso não haja dados para o período selecionado
+
+    def showLineMonthRevenue(dfLineMonthRevenue):
+        """Exibe o gráfico de linha com o faturamento mensal.
+
+        Args:
+            dfLineMonthRevenue (pandas.DataFrame): Resultado da consulta 'queryLineMonthRevenue'.
+        """
+        st.write("Gráfico de linha faturamento mensal.")  # Exibe um texto no aplicativo
+        if not dfLineMonthRevenue.empty:  # Verifica se o DataFrame não está vazio
+            st.line_chart(dfLineMonthRevenue.set_index('month'), x_label="Months", y_label="Revenue")  # Cria um gráfico de linha com o faturamento mensal
+        else:
+            st.write("Nenhum dado disponível para o período selecionado.")  # Exibe uma mensagem caso não haja dados para o período selecionado
+
+    def showVipCustomers(dfVipCustomers):
+        """Exibe a tabela interativa com os clientes VIPs.
+
+        Args:
+            dfVipCustomers (pandas.DataFrame): Resultado da consulta 'queryVipCustomers'.
+        """
+        st.write("Tabela interativa com os clientes VIPs")  # Exibe um texto no aplicativo
+        if not dfVipCustomers.empty:  # Verifica se o DataFrame não está vazio
+            st.dataframe(dfVipCustomers.style.highlight_max(subset=['total_quantity', 'total_amount']), hide_index=True)  # Cria uma tabela interativa com os clientes VIPs, destacando os maiores valores
+        else:
+            st.write("Nenhum dado disponível para o período selecionado.")  # Exibe uma mensagem caso não haja dados para o período selecionado
+
+    vizPanels = {"queryBarTopProducts": showBarTopProducts,
+                 "queryLineMonthRevenue": showLineMonthRevenue,
+                 "queryVipCustomers": showVipCustomers
+                 }  # Define a função que exibe o resultado de cada consulta de visualização
+    vizSlots = {queryKey: st.empty() for queryKey in vizPanels}  # Reserva o lugar de cada gráfico na ordem da página
+    vizFutures = {submitQueryViz(queryKey): queryKey for queryKey in vizPanels}  # Agenda as consultas de visualização em paralelo
+    for future in as_completed(vizFutures):  # Itera sobre as consultas na ordem em que terminam
+        queryKey = vizFutures[future]  # Obtém a chave da consulta que terminou
+        with vizSlots[queryKey].container():  # Preenche o lugar reservado para o gráfico
+            vizPanels[queryKey](future.result())  # Exibe o gráfico assim que o resultado chega
+
+    dfTopCustomers = reportFutures["queryTopCustomers"].result()  # Obtém os top 10 clientes
+    dfTopProducts = reportFutures["queryTopProducts"].result()  # Obtém os top 5 produtos
+    dfAvgPriceCategory = reportFutures["queryAvgPriceCategory"].result()  # Obtém o preço médio por categoria
+    dfHalfYear = reportFutures["queryHalfYear"].result()  # Obtém a comparação de faturamento por semestre
+
+    print("Top 10 Clientes:")
+    print(dfTopCustomers)  # Imprime o DataFrame com os top 10 clientes
+
+    print("\nTop 5 Produtos mais rentáveis:")
+    print(dfTopProducts)  # Imprime o DataFrame com os top 5 produtos
+
+    print("\nMédia de valor gasto por categoria:")
+    print(dfAvgPriceCategory)  # Imprime o DataFrame com o preço médio por categoria
+
+    print(f"\nComparação de faturamento Jan-Jun e Jul-Dez de {reportYear}:")
+    print(dfHalfYear)  # Imprime o DataFrame com a comparação de faturamento por semestre
+
+    with st.sidebar:  # Monta o painel de tempos na barra lateral
+        st.header("Tempo das consultas")  # Exibe o título do painel
+        pageTimings = runner.log.since(pageMark)  # Obtém as medições das consultas desta página
+        st.metric("Latência da página", f"{(time.perf_counter() - pageStart) * 1000:.1f} ms")  # Exibe o tempo do início das consultas até o último gráfico
+        st.metric("Soma das consultas", f"{pageTimings['wallMs'].sum():.1f} ms")  # Exibe a soma dos tempos das consultas (maior que a latência quando elas rodam em paralelo)
+        st.dataframe(pageTimings[['queryKey', 'rows', 'wallMs', 'sqliteMs', 'convertMs', 'cached']].round(1), hide_index=True)  # Exibe o tempo de cada consulta (SQLite x conversão)
+        with st.expander("Resumo por consulta"):  # Cria a seção com os totais desde o início do servidor
+            st.dataframe(runner.log.summary().round(1))  # Exibe os totais por consulta
+        with st.expander(f"Consultas lentas (≥ {slowQuerySeconds * 1000:.0f} ms)"):  # Cria a seção do registro de consultas lentas
+            slowQueries = runner.log.slowQueries()  # Obtém as consultas lentas com o plano de execução
+            if not slowQueries.empty:  # Verifica se houve consultas lentas
+                st.dataframe(slowQueries.drop(columns='at').round(1), hide_index=True)  # Exibe as consultas lentas, com SQL, parâmetros e plano
+            else:
+                st.write("Nenhuma consulta lenta registrada.")  # Exibe uma mensagem caso não haja consultas lentas
+
+if __name__ == '__main__':
+    main(sys.argv[1] if len(sys.argv) > 1 else 'salesEcommerce.db')  # Monta a página com o banco informado após '--' no `streamlit run`
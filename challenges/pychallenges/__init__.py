@@ -0,0 +1,7 @@
+"""
+Funções reutilizáveis para os desafios de geração e análise de dados.
+
+Os scripts da pasta `challenges` importam daqui a lógica de geração de dados,
+mantendo no próprio script apenas a execução do desafio. As mesmas etapas ficam
+disponíveis pela linha de comando `python -m pychallenges` (veja `cli.py`).
+"""
@@ -0,0 +1,10 @@
+"""
+Executa a linha de comando com `python -m pychallenges`.
+"""
+
+import sys  # Importa a biblioteca sys para definir o código de saída
+
+from .cli import main  # Importa a linha de comando
+
+if __name__ == '__main__':
+    sys.exit(main())  # Executa o subcomando com os argumentos da linha de comando
@@ -0,0 +1,186 @@
+"""
+Motor de análise em passagem única para o relatório do e-commerce.
+
+`SalesReport` acumula, bloco a bloco, todas as métricas do relatório (produtos, clientes e
+cidades que mais compraram, clientes VIP, faturamento mensal e totais). Os acumuladores são
+somas por chave, então relatórios parciais calculados em processos ou arquivos diferentes
+podem ser combinados com `merge` e o resultado é o mesmo de uma passagem sobre todos os dados.
+Os blocos podem vir do gerador, de arquivos CSV ou de uma leitura em partes do SQLite, então
+o relatório roda sobre dados maiores que a memória.
+"""
+
+import numpy as np  # Importa a biblioteca NumPy para operações numéricas
+import pandas as pd  # Importa a biblioteca Pandas para manipulação de dados
+
+reportColumns = ['product', 'customer', 'city', 'sales_quantity', 'total_price', 'sales_date']  # Define as colunas lidas para o relatório
+vipThreshold = 5000  # Define o gasto total acima do qual o cliente é VIP
+
+class SalesReport:
+    """Acumulador combinável das métricas do relatório de vendas."""
+
+    def __init__(self):
+        self.productQuantity = pd.Series(dtype='int64')  # Inicializa a quantidade vendida por produto
+        self.customerRevenue = pd.Series(dtype='float64')  # Inicializa o valor gasto por cliente
+        self.cityQuantity = pd.Series(dtype='int64')  # Inicializa a quantidade vendida por cidade
+        self.monthRevenue = pd.Series(dtype='float64')  # Inicializa o faturamento por mês (chave ano * 100 + mês)
+        self.numSales = 0  # Inicializa o número de vendas
+        self.soldQuantity = 0  # Inicializa a quantidade de itens vendidos
+        self.revenue = 0.0  # Inicializa o faturamento total
+
+    @staticmethod
+    def addSeries(total, partial):
+        """Soma duas séries indexadas por chave, considerando zero para chaves ausentes.
+
+        Args:
+            total (pandas.Series): Série acumulada.
+            partial (pandas.Series): Série parcial.
+
+        Returns:
+            pandas.Series: Série com a soma por chave.
+        """
+        if total.empty:  # Verifica se ainda não há nada acumulado
+            return partial  # Retorna a série parcial
+        return total.add(partial, fill_value=0).astype(np.result_type(total.dtype, partial.dtype))  # Soma as séries mantendo o tipo numérico
+
+    def update(self, chunk):
+        """Acumula um bloco de vendas.
+
+        Args:
+            chunk (pandas.DataFrame): Bloco com as colunas de `reportColumns` (ou 'sales_year' e
+                'sales_month' no lugar de 'sales_date').
+
+        Returns:
+            SalesReport: O próprio acumulador, para encadear chamadas.
+        """
+        if 'sales_year' in chunk and 'sales_month' in chunk:  # Verifica se o bloco já tem as colunas inteiras de data
+            monthKey = chunk['sales_year'].to_numpy() * 100 + chunk['sales_month'].to_numpy()  # Monta a chave do mês a partir das colunas inteiras
+        else:
+            months = pd.to_datetime(chunk['sales_date']).to_numpy().astype('datetime64[M]').astype(np.int64)  # Converte as datas para meses desde 1970-01
+            monthKey = (months // 12 + 1970) * 100 + months % 12 + 1  # Monta a chave do mês de forma vetorizada
+
+        self.updateRankings(chunk)  # Acumula os totais por produto, cliente e cidade
+        self.monthRevenue = self.addSeries(self.monthRevenue, chunk['total_price'].groupby(monthKey, sort=False).sum())  # Soma o faturamento por mês
+        self.numSales += len(chunk)  # Soma o número de vendas
+        self.soldQuantity += int(chunk['sales_quantity'].sum())  # Soma a quantidade de itens vendidos
+        self.revenue += float(chunk['total_price'].sum())  # Soma o faturamento
+        return self  # Retorna o acumulador
+
+    def merge(self, other):
+        """Combina outro relatório parcial com este.
+
+        Args:
+            other (SalesReport): Relatório parcial calculado sobre outra parte dos dados.
+
+        Returns:
+            SalesReport: O próprio acumulador, para encadear chamadas.
+        """
+        self.mergeRankings(other)  # Combina os totais por produto, cliente e cidade
+        self.monthRevenue = self.addSeries(self.monthRevenue, other.monthRevenue)  # Combina o faturamento por mês
+        self.numSales += other.numSales  # Combina o número de vendas
+        self.soldQuantity += other.soldQuantity  # Combina a quantidade de itens vendidos
+        self.revenue += other.revenue  # Combina o faturamento
+        return self  # Retorna o acumulador
+
+    def updateRankings(self, chunk):
+        """Acumula os totais exatos por produto, cliente e cidade de um bloco.
+
+        Args:
+            chunk (pandas.DataFrame): Bloco de vendas.
+        """
+        self.productQuantity = self.addSeries(self.productQuantity, chunk.groupby('product', sort=False, observed=True)['sales_quantity'].sum())  # Soma a quantidade vendida por produto
+        self.customerRevenue = self.addSeries(self.customerRevenue, chunk.groupby('customer', sort=False, observed=True)['total_price'].sum())  # Soma o valor gasto por cliente
+        self.cityQuantity = self.addSeries(self.cityQuantity, chunk.groupby('city', sort=False, observed=True)['sales_quantity'].sum())  # Soma a quantidade vendida por cidade
+
+    def mergeRankings(self, other):
+        """Combina os totais por produto, cliente e cidade de outro relatório parcial.
+
+        Args:
+            other (SalesReport): Relatório parcial calculado sobre outra parte dos dados.
+        """
+        self.productQuantity = self.addSeries(self.productQuantity, other.productQuantity)  # Combina a quantidade por produto
+        self.customerRevenue = self.addSeries(self.customerRevenue, other.customerRevenue)  # Combina o valor gasto por cliente
+        self.cityQuantity = self.addSeries(self.cityQuantity, other.cityQuantity)  # Combina a quantidade por cidade
+
+    def result(self, numCustomer=None):
+        """Monta as métricas finais do relatório.
+
+        Args:
+            numCustomer (int, optional): Número de clientes usado na média de valor gasto.
+                Padrão é o número de clientes que compraram.
+
+        Returns:
+            dict: Dicionário com 'topProducts', 'topCustomers', 'topCities', 'vips',
+                'monthRevenue', 'numSales', 'soldQuantity', 'revenue' e 'avgPerCustomer'.
+        """
+        numCustomer = numCustomer if numCustomer is not None else len(self.customerRevenue)  # Define o número de clientes da média
+        vips = self.customerRevenue.rename('total_price').rename_axis('customer').sort_index().reset_index()  # Monta a tabela de gasto por cliente
+        vips['vip'] = np.where(vips['total_price'] > vipThreshold, 'Sim', 'Não')  # Marca os clientes VIP de forma vetorizada
+        monthRevenue = self.monthRevenue.sort_index()  # Ordena o faturamento mensal cronologicamente
+        monthRevenue.index = [f"{key % 100:02d}/{key // 100}" for key in monthRevenue.index]  # Formata a chave do mês como 'MM/AAAA'
+        return {'topProducts': self.productQuantity.sort_values(ascending=False)[:10],
+                'topCustomers': self.customerRevenue.sort_values(ascending=False)[:5],
+                'topCities': self.cityQuantity.sort_values(ascending=False)[:10],
+                'vips': vips,
+                'monthRevenue': monthRevenue.rename_axis('month_name'),
+                'numSales': self.numSales,
+                'soldQuantity': self.soldQuantity,
+                'revenue': self.revenue,
+                'avgPerCustomer': np.round(self.revenue / numCustomer, 2) if numCustomer else 0.0
+                }  # Retorna as métricas do relatório
+
+def buildReport(chunks, report=None):
+    """Calcula o relatório em uma única passagem sobre os blocos.
+
+    Args:
+        chunks (iterable): Blocos (DataFrames) de vendas.
+        report (SalesReport, optional): Acumulador a ser usado (por exemplo, um
+            `sketches.ApproxSalesReport`). Padrão é um `SalesReport` novo.
+
+    Returns:
+        SalesReport: Relatório acumulado.
+    """
+    report = report if report is not None else SalesReport()  # Cria o acumulador caso não tenha sido informado
+    for chunk in chunks:  # Itera sobre os blocos uma única vez
+        report.update(chunk)  # Acumula o bloco
+    return report  # Retorna o relatório
+
+def mergeReports(reports):
+    """Combina relatórios parciais (de vários processos ou arquivos) em um único relatório.
+
+    Args:
+        reports (iterable): Relatórios parciais.
+
+    Returns:
+        SalesReport: Relatório combinado.
+    """
+    merged = SalesReport()  # Cria o acumulador combinado
+    for report in reports:  # Itera sobre os relatórios parciais
+        merged.merge(report)  # Combina o relatório parcial
+    return merged  # Retorna o relatório combinado
+
+def readSqliteChunks(conn, source='sales', chunkSize=200_000):
+    """Lê as vendas do SQLite em partes, apenas com as colunas usadas no relatório.
+
+    Args:
+        conn (sqlite3.Connection): Conexão com o banco de dados.
+        source (str, optional): Tabela ou view com as vendas. Padrão é 'sales'.
+        chunkSize (int, optional): Número de linhas por parte. Padrão é 200.000.
+
+    Returns:
+        iterator: Iterador de DataFrames.
+    """
+    query = f"SELECT product, customer, city, sales_quantity, total_price, sales_year, sales_month FROM {source}"  # Define a consulta com as colunas do relatório
+    return pd.read_sql(query, conn, chunksize=chunkSize)  # Retorna o leitor em partes
+
+def readCsvChunks(paths, chunkSize=200_000):
+    """Lê as vendas de um ou mais arquivos CSV em partes, apenas com as colunas usadas no relatório.
+
+    Args:
+        paths (list): Caminhos dos arquivos CSV (por exemplo, as partes da geração paralela).
+        chunkSize (int, optional): Número de linhas por parte. Padrão é 200.000.
+
+    Yields:
+        pandas.DataFrame: Uma parte de um dos arquivos.
+    """
+    for path in paths:  # Itera sobre os arquivos
+        yield from pd.read_csv(path, usecols=reportColumns, chunksize=chunkSize)  # Entrega as partes do arquivo
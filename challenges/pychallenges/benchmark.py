@@ -0,0 +1,291 @@
+"""
+Benchmark reproduzível da geração, da carga e de todas as consultas dos relatórios.
+
+Para cada escala (número de linhas) um banco 'salesEcommerce.db' sintético é montado a partir
+de um seed fixo, medindo cada etapa (clientes, vendas, livros, carga e rollups). Em seguida
+cada consulta de `dicQueries` e `dicQueriesViz` (e a versão sobre os rollups, quando existe) é
+executada a frio, em uma conexão nova com o cache de páginas do SQLite vazio, e a quente,
+repetida na mesma conexão. O `EXPLAIN QUERY PLAN` de cada consulta é guardado junto, e
+`queries.checkIndexUsage` verifica se cada consulta lê as vendas pelos índices de cobertura
+(as consultas que varrem a tabela são listadas na saída).
+
+O resultado é gravado em JSON. Com `--baseline` os tempos são comparados com um resultado
+salvo e as consultas ou etapas mais lentas que o limite são listadas (código de saída 1):
+
+    python -m pychallenges.benchmark --scales 10000 1000000 --output bench.json
+    python -m pychallenges.benchmark --scales 10000 1000000 --baseline bench.json
+
+Com `--cold-start` é medido o tempo de partida de cada subcomando de `python -m pychallenges`
+(um processo novo por execução, com uma carga mínima), junto com as bibliotecas pesadas que a
+simples importação da linha de comando carrega:
+
+    python -m pychallenges.benchmark --cold-start --output coldstart.json
+
+O cache de arquivos do sistema operacional não é descartado, então "a frio" mede o custo de
+uma conexão nova do dashboard, não de uma leitura do disco.
+"""
+
+import argparse  # Importa a biblioteca argparse para ler os argumentos da linha de comando
+import json  # Importa a biblioteca json para gravar e ler os resultados
+import os  # Importa a biblioteca os para manipulação de caminhos
+import platform  # Importa a biblioteca platform para registrar a máquina do benchmark
+import sqlite3  # Importa a biblioteca SQLite para interação com bancos de dados SQLite
+import statistics  # Importa a biblioteca statistics para calcular a mediana dos tempos
+import subprocess  # Importa a biblioteca subprocess para medir a partida da linha de comando em processos novos
+import sys  # Importa a biblioteca sys para registrar a versão do Python e definir o código de saída
+import time  # Importa a biblioteca time para medir a duração das etapas e consultas
+from datetime import datetime, timezone  # Importa as classes de data para registrar o momento do benchmark
+
+import numpy as np  # Importa a biblioteca NumPy para operações numéricas
+
+from .catalog import categoriesList  # Importa o dicionário de categorias e seus respectivos produtos
+from .customers import generateCustomerTable  # Importa a função de geração vetorizada de clientes
+from .generator import buildBookDimensions, defaultChunkSize, generateBookSalesChunks, generateSalesChunks  # Importa as funções de geração vetorizada
+from .loader import dtypeDict, loadSales, salesIndexes  # Importa o dicionário de tipos, os índices e a função de carga em massa
+from .queries import buildWhereClause, checkIndexUsage, dicQueries, dicQueriesRollup, dicQueriesViz, monthRange, renderQuery, yearRange  # Importa as consultas, os filtros de período e a verificação dos índices
+from .rollups import rebuildRollups  # Importa a função de reconstrução das tabelas de rollup
+
+defaultScales = [10_000, 1_000_000, 10_000_000]  # Define as escalas padrão do benchmark
+defaultThreshold = 1.25  # Define o aumento relativo de tempo considerado regressão
+heavyModules = ['pandas', 'faker', 'matplotlib', 'pyarrow', 'streamlit']  # Define as bibliotecas cuja importação pesa na partida
+minRegressionSeconds = 0.005  # Define o aumento absoluto mínimo para não acusar ruído de consultas muito rápidas
+
+def timed(func, *args, **kwargs):
+    """Executa uma função medindo a duração.
+
+    Args:
+        func (callable): Função a ser executada.
+
+    Returns:
+        tuple: Retorno da função e duração em segundos.
+    """
+    start = time.perf_counter()  # Marca o início da execução
+    result = func(*args, **kwargs)  # Executa a função
+    return result, time.perf_counter() - start  # Retorna o resultado e a duração
+
+def drain(chunks):
+    """Consome um gerador de blocos sem guardá-los.
+
+    Args:
+        chunks (iterable): Blocos (DataFrames) gerados.
+
+    Returns:
+        int: Número de linhas geradas.
+    """
+    return sum(len(chunk) for chunk in chunks)  # Conta as linhas descartando os blocos
+
+def benchmarkQueries(dbPath, repeat=5):
+    """Mede cada consulta a frio e a quente e guarda o plano de execução.
+
+    Args:
+        dbPath (str): Caminho do banco de dados.
+        repeat (int, optional): Número de execuções a quente. Padrão é 5.
+
+    Returns:
+        dict: Dicionário com o nome da consulta ('chave|variante') e 'cold', 'warm', 'warmMedian' e 'plan'.
+    """
+    monthClause, monthParams = buildWhereClause(*monthRange(2024, 3))  # Monta o filtro de um mês usado no dashboard
+    cases = {}  # Inicializa as consultas medidas (SQL e parâmetros)
+    for queryKey in dicQueries:  # Itera sobre as consultas dos relatórios
+        params = yearRange(2024) if '?' in dicQueries[queryKey] else ()  # Usa o ano de 2024 nas consultas com parâmetros
+        cases[f"{queryKey}|sales"] = (renderQuery(queryKey), params)  # Adiciona a consulta sobre a tabela de vendas
+        if queryKey in dicQueriesRollup:  # Verifica se a consulta tem versão sobre os rollups
+            cases[f"{queryKey}|rollup"] = (renderQuery(queryKey, useRollups=True), params)  # Adiciona a consulta sobre os rollups
+    for queryKey in dicQueriesViz:  # Itera sobre as consultas de visualização
+        cases[f"{queryKey}|sales"] = (renderQuery(queryKey), ())  # Adiciona a consulta sem filtro de período
+        cases[f"{queryKey}|sales-month"] = (renderQuery(queryKey, whereClause=monthClause), monthParams)  # Adiciona a consulta filtrada por um mês
+        if queryKey in dicQueriesRollup:  # Verifica se a consulta tem versão sobre os rollups
+            cases[f"{queryKey}|rollup"] = (renderQuery(queryKey, useRollups=True), ())  # Adiciona a consulta sobre os rollups sem filtro
+            cases[f"{queryKey}|rollup-month"] = (renderQuery(queryKey, whereClause=monthClause, useRollups=True), monthParams)  # Adiciona a consulta sobre os rollups filtrada por um mês
+
+    results = {}  # Inicializa os resultados das consultas
+    warmConn = sqlite3.connect(dbPath)  # Abre a conexão reaproveitada nas execuções a quente
+    for name, (sql, params) in cases.items():  # Itera sobre as consultas
+        coldConn = sqlite3.connect(dbPath)  # Abre uma conexão nova, com o cache de páginas vazio
+        _, cold = timed(lambda: coldConn.execute(sql, params).fetchall())  # Mede a execução a frio
+        coldConn.close()  # Fecha a conexão da execução a frio
+        warmConn.execute(sql, params).fetchall()  # Aquece o cache de páginas da conexão reaproveitada
+        warm = [timed(lambda: warmConn.execute(sql, params).fetchall())[1] for _ in range(repeat)]  # Mede as execuções a quente
+        plan = [row[-1] for row in warmConn.execute("EXPLAIN QUERY PLAN " + sql, params)]  # Obtém o plano de execução
+        results[name] = {'cold': cold, 'warm': min(warm), 'warmMedian': statistics.median(warm), 'plan': plan}  # Guarda as medições da consulta
+    warmConn.close()  # Fecha a conexão das execuções a quente
+    return results  # Retorna os resultados das consultas
+
+def benchmarkScale(numRows, workDir, seed=42, numCustomer=1600, chunkSize=defaultChunkSize, repeat=5):
+    """Monta um banco sintético de uma escala e mede as etapas e as consultas.
+
+    Args:
+        numRows (int): Número de vendas geradas.
+        workDir (str): Pasta onde o banco é montado.
+        seed (int, optional): Seed da geração. Padrão é 42.
+        numCustomer (int, optional): Número de clientes únicos. Padrão é 1600.
+        chunkSize (int, optional): Número máximo de linhas por bloco. Padrão é 100.000.
+        repeat (int, optional): Número de execuções a quente de cada consulta. Padrão é 5.
+
+    Returns:
+        dict: Dicionário com 'rows', 'dbBytes', 'stages' (segundos por etapa), 'indexUsage'
+            (True por consulta que lê as vendas por um índice) e 'queries'.
+    """
+    os.makedirs(workDir, exist_ok=True)  # Cria a pasta de trabalho caso não exista
+    dbPath = os.path.join(workDir, f"salesEcommerce-{numRows}.db")  # Define o caminho do banco da escala
+    for suffix in ('', '-wal', '-shm'):  # Itera sobre o banco e os arquivos do WAL
+        if os.path.exists(dbPath + suffix):  # Verifica se existe um banco anterior
+            os.remove(dbPath + suffix)  # Remove o banco anterior
+
+    stages = {}  # Inicializa as durações das etapas
+    customers, stages['generateCustomers'] = timed(generateCustomerTable, numCustomer, np.random.default_rng(seed))  # Mede a geração dos clientes
+    _, stages['generateSales'] = timed(drain, generateSalesChunks(numRows, customers, categoriesList, np.random.default_rng(seed + 1), chunkSize))  # Mede apenas a geração das vendas
+    bookDimensions = buildBookDimensions(numCustomer, np.random.default_rng(seed + 2))  # Gera as dimensões da livraria
+    _, stages['generateBooks'] = timed(drain, generateBookSalesChunks(numRows, bookDimensions, np.random.default_rng(seed + 3), chunkSize))  # Mede a geração das vendas de livros
+
+    conn = sqlite3.connect(dbPath)  # Conecta ao banco da escala
+    chunks = generateSalesChunks(numRows, customers, categoriesList, np.random.default_rng(seed + 1), chunkSize)  # Gera de novo as mesmas vendas para a carga
+    loadStats = loadSales(conn, chunks, 'sales', mode='replace', dtype=dtypeDict, indexes=salesIndexes)  # Carrega as vendas com os índices
+    stages['load'] = loadStats['seconds']  # Guarda a duração da carga (geração incluída)
+    stages['insert'] = max(loadStats['seconds'] - stages['generateSales'], 0.0)  # Estima a duração da carga sem a geração
+    _, stages['rollups'] = timed(rebuildRollups, conn)  # Mede a reconstrução dos rollups
+    indexUsage = checkIndexUsage(conn)  # Verifica nos planos se as consultas usam os índices de cobertura
+    conn.close()  # Fecha a conexão com o banco
+
+    return {'rows': numRows,
+            'dbBytes': os.path.getsize(dbPath),
+            'stages': stages,
+            'indexUsage': indexUsage,
+            'queries': benchmarkQueries(dbPath, repeat)
+            }  # Retorna as medições da escala
+
+def runBenchmark(scales=defaultScales, workDir='benchmark', seed=42, repeat=5):
+    """Executa o benchmark em todas as escalas.
+
+    Args:
+        scales (list, optional): Números de linhas de cada escala. Padrão é 10 mil, 1 milhão e 10 milhões.
+        workDir (str, optional): Pasta onde os bancos são montados. Padrão é 'benchmark'.
+        seed (int, optional): Seed da geração. Padrão é 42.
+        repeat (int, optional): Número de execuções a quente de cada consulta. Padrão é 5.
+
+    Returns:
+        dict: Resultado com 'meta' (ambiente) e 'scales' (medições por número de linhas).
+    """
+    meta = {'createdAt': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'seed': seed,
+            'python': sys.version.split()[0],
+            'sqlite': sqlite3.sqlite_version,
+            'numpy': np.__version__,
+            'platform': platform.platform(),
+            'cpus': os.cpu_count()
+            }  # Registra o ambiente do benchmark
+    return {'meta': meta, 'scales': {str(numRows): benchmarkScale(numRows, workDir, seed, repeat=repeat) for numRows in scales}}  # Retorna as medições de todas as escalas
+
+def benchmarkColdStart(workDir='benchmark', repeat=3):
+    """Mede o tempo de partida de cada subcomando da linha de comando em processos novos.
+
+    Args:
+        workDir (str, optional): Pasta onde os arquivos temporários são gravados. Padrão é 'benchmark'.
+        repeat (int, optional): Número de execuções de cada subcomando. Padrão é 3.
+
+    Returns:
+        dict: Dicionário com 'eagerModules' (bibliotecas pesadas carregadas ao importar a linha
+            de comando) e 'commands' (mediana em segundos de cada subcomando).
+    """
+    os.makedirs(workDir, exist_ok=True)  # Cria a pasta de trabalho
+    packageRoot = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))  # Define a pasta que contém o pacote
+    dbPath = os.path.abspath(os.path.join(workDir, 'coldstart.db'))  # Define o banco usado pelos subcomandos
+    csvPath = os.path.abspath(os.path.join(workDir, 'coldstart.csv'))  # Define o arquivo usado pela geração
+    commands = {'help': ['--help'],
+                'generate': ['generate', '--rows', '1000', '--output', csvPath],
+                'load': ['load', '--rows', '1000', '--db', dbPath],
+                'report': ['report', '--db', dbPath],
+                'dashboard': ['dashboard', '--help']
+                }  # Define os subcomandos medidos, com uma carga mínima ('dashboard' mede só a partida antes do Streamlit)
+
+    results = {}  # Inicializa as medições por subcomando
+    for name, args in commands.items():  # Itera sobre os subcomandos
+        samples = []  # Inicializa as execuções do subcomando
+        for _ in range(repeat):  # Repete a execução
+            start = time.perf_counter()  # Marca o início do processo
+            subprocess.run([sys.executable, '-m', 'pychallenges', *args], cwd=packageRoot, check=True, capture_output=True)  # Executa o subcomando em um processo novo
+            samples.append(time.perf_counter() - start)  # Guarda a duração do processo
+        results[name] = statistics.median(samples)  # Guarda a mediana do subcomando
+
+    probe = f"import sys, pychallenges.cli; print(','.join(m for m in {heavyModules!r} if m in sys.modules))"  # Define o teste das bibliotecas carregadas na importação
+    loaded = subprocess.run([sys.executable, '-c', probe], cwd=packageRoot, check=True, capture_output=True, text=True).stdout.strip()  # Importa a linha de comando em um processo novo
+    return {'eagerModules': loaded.split(',') if loaded else [], 'commands': results}  # Retorna as medições
+
+def compareResults(current, baseline, threshold=defaultThreshold):
+    """Compara um resultado com um resultado salvo e lista as regressões.
+
+    Etapas são comparadas pela duração e consultas pelo melhor tempo a quente, apenas nas
+    escalas e nomes presentes nos dois resultados.
+
+    Args:
+        current (dict): Resultado atual (veja `runBenchmark`).
+        baseline (dict): Resultado salvo usado como referência.
+        threshold (float, optional): Aumento relativo considerado regressão. Padrão é 1.25 (25% mais lento).
+
+    Returns:
+        list: Lista de dicionários com 'scale', 'name', 'baseline', 'current' e 'ratio', da maior razão para a menor.
+    """
+    regressions = []  # Inicializa a lista de regressões
+    for scale, result in current['scales'].items():  # Itera sobre as escalas do resultado atual
+        reference = baseline['scales'].get(scale)  # Procura a mesma escala no resultado salvo
+        if reference is None:  # Verifica se a escala não foi medida no resultado salvo
+            continue  # Ignora a escala
+        pairs = [(f"stage:{name}", seconds, reference['stages'].get(name)) for name, seconds in result['stages'].items()]  # Monta os pares das etapas
+        pairs += [(f"query:{name}", stats['warm'], reference['queries'].get(name, {}).get('warm'))
+                  for name, stats in result['queries'].items()]  # Monta os pares das consultas
+        for name, seconds, old in pairs:  # Itera sobre os pares
+            if old is None:  # Verifica se a medição não existe no resultado salvo
+                continue  # Ignora a medição
+            if seconds > old * threshold and seconds - old > minRegressionSeconds:  # Verifica se a medição ficou mais lenta que o limite
+                regressions.append({'scale': int(scale), 'name': name, 'baseline': old, 'current': seconds, 'ratio': seconds / old if old else float('inf')})  # Registra a regressão
+    return sorted(regressions, key=lambda item: item['ratio'], reverse=True)  # Retorna as regressões da maior razão para a menor
+
+def main(argv=None):
+    """Executa o benchmark pela linha de comando.
+
+    Args:
+        argv (list, optional): Argumentos da linha de comando. Padrão é `sys.argv`.
+
+    Returns:
+        int: Código de saída (1 se houver regressões em relação ao `--baseline`).
+    """
+    parser = argparse.ArgumentParser(description="Benchmark da geração, carga e consultas de vendas")  # Cria o leitor de argumentos
+    parser.add_argument('--scales', type=int, nargs='+', default=defaultScales, help="Números de linhas de cada escala")  # Define as escalas
+    parser.add_argument('--seed', type=int, default=42, help="Seed da geração")  # Define o seed
+    parser.add_argument('--repeat', type=int, default=5, help="Execuções a quente de cada consulta")  # Define o número de repetições
+    parser.add_argument('--workdir', default='benchmark', help="Pasta onde os bancos são montados")  # Define a pasta de trabalho
+    parser.add_argument('--output', default='benchmark.json', help="Arquivo JSON com os resultados")  # Define o arquivo de saída
+    parser.add_argument('--baseline', help="Resultado salvo para comparação")  # Define o resultado de referência
+    parser.add_argument('--threshold', type=float, default=defaultThreshold, help="Aumento relativo considerado regressão")  # Define o limite de regressão
+    parser.add_argument('--cold-start', action='store_true', help="Mede apenas a partida dos subcomandos de `python -m pychallenges`")  # Define a medição da partida
+    args = parser.parse_args(argv)  # Lê os argumentos
+
+    if args.cold_start:  # Verifica se apenas a partida deve ser medida
+        coldStart = benchmarkColdStart(args.workdir, args.repeat)  # Mede a partida dos subcomandos
+        with open(args.output, 'w', encoding='utf-8') as file:  # Abre o arquivo de saída
+            json.dump(coldStart, file, indent=2)  # Grava os resultados
+        for name, seconds in coldStart['commands'].items():  # Itera sobre os subcomandos medidos
+            print(f"{name:>10}: {seconds * 1000:.0f} ms")  # Exibe a partida do subcomando
+        print(f"Bibliotecas pesadas na importação: {', '.join(coldStart['eagerModules']) or 'nenhuma'}")  # Exibe as bibliotecas carregadas sem necessidade
+        return 0  # Termina sem comparação
+
+    results = runBenchmark(args.scales, args.workdir, args.seed, args.repeat)  # Executa o benchmark
+    with open(args.output, 'w', encoding='utf-8') as file:  # Abre o arquivo de saída
+        json.dump(results, file, indent=2)  # Grava os resultados
+    for scale, result in results['scales'].items():  # Itera sobre as escalas medidas
+        stages = ', '.join(f"{name} {seconds:.2f}s" for name, seconds in result['stages'].items())  # Monta o resumo das etapas
+        print(f"{int(scale):>12,} linhas: {stages}")  # Exibe o resumo das etapas
+        withoutIndex = [queryKey for queryKey, usesIndex in result['indexUsage'].items() if not usesIndex]  # Lista as consultas que varrem a tabela
+        print(f"{'':>12}  consultas sem índice: {', '.join(withoutIndex) or 'nenhuma'}")  # Exibe as consultas sem índice
+
+    if args.baseline is None:  # Verifica se não há comparação
+        return 0  # Termina sem regressões
+    with open(args.baseline, encoding='utf-8') as file:  # Abre o resultado salvo
+        regressions = compareResults(results, json.load(file), args.threshold)  # Compara com o resultado salvo
+    for item in regressions:  # Itera sobre as regressões
+        print(f"REGRESSÃO {item['scale']:,} linhas {item['name']}: {item['baseline']:.4f}s -> {item['current']:.4f}s ({item['ratio']:.2f}x)")  # Exibe a regressão
+    print(f"{len(regressions)} regressões acima de {args.threshold:.2f}x")  # Exibe o total de regressões
+    return 1 if regressions else 0  # Retorna o código de saída
+
+if __name__ == '__main__':
+    sys.exit(main())  # Executa o benchmark com os argumentos da linha de comando
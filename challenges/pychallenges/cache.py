@@ -0,0 +1,141 @@
+"""
+Cache de consultas do dashboard.
+
+`CachedQueryRunner` mantém uma única conexão com o banco, reaproveitada entre as execuções
+do Streamlit e entre usuários, e guarda os resultados das consultas em um cache LRU com
+tempo de expiração (TTL) e número máximo de entradas. A chave do cache é a chave da
+consulta, o SQL montado, os parâmetros e a versão dos dados: quando outro processo grava no
+banco o `PRAGMA data_version` muda e o cache é descartado automaticamente. Cada chamada é
+medida no `QueryLog` do executor (veja `instrumentation.py`).
+
+Com `poolSize` as consultas rodam em um pool de conexões somente leitura (veja `pool.py`) e
+`submit` agenda consultas independentes para execução concorrente.
+"""
+
+import sqlite3  # Importa a biblioteca SQLite para interação com bancos de dados SQLite
+import threading  # Importa a biblioteca threading para proteger a conexão compartilhada
+import time  # Importa a biblioteca time para controlar a expiração das entradas
+from collections import OrderedDict  # Importa o OrderedDict para manter a ordem de uso (LRU)
+from concurrent.futures import Future, ThreadPoolExecutor  # Importa o pool de threads para as consultas concorrentes
+
+from .instrumentation import QueryLog, queryPlan, readFrame  # Importa o registro de medições e a leitura instrumentada das consultas
+from .pool import ReadOnlyPool  # Importa o pool de conexões somente leitura
+
+class CachedQueryRunner:
+    """Executa consultas em uma conexão compartilhada, com cache LRU e TTL.
+
+    Args:
+        dbPath (str): Caminho do banco de dados SQLite.
+        maxEntries (int, optional): Número máximo de resultados guardados. Padrão é 128.
+        ttlSeconds (float, optional): Tempo de vida de cada resultado em segundos. Padrão é 300.
+        queryLog (QueryLog, optional): Registro das medições das consultas. Padrão é um novo `QueryLog`.
+        poolSize (int, optional): Número de conexões somente leitura para consultas concorrentes.
+            Padrão é 0 (todas as consultas na conexão compartilhada).
+    """
+
+    def __init__(self, dbPath, maxEntries=128, ttlSeconds=300, queryLog=None, poolSize=0):
+        self.dbPath = dbPath  # Guarda o caminho do banco de dados
+        self.maxEntries = maxEntries  # Guarda o número máximo de resultados
+        self.ttlSeconds = ttlSeconds  # Guarda o tempo de vida dos resultados
+        self.conn = sqlite3.connect(dbPath, check_same_thread=False)  # Abre a conexão compartilhada entre as threads do Streamlit
+        self.lock = threading.RLock()  # Cria a trava que serializa o uso da conexão
+        self.entries = OrderedDict()  # Inicializa o cache (do menos para o mais usado)
+        self.seenVersion = self.dataVersion()  # Guarda a versão dos dados no momento da criação
+        self.hits = 0  # Inicializa o contador de acertos do cache
+        self.misses = 0  # Inicializa o contador de consultas executadas no banco
+        self.log = queryLog if queryLog is not None else QueryLog()  # Guarda o registro das medições das consultas
+        self.pool = ReadOnlyPool(dbPath, poolSize) if poolSize else None  # Abre o pool de conexões somente leitura
+        self.executor = ThreadPoolExecutor(max_workers=poolSize, thread_name_prefix='query') if poolSize else None  # Cria as threads que executam as consultas concorrentes
+
+    def dataVersion(self):
+        """Obtém a versão dos dados do banco.
+
+        Returns:
+            int: Valor do `PRAGMA data_version`, que muda quando outra conexão grava no banco.
+        """
+        with self.lock:  # Usa a conexão compartilhada com exclusividade
+            return self.conn.execute("PRAGMA data_version").fetchone()[0]  # Lê a versão dos dados
+
+    def withConnection(self, func):
+        """Executa uma função com acesso exclusivo à conexão compartilhada.
+
+        Args:
+            func (callable): Função que recebe a conexão.
+
+        Returns:
+            object: Retorno da função.
+        """
+        with self.lock:  # Usa a conexão compartilhada com exclusividade
+            return func(self.conn)  # Executa a função com a conexão
+
+    def clear(self):
+        """Descarta todos os resultados do cache."""
+        with self.lock:  # Usa o cache com exclusividade
+            self.entries.clear()  # Limpa o cache
+
+    def run(self, queryKey, sql, params=(), owner=None):
+        """Executa uma consulta, respondendo pelo cache quando possível.
+
+        Com o pool de leitura a consulta roda em uma conexão somente leitura fora da trava, e
+        várias consultas podem executar ao mesmo tempo; a trava protege apenas o cache.
+
+        Args:
+            queryKey (str): Chave da consulta (usada para identificar o resultado).
+            sql (str): Consulta SQL montada.
+            params (tuple, optional): Parâmetros da consulta SQL. Padrão é ().
+            owner (int, optional): Thread que pediu a consulta (registrada no `QueryLog`). Padrão é a thread atual.
+
+        Returns:
+            pandas.DataFrame: DataFrame com o resultado da consulta.
+        """
+        start = time.perf_counter()  # Marca o início da chamada (inclui a espera pela conexão)
+        with self.lock:  # Usa o cache com exclusividade
+            version = self.dataVersion()  # Lê a versão atual dos dados
+            if version != self.seenVersion:  # Verifica se o banco mudou desde a última consulta
+                self.entries.clear()  # Descarta os resultados calculados com os dados antigos
+                self.seenVersion = version  # Guarda a nova versão dos dados
+            key = (queryKey, sql, tuple(params), version)  # Monta a chave do cache
+            entry = self.entries.get(key)  # Procura o resultado no cache
+            if entry is not None and time.monotonic() - entry[0] < self.ttlSeconds:  # Verifica se o resultado existe e não expirou
+                self.entries.move_to_end(key)  # Marca o resultado como o mais usado
+                self.hits += 1  # Conta o acerto do cache
+                result = entry[1].copy()  # Copia o resultado para que o chamador não altere o cache
+                self.log.record(queryKey, sql, params, len(result), time.perf_counter() - start, cached=True, thread=owner)  # Registra a medição do acerto do cache
+                return result  # Retorna o resultado do cache
+
+        if self.pool is not None:  # Verifica se há pool de leitura
+            with self.pool.connection() as conn:  # Empresta uma conexão somente leitura
+                result, sqliteSeconds, convertSeconds = readFrame(conn, sql, params)  # Executa a consulta medindo o SQLite e a conversão
+                wallSeconds = time.perf_counter() - start  # Calcula a duração total da chamada
+                plan = queryPlan(conn, sql, params) if self.log.isSlow(wallSeconds) else None  # Obtém o plano apenas das consultas lentas
+        else:
+            with self.lock:  # Usa a conexão compartilhada com exclusividade
+                result, sqliteSeconds, convertSeconds = readFrame(self.conn, sql, params)  # Executa a consulta medindo o SQLite e a conversão
+                wallSeconds = time.perf_counter() - start  # Calcula a duração total da chamada
+                plan = queryPlan(self.conn, sql, params) if self.log.isSlow(wallSeconds) else None  # Obtém o plano apenas das consultas lentas
+
+        with self.lock:  # Usa o cache com exclusividade
+            self.entries[key] = (time.monotonic(), result)  # Guarda o resultado no cache
+            self.entries.move_to_end(key)  # Marca o resultado como o mais usado
+            while len(self.entries) > self.maxEntries:  # Verifica se o cache passou do limite
+                self.entries.popitem(last=False)  # Descarta o resultado menos usado
+            self.misses += 1  # Conta a consulta executada no banco
+        self.log.record(queryKey, sql, params, len(result), wallSeconds, sqliteSeconds, convertSeconds, plan=plan, thread=owner)  # Registra a medição da consulta
+        return result.copy()  # Retorna uma cópia para que o chamador não altere o cache
+
+    def submit(self, queryKey, sql, params=()):
+        """Agenda uma consulta para execução concorrente no pool de leitura.
+
+        Args:
+            queryKey (str): Chave da consulta (usada para identificar o resultado).
+            sql (str): Consulta SQL montada.
+            params (tuple, optional): Parâmetros da consulta SQL. Padrão é ().
+
+        Returns:
+            concurrent.futures.Future: Futuro com o DataFrame do resultado.
+        """
+        if self.executor is None:  # Verifica se não há pool de leitura
+            future = Future()  # Cria um futuro já resolvido
+            future.set_result(self.run(queryKey, sql, params))  # Executa a consulta na thread atual
+            return future  # Retorna o futuro resolvido
+        return self.executor.submit(self.run, queryKey, sql, params, threading.get_ident())  # Agenda a consulta registrando a thread que a pediu
@@ -0,0 +1,34 @@
+"""
+Catálogos fixos usados na geração de dados dos desafios.
+"""
+
+categoriesList = {"Eletronicos": ["Smartphone X", "Tablet Y", "Fone Bluetooth", "TV 4K", "Smartwatch", "Carregador Turbo", "Caixa de Som Bluetooth"],
+                  "Computadores": ["Notebook Ultra", "PC Gamer", "Monitor Curvo", "Teclado Mecânico", "Mouse RGB", "Webcam Full HD", "SSD 1TB"],
+                  "Roupas": ["Camiseta Dry Fit", "Jaqueta Jeans", "Tênis Running", "Vestido Casual", "Boné Esportivo", "Mochila Casual", "Óculos de Sol"],
+                  "Livros": ["Python para Iniciantes", "Data Science Avançado", "O Poder do Hábito", "1984", "Mindset", "Clean Code", "A Arte da Guerra"],
+                  "Beleza": ["Perfume Elegance", "Kit Skincare", "Batom Matte", "Shampoo Orgânico", "Máscara Facial", "Base Líquida", "Protetor Solar"],
+                  "Automotivo": ["Pneu Aro 17", "Óleo Sintético", "Câmera de Ré", "Suporte Celular", "Capa para Banco", "Kit Ferramentas", "Lâmpada LED Automotiva"],
+                  "Brinquedos": ["Carrinho Controle Remoto", "Boneca Fashion", "Lego Criativo", "Quebra-Cabeça 1000pçs", "Jogo Educativo", "Playset Cozinha", "Bola de Vinil"],
+                  "Esportes": ["Bola de Futebol", "Raquete de Tênis", "Corda de Pular", "Mochila Esportiva", "Kit de Halteres", "Bicicleta Speed", "Luvas de Boxe"],
+                  "Moveis": ["Sofá Retrátil", "Mesa de Jantar", "Cadeira Gamer", "Guarda-Roupa 6 Portas", "Cama Box Queen", "Estante de Livros", "Mesa de Escritório"],
+                  "Eletrodomesticos": ["Geladeira Frost Free", "Micro-ondas Inox", "Máquina de Lavar", "Aspirador de Pó", "Fogão 5 Bocas", "Cafeteira Elétrica", "Liquidificador"],
+                  "Ferramentas": ["Furadeira Elétrica", "Chave de Fenda", "Serra Circular", "Martelo Reforçado", "Trena Digital", "Alicate Universal", "Kit Brocas"],
+                  "Petshop": ["Ração Premium", "Coleira Ajustável", "Brinquedo Interativo", "Cama para Cachorro", "Areia para Gato", "Shampoo para Pets", "Arranhador para Gatos"],
+                  "Perfumaria": ["Desodorante Roll-on", "Hidratante Corporal", "Shampoo Anticaspa", "Sabonete Líquido", "Óleo Capilar", "Condicionador Nutritivo", "Creme para Mãos"],
+                  "Papelaria": ["Caderno Universitário", "Caneta Esferográfica", "Marcador Permanente", "Papel Sulfite A4", "Planner Diário", "Grampeador", "Estojo Organizador"],
+                  "Games": ["Console NextGen", "Controle Sem Fio", "Teclado Gamer RGB", "Headset Surround", "Cadeira Gamer Pro", "Mousepad XL", "Cartão Presente PSN"]}  # Define um dicionário de categorias e seus respectivos produtos
+
+bookList = ["Competing on Analytics", "Data Science for Business", "The Data Warehouse Toolkit",
+            "Analytics at Work", "Naked Statistics", "Data-Driven", "Winning with Data",
+            "Big Data: A Revolution",
+            "Data Smart", "The Analytics Edge", "Storytelling with Data",
+            "The Art of Data Science", "Lean Analytics", "Data Strategy",
+            "Predictive Analytics", "Data Science for Executives", "Monetizing Data",
+            "The Data Detective", "Analytics in a Big Data World", "Data Science for Business Leaders"]  # Lista de títulos de livros
+
+publisherList = ["Harvard Business Review Press", "O'Reilly Media", "Wiley",
+                 "Harvard Business Review Press", "W.W. Norton & Company", "O'Reilly Media", "Wiley",
+                 "Eamon Dolan/Houghton Mifflin Harcourt", "Wiley", "MIT Press", "Wiley",
+                 "O'Reilly Media", "O'Reilly Media", "Kogan Page",
+                 "Wiley", "Columbia Business School Publishing", "Harvard Business Review Press",
+                 "Penguin Books", "Wiley", "O'Reilly Media"]  # Lista de editoras
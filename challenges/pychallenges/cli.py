@@ -0,0 +1,245 @@
+"""
+Linha de comando dos desafios (`python -m pychallenges`).
+
+Subcomandos:
+
+    python -m pychallenges generate --rows 1000000 --output sales.parquet
+    python -m pychallenges load --rows 1000000 --db salesEcommerce.db
+    python -m pychallenges load --incremental --days 1 --orders-per-day 500
+    python -m pychallenges report --db salesEcommerce.db --approx
+    python -m pychallenges report --db salesEcommerce.db --render relatorio --formats png svg
+    python -m pychallenges rollups rebuild --db salesEcommerce.db
+    python -m pychallenges dashboard --db salesEcommerce.db
+
+O módulo importa apenas a biblioteca padrão; Pandas, Faker, PyArrow e Streamlit são
+importados dentro de cada subcomando, só quando ele precisa. Assim `--help` e os
+subcomandos que não usam uma dependência não pagam o custo da importação dela (o tempo de
+partida de cada subcomando é medido com `python -m pychallenges.benchmark --cold-start`).
+"""
+
+import argparse  # Importa a biblioteca argparse para ler os argumentos da linha de comando
+import os  # Importa a biblioteca os para manipulação de caminhos
+import sys  # Importa a biblioteca sys para obter o interpretador e definir o código de saída
+
+dashboardScript = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '3desafioReportDashboard.py')  # Define o caminho do script do dashboard
+
+def commandGenerate(args):
+    """Gera as vendas e grava em CSV (comprimido ou não) ou Parquet.
+
+    Args:
+        args (argparse.Namespace): Argumentos do subcomando.
+
+    Returns:
+        int: Código de saída.
+    """
+    from .storage import writeSales  # Importa a gravação dos formatos de saída
+
+    if args.shards > 1:  # Verifica se a geração deve ser dividida em processos
+        from .parallel import generateParallel  # Importa a geração em shards paralelos
+
+        sink = args.format or 'csv'  # Define o destino dos shards (a saída é sempre uma pasta, então não há extensão para decidir)
+        paths = generateParallel(args.dataset, args.rows, args.output, args.seed, args.shards, sink=sink, numCustomer=args.customers)  # Gera os shards em paralelo
+        if sink == 'parquet':  # Verifica se os shards gravaram um conjunto Parquet compartilhado
+            paths = [os.path.join(root, name) for root, _, names in os.walk(paths[0]) for name in names if name.endswith('.parquet')]  # Lista os arquivos gravados nas pastas das partições
+        print(f"{args.rows} linhas em {len(paths)} arquivos {sink.upper()} em {args.output}")  # Exibe os arquivos gravados
+        return 0  # Termina com sucesso
+
+    from .pipeline import generateBookSales, generateEcommerceSales  # Importa as etapas de geração
+
+    if args.dataset == 'books':  # Verifica se a livraria foi pedida
+        import numpy as np  # Importa a biblioteca NumPy para criar o gerador
+
+        chunks = generateBookSales(args.rows, args.customers, np.random.default_rng(args.seed), compact=args.compact)  # Gera as vendas de livros
+    else:
+        _, chunks = generateEcommerceSales(args.rows, args.customers, args.seed, compact=args.compact)  # Gera as vendas do e-commerce
+    stats = writeSales(chunks, args.output, fmt=args.format)  # Grava as vendas no formato pedido (ou definido pela extensão)
+    print(f"{stats['rows']} linhas em {args.output}: {stats['bytes'] / 1024:.1f} KB em {stats['seconds']:.2f}s")  # Exibe o tamanho e a duração da gravação
+    return 0  # Termina com sucesso
+
+def commandLoad(args):
+    """Carrega as vendas do e-commerce no SQLite (completa ou só os próximos dias).
+
+    Args:
+        args (argparse.Namespace): Argumentos do subcomando.
+
+    Returns:
+        int: Código de saída.
+    """
+    import sqlite3  # Importa a biblioteca SQLite para interação com bancos de dados SQLite
+
+    conn = sqlite3.connect(args.db)  # Conecta ao banco de dados
+    try:
+        if args.incremental:  # Verifica se apenas os próximos dias devem ser acrescentados
+            from .incremental import appendDays  # Importa a carga incremental
+
+            stats = appendDays(conn, args.days, args.orders_per_day, args.new_customers_per_day, seed=args.seed)  # Acrescenta os dias novos
+            print(f"Carga incremental: {stats['rows']} linhas de {stats['startDate']} a {stats['endDate']} e {stats['newCustomers']} clientes novos em {stats['seconds']:.2f}s")  # Exibe a janela carregada
+        else:
+            from .pipeline import generateEcommerceSales, loadEcommerce  # Importa as etapas de geração e carga
+
+            customers, chunks = generateEcommerceSales(args.rows, args.customers, args.seed)  # Gera os clientes e as vendas
+            stats = loadEcommerce(conn, chunks, customers, args.storage)  # Carrega as vendas e reconstrói os rollups
+            print(f"Carga: {stats['rows']} linhas em {stats['seconds']:.2f}s ({stats['rowsPerSecond']:,.0f} linhas/s)")  # Exibe a velocidade da carga
+    finally:
+        conn.close()  # Fecha a conexão com o banco de dados
+    return 0  # Termina com sucesso
+
+def commandReport(args):
+    """Calcula e imprime o relatório do e-commerce a partir do SQLite ou de um arquivo.
+
+    Args:
+        args (argparse.Namespace): Argumentos do subcomando.
+
+    Returns:
+        int: Código de saída.
+    """
+    import sqlite3  # Importa a biblioteca SQLite para interação com bancos de dados SQLite
+
+    from .pipeline import salesReport  # Importa o cálculo do relatório
+    from .sketches import vipCountLabel  # Importa a contagem de VIPs (limite inferior no modo aproximado)
+
+    conn = None  # Inicializa a conexão (apenas para a leitura do SQLite)
+    if args.input is not None:  # Verifica se as vendas devem ser lidas de um arquivo
+        from .analytics import readCsvChunks, reportColumns  # Importa a leitura em partes de CSV
+        from .storage import outputFormat, readParquetChunks  # Importa a leitura em partes de Parquet
+
+        parquet = outputFormat(args.input) == 'parquet'  # Verifica se o arquivo é Parquet
+        chunks = readParquetChunks(args.input, columns=reportColumns) if parquet else readCsvChunks([args.input])  # Lê as vendas do arquivo em partes
+    else:
+        from .analytics import readSqliteChunks  # Importa a leitura em partes do SQLite
+        from .schema import salesSource  # Importa a origem das vendas (tabela plana ou view)
+
+        conn = sqlite3.connect(args.db)  # Conecta ao banco de dados
+        chunks = readSqliteChunks(conn, salesSource(conn))  # Lê as vendas do banco em partes
+    try:
+        report = salesReport(chunks, approx=args.approx, epsilon=args.epsilon)  # Calcula o relatório em uma única passagem
+        print("TOP 10 produtos mais vendidos\n", report['topProducts'], sep='')  # Imprime os 10 produtos mais vendidos
+        print("\nTOP 5 clientes com maior valor total de compra\n", report['topCustomers'], sep='')  # Imprime os 5 clientes que mais gastaram
+        print("\nTOP 10 Cidades com maior volume de vendas\n", report['topCities'], sep='')  # Imprime as 10 cidades com maior volume de vendas
+        print("\nFaturamento mensal\n", report['monthRevenue'], sep='')  # Imprime o faturamento mensal
+        print(f"\nNúmero total de vendas: {report['numSales']} \nQuantidade de Itens vendidos: {report['soldQuantity']} \nFaturamento Total: {report['revenue']:.2f} \nClientes VIPs: {vipCountLabel(report)}")  # Imprime os totais
+        if args.approx and conn is not None:  # Verifica se os rankings aproximados podem ser comparados com o SQL exato
+            from .schema import salesSource  # Importa a origem das vendas (tabela plana ou view)
+            from .sketches import compareWithSql  # Importa a comparação com as consultas exatas
+
+            print("\nPrecisão dos rankings aproximados em relação ao SQL exato\n", compareWithSql(conn, report, salesSource(conn)), sep='')  # Imprime a precisão dos rankings
+        if args.render is not None:  # Verifica se os gráficos devem ser gravados sem interface
+            from .render import renderReport  # Importa a renderização sem interface
+
+            bookTotals = None  # Inicializa as vendas por livro (gráfico opcional)
+            if args.books is not None:  # Verifica se as vendas da livraria foram informadas
+                import pandas as pd  # Importa a biblioteca Pandas para ler as vendas de livros
+
+                bookTotals = pd.read_csv(args.books, usecols=['book', 'sales_quantity']).groupby('book')['sales_quantity'].sum().sort_values(ascending=False)  # Calcula a quantidade vendida por livro
+            rendered = renderReport(args.render, report, bookTotals, tuple(args.formats), args.workers)  # Renderiza os gráficos e o relatório único
+            artifacts = rendered['artifacts']  # Obtém os artefatos gravados
+            print(f"\nRelatório em {rendered['bundle']}: {(~artifacts['cached']).sum()} artefatos desenhados e {artifacts['cached'].sum()} reaproveitados do cache em {rendered['seconds']:.2f}s")  # Exibe o resultado da renderização
+    finally:
+        if conn is not None:  # Verifica se a conexão foi aberta
+            conn.close()  # Fecha a conexão com o banco de dados
+    return 0  # Termina com sucesso
+
+def commandRollups(args):
+    """Reconstrói as tabelas de rollup do zero ou mostra se estão atualizadas.
+
+    Args:
+        args (argparse.Namespace): Argumentos do subcomando.
+
+    Returns:
+        int: Código de saída (1 no 'status' se os rollups estiverem desatualizados).
+    """
+    import sqlite3  # Importa a biblioteca SQLite para interação com bancos de dados SQLite
+
+    from .rollups import rebuildRollups, rollupsFresh  # Importa a reconstrução e a verificação dos rollups
+
+    conn = sqlite3.connect(args.db)  # Conecta ao banco de dados
+    try:
+        if args.action == 'rebuild':  # Verifica se os rollups devem ser reconstruídos
+            rebuildRollups(conn)  # Recalcula todas as tabelas de rollup a partir das vendas
+            print(f"Rollups reconstruídos em {args.db}")  # Exibe a conclusão
+            return 0  # Termina com sucesso
+        fresh = rollupsFresh(conn)  # Verifica se os rollups estão atualizados
+        print("Rollups atualizados" if fresh else "Rollups desatualizados: execute 'rollups rebuild'")  # Exibe o estado dos rollups
+        return 0 if fresh else 1  # Termina indicando o estado dos rollups
+    finally:
+        conn.close()  # Fecha a conexão com o banco de dados
+
+def commandDashboard(args):
+    """Inicia o dashboard do Streamlit em um processo próprio.
+
+    Args:
+        args (argparse.Namespace): Argumentos do subcomando.
+
+    Returns:
+        int: Código de saída do Streamlit.
+    """
+    import subprocess  # Importa a biblioteca subprocess para executar o Streamlit
+
+    command = [sys.executable, '-m', 'streamlit', 'run', dashboardScript, '--server.port', str(args.port), '--', os.path.abspath(args.db)]  # Monta o comando do Streamlit com o banco como argumento do script
+    return subprocess.call(command)  # Executa o dashboard até ser interrompido
+
+def buildParser():
+    """Monta o leitor de argumentos com os subcomandos.
+
+    Returns:
+        argparse.ArgumentParser: Leitor de argumentos.
+    """
+    parser = argparse.ArgumentParser(prog='pychallenges', description="Geração, carga e análise das vendas dos desafios")  # Cria o leitor de argumentos
+    subparsers = parser.add_subparsers(dest='command', required=True)  # Cria os subcomandos
+
+    generate = subparsers.add_parser('generate', help="Gera as vendas em CSV ou Parquet")  # Cria o subcomando de geração
+    generate.add_argument('--dataset', choices=['ecommerce', 'books'], default='ecommerce', help="Conjunto de dados")  # Define o conjunto de dados
+    generate.add_argument('--rows', type=int, default=3000, help="Número de vendas")  # Define o número de vendas
+    generate.add_argument('--customers', type=int, default=1600, help="Número de clientes únicos")  # Define o número de clientes
+    generate.add_argument('--seed', type=int, default=42, help="Seed da geração")  # Define o seed
+    generate.add_argument('--output', default='sales.csv', help="Arquivo '.csv', '.csv.gz' ou pasta '.parquet' (com --shards, a pasta das partes)")  # Define a saída
+    generate.add_argument('--format', choices=['csv', 'parquet'], help="Formato de saída. Padrão é pela extensão de --output (com --shards, 'csv')")  # Define o formato de saída
+    generate.add_argument('--compact', action='store_true', help="Usa categorias e tipos numéricos reduzidos")  # Define a representação compacta
+    generate.add_argument('--shards', type=int, default=1, help="Número de shards gerados em processos paralelos")  # Define a geração paralela
+    generate.set_defaults(handler=commandGenerate)  # Associa o subcomando à função
+
+    load = subparsers.add_parser('load', help="Carrega as vendas do e-commerce no SQLite")  # Cria o subcomando de carga
+    load.add_argument('--db', default='salesEcommerce.db', help="Banco de dados SQLite")  # Define o banco
+    load.add_argument('--rows', type=int, default=3000, help="Número de vendas da carga completa")  # Define o número de vendas
+    load.add_argument('--customers', type=int, default=1600, help="Número de clientes da carga completa")  # Define o número de clientes
+    load.add_argument('--seed', type=int, default=42, help="Seed da geração")  # Define o seed
+    load.add_argument('--storage', choices=['flat', 'star'], default='flat', help="Layout do banco")  # Define o layout do banco
+    load.add_argument('--incremental', action='store_true', help="Acrescenta apenas os próximos dias ao banco existente")  # Define a carga incremental
+    load.add_argument('--days', type=int, default=1, help="Dias novos na carga incremental")  # Define o número de dias novos
+    load.add_argument('--orders-per-day', type=int, default=10, help="Vendas por dia na carga incremental")  # Define as vendas por dia
+    load.add_argument('--new-customers-per-day', type=int, default=0, help="Clientes novos por dia na carga incremental")  # Define os clientes novos por dia
+    load.set_defaults(handler=commandLoad)  # Associa o subcomando à função
+
+    report = subparsers.add_parser('report', help="Imprime o relatório do e-commerce")  # Cria o subcomando de relatório
+    report.add_argument('--db', default='salesEcommerce.db', help="Banco de dados SQLite")  # Define o banco
+    report.add_argument('--input', help="Lê as vendas de um arquivo CSV ou Parquet em vez do banco")  # Define o arquivo de entrada
+    report.add_argument('--approx', action='store_true', help="Usa rankings aproximados com memória limitada")  # Define os rankings aproximados
+    report.add_argument('--epsilon', type=float, help="Erro máximo dos rankings aproximados (fração do total)")  # Define o erro dos rankings
+    report.add_argument('--render', metavar='DIR', help="Grava os gráficos e o 'report.html' nesta pasta, sem interface")  # Define a pasta do relatório renderizado
+    report.add_argument('--formats', nargs='+', choices=['png', 'svg'], default=['png'], help="Formatos das imagens dos gráficos")  # Define os formatos das imagens
+    report.add_argument('--workers', type=int, help="Processos usados para desenhar os gráficos")  # Define o número de processos
+    report.add_argument('--books', help="CSV de vendas da livraria para o gráfico de vendas por livro")  # Define as vendas de livros
+    report.set_defaults(handler=commandReport)  # Associa o subcomando à função
+
+    rollups = subparsers.add_parser('rollups', help="Reconstrói ou verifica as tabelas de rollup do dashboard")  # Cria o subcomando dos rollups
+    rollups.add_argument('action', choices=['rebuild', 'status'], help="'rebuild' recalcula os rollups do zero; 'status' informa se estão atualizados")  # Define a ação
+    rollups.add_argument('--db', default='salesEcommerce.db', help="Banco de dados SQLite")  # Define o banco
+    rollups.set_defaults(handler=commandRollups)  # Associa o subcomando à função
+
+    dashboard = subparsers.add_parser('dashboard', help="Inicia o dashboard do Streamlit")  # Cria o subcomando do dashboard
+    dashboard.add_argument('--db', default='salesEcommerce.db', help="Banco de dados SQLite")  # Define o banco
+    dashboard.add_argument('--port', type=int, default=8501, help="Porta do servidor")  # Define a porta
+    dashboard.set_defaults(handler=commandDashboard)  # Associa o subcomando à função
+    return parser  # Retorna o leitor de argumentos
+
+def main(argv=None):
+    """Executa um subcomando.
+
+    Args:
+        argv (list, optional): Argumentos da linha de comando. Padrão é `sys.argv`.
+
+    Returns:
+        int: Código de saída.
+    """
+    args = buildParser().parse_args(argv)  # Lê os argumentos
+    return args.handler(args)  # Executa o subcomando
@@ -0,0 +1,85 @@
+"""
+Geração vetorizada da dimensão de clientes.
+
+O Faker é chamado apenas para montar "pools" de valores (nomes, sobrenomes, cidades e
+domínios de e-mail). Os clientes são montados sorteando índices desses pools com o NumPy
+e compondo as strings de forma vetorizada, então o custo com o Faker depende do tamanho
+do pool e não do número de clientes.
+"""
+
+import unicodedata  # Importa a biblioteca unicodedata para remover acentos dos e-mails
+
+import numpy as np  # Importa a biblioteca NumPy para operações numéricas
+import pandas as pd  # Importa a biblioteca Pandas para manipulação de dados
+
+defaultPoolSize = 1000  # Define o tamanho padrão de cada pool de valores do Faker
+referenceDate = np.datetime64('2024-01-01')  # Define a data de referência para o cálculo das idades
+
+def stripAccents(text):
+    """Remove acentos e caracteres não ASCII de um texto.
+
+    Args:
+        text (str): Texto original.
+
+    Returns:
+        str: Texto sem acentos, em letras minúsculas e sem espaços.
+    """
+    normalized = unicodedata.normalize('NFKD', text)  # Separa as letras dos acentos
+    return normalized.encode('ascii', 'ignore').decode('ascii').lower().replace(' ', '')  # Remove os acentos e espaços
+
+def buildPools(rng, locale='pt_BR', poolSize=defaultPoolSize):
+    """Sorteia com o Faker os pools de valores usados na montagem dos clientes.
+
+    Args:
+        rng (numpy.random.Generator): Gerador usado para definir o seed do Faker.
+        locale (str, optional): Localidade do Faker. Padrão é 'pt_BR'.
+        poolSize (int, optional): Número de valores de cada pool. Padrão é 1000.
+
+    Returns:
+        dict: Dicionário com os arrays 'firstNames', 'lastNames', 'cities' e 'emailDomains'.
+    """
+    from faker import Faker  # Importa o Faker apenas quando os pools são sorteados (a importação é lenta)
+
+    fake = Faker(locale)  # Inicializa o Faker na localidade informada
+    fake.seed_instance(int(rng.integers(0, 2**31)))  # Define o seed do Faker a partir do gerador para reproduzir os pools
+    return {'firstNames': np.array([fake.first_name() for _ in range(poolSize)]),
+            'lastNames': np.array([fake.last_name() for _ in range(poolSize)]),
+            'cities': np.array([fake.city() for _ in range(poolSize)]),
+            'emailDomains': np.array(sorted({fake.free_email_domain() for _ in range(max(poolSize // 50, 1))}))
+            }  # Retorna os pools como arrays do NumPy
+
+def generateCustomerTable(numCustomer, rng, locale='pt_BR', poolSize=defaultPoolSize, firstId=1001, pools=None):
+    """Gera a dimensão de clientes fictícios em formato colunar.
+
+    Args:
+        numCustomer (int): Número de clientes a serem gerados.
+        rng (numpy.random.Generator): Gerador de números aleatórios usado em todos os sorteios.
+        locale (str, optional): Localidade do Faker. Padrão é 'pt_BR'.
+        poolSize (int, optional): Número de valores de cada pool do Faker. Padrão é 1000.
+        firstId (int, optional): Primeiro `customer_id` a ser atribuído. Padrão é 1001.
+        pools (dict, optional): Pools já sorteados com `buildPools`. Padrão é sortear novos pools.
+
+    Returns:
+        pandas.DataFrame: Tabela com as colunas 'customer_id', 'customer', 'city', 'email' e
+            'customer_birth_date', com um `customer_id` inteiro e único por linha.
+    """
+    pools = pools if pools is not None else buildPools(rng, locale, poolSize)  # Sorteia os pools caso não tenham sido informados
+    customerIds = np.arange(firstId, firstId + numCustomer, dtype=np.int64)  # Gera IDs inteiros e únicos para os clientes
+    firstIdx = rng.integers(0, len(pools['firstNames']), numCustomer)  # Sorteia o índice do nome de cada cliente
+    lastIdx = rng.integers(0, len(pools['lastNames']), numCustomer)  # Sorteia o índice do sobrenome de cada cliente
+    cityIdx = rng.integers(0, len(pools['cities']), numCustomer)  # Sorteia o índice da cidade de cada cliente
+    domainIdx = rng.integers(0, len(pools['emailDomains']), numCustomer)  # Sorteia o índice do domínio de e-mail de cada cliente
+    ageDays = rng.integers(18 * 365, 80 * 365, numCustomer)  # Sorteia a idade de cada cliente em dias (entre 18 e 80 anos)
+
+    emailFirst = np.array([stripAccents(name) for name in pools['firstNames']])  # Prepara os nomes do pool para os e-mails
+    emailLast = np.array([stripAccents(name) for name in pools['lastNames']])  # Prepara os sobrenomes do pool para os e-mails
+    emails = np.char.add(np.char.add(emailFirst[firstIdx], '.'), emailLast[lastIdx])  # Compõe o início dos e-mails com nome e sobrenome
+    emails = np.char.add(np.char.add(emails, customerIds.astype(str)), '@')  # Adiciona o ID do cliente para garantir e-mails únicos
+    emails = np.char.add(emails, pools['emailDomains'][domainIdx])  # Adiciona o domínio dos e-mails
+
+    return pd.DataFrame({'customer_id': customerIds,
+                         'customer': np.char.add(np.char.add(pools['firstNames'][firstIdx], ' '), pools['lastNames'][lastIdx]),
+                         'city': pools['cities'][cityIdx],
+                         'email': emails,
+                         'customer_birth_date': (referenceDate - ageDays.astype('timedelta64[D]')).astype('datetime64[ns]')
+                         }).astype({'customer': object, 'city': object, 'email': object})  # Cria a tabela de clientes
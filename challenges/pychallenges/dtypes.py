@@ -0,0 +1,132 @@
+"""
+Representação compacta (tipos de dados enxutos) dos DataFrames de vendas.
+
+As colunas de texto com poucos valores distintos (categoria, produto, cliente, cidade,
+e-mail, livro, editora, autor) viram categóricas com um domínio fixo, montado a partir das
+dimensões antes da geração. Como o domínio é o mesmo em todos os blocos, `pd.concat` mantém as
+colunas categóricas. Os inteiros são reduzidos ao menor tipo que comporta os valores e os
+números reais só são reduzidos quando a conversão é exata, então agrupamentos, somas e a
+exportação para o SQLite produzem exatamente os mesmos resultados.
+"""
+
+import numpy as np  # Importa a biblioteca NumPy para operações numéricas
+import pandas as pd  # Importa a biblioteca Pandas para manipulação de dados
+
+from .catalog import bookList, publisherList  # Importa as listas de livros e editoras
+
+def domainDtype(values):
+    """Monta um tipo categórico com os valores distintos ordenados.
+
+    Args:
+        values (array-like): Valores possíveis da coluna.
+
+    Returns:
+        pandas.CategoricalDtype: Tipo categórico com o domínio da coluna.
+    """
+    return pd.CategoricalDtype(np.unique(np.asarray(values, dtype=object).astype(str)))  # Ordena as categorias como os agrupamentos ordenam os textos
+
+def salesDomains(customers, categoriesList):
+    """Monta os domínios das colunas categóricas das vendas do e-commerce.
+
+    Args:
+        customers (pandas.DataFrame): Tabela de clientes (veja `customers.generateCustomerTable`).
+        categoriesList (dict): Dicionário com categorias e produtos.
+
+    Returns:
+        dict: Dicionário com a coluna e o seu tipo categórico.
+    """
+    products = [product for productList in categoriesList.values() for product in productList]  # Lista os produtos de todas as categorias
+    return {'category': domainDtype(list(categoriesList.keys())),
+            'product': domainDtype(products),
+            'customer': domainDtype(customers['customer']),
+            'city': domainDtype(customers['city']),
+            'email': domainDtype(customers['email'])
+            }  # Retorna os domínios das colunas
+
+def bookDomains(dimensions):
+    """Monta os domínios das colunas categóricas das vendas da livraria.
+
+    Args:
+        dimensions (dict): Dimensões geradas por `generator.buildBookDimensions`.
+
+    Returns:
+        dict: Dicionário com a coluna e o seu tipo categórico.
+    """
+    return {'book': domainDtype(bookList),
+            'publisher': domainDtype(publisherList),
+            'author': domainDtype(dimensions['authors']),
+            'customer': domainDtype(dimensions['customers']['customer'])
+            }  # Retorna os domínios das colunas
+
+def narrowNumeric(values):
+    """Reduz uma coluna numérica ao menor tipo que representa os valores sem perda.
+
+    Args:
+        values (pandas.Series): Coluna numérica.
+
+    Returns:
+        pandas.Series: Coluna com o tipo reduzido (ou a original, se não houver redução exata).
+    """
+    if pd.api.types.is_integer_dtype(values):  # Verifica se a coluna é de inteiros
+        narrowed = pd.to_numeric(values, downcast='integer')  # Reduz os inteiros ao menor tipo com sinal (as somas continuam em int64)
+        if narrowed.dtype == np.int64 and len(values) and values.min() >= 0:  # Verifica se só um tipo sem sinal comporta os valores (códigos de 32 bits)
+            narrowed = pd.to_numeric(values, downcast='unsigned')  # Reduz os inteiros ao menor tipo sem sinal
+        return narrowed  # Retorna a coluna reduzida
+    narrowed = values.astype(np.float32)  # Converte os números reais para 32 bits
+    if np.array_equal(narrowed.to_numpy(np.float64), values.to_numpy(np.float64)):  # Verifica se a conversão é exata
+        return narrowed  # Retorna a coluna reduzida
+    return values  # Mantém a coluna original, pois a redução mudaria as somas
+
+def compactDtypes(chunk, domains):
+    """Converte um bloco de vendas para a representação compacta.
+
+    Args:
+        chunk (pandas.DataFrame): Bloco de vendas.
+        domains (dict): Domínios das colunas categóricas (veja `salesDomains` e `bookDomains`).
+
+    Returns:
+        pandas.DataFrame: Bloco com colunas categóricas e numéricas reduzidas.
+    """
+    converted = {}  # Inicializa as colunas convertidas
+    for col in chunk.columns:  # Itera sobre as colunas do bloco
+        values = chunk[col]  # Obtém os valores da coluna
+        if col in domains:  # Verifica se a coluna tem um domínio categórico
+            converted[col] = values.astype(domains[col])  # Converte a coluna para categórica
+        elif pd.api.types.is_numeric_dtype(values) and not pd.api.types.is_bool_dtype(values):  # Verifica se a coluna é numérica
+            converted[col] = narrowNumeric(values)  # Reduz o tipo numérico
+    return chunk.assign(**converted)  # Retorna o bloco compacto
+
+def withCompactDtypes(chunks, domains):
+    """Converte cada bloco gerado para a representação compacta.
+
+    Args:
+        chunks (iterable): Blocos (DataFrames) de vendas.
+        domains (dict): Domínios das colunas categóricas.
+
+    Yields:
+        pandas.DataFrame: O bloco na representação compacta.
+    """
+    for chunk in chunks:  # Itera sobre os blocos
+        yield compactDtypes(chunk, domains)  # Entrega o bloco compacto
+
+def memoryReport(frame, baseline=None):
+    """Monta um relatório de memória por coluna.
+
+    Args:
+        frame (pandas.DataFrame): DataFrame medido.
+        baseline (pandas.DataFrame, optional): DataFrame de referência (por exemplo, sem a
+            representação compacta) para comparação. Padrão é nenhum.
+
+    Returns:
+        pandas.DataFrame: Tipo e megabytes de cada coluna (e da referência, com a razão), com uma linha de total.
+    """
+    report = pd.DataFrame({'dtype': frame.dtypes.astype(str),
+                           'MB': frame.memory_usage(index=False, deep=True) / 1024**2})  # Mede o tipo e a memória de cada coluna
+    if baseline is not None:  # Verifica se há uma referência
+        report['baselineDtype'] = baseline.dtypes.astype(str)  # Adiciona o tipo de cada coluna na referência
+        report['baselineMB'] = baseline.memory_usage(index=False, deep=True) / 1024**2  # Adiciona a memória de cada coluna na referência
+    report.loc['total'] = report.sum(numeric_only=True)  # Adiciona a linha de total
+    report.loc['total', report.columns.str.lower().str.endswith('dtype')] = ''  # Deixa os tipos em branco na linha de total
+    if baseline is not None:  # Verifica se há uma referência
+        report['ratio'] = report['baselineMB'] / report['MB']  # Calcula quantas vezes a coluna ficou menor
+    return report.round(2)  # Retorna o relatório
@@ -0,0 +1,159 @@
+"""
+Geração vetorizada de dados de vendas do e-commerce e da livraria.
+
+Todas as colunas são sorteadas com operações do NumPy sobre blocos (chunks) de tamanho
+fixo, usando um `numpy.random.Generator` recebido como parâmetro. Assim o mesmo seed
+(com o mesmo tamanho de bloco) reproduz exatamente os mesmos dados e a memória usada
+fica limitada ao tamanho do bloco, independente do total de linhas.
+"""
+
+import numpy as np  # Importa a biblioteca NumPy para operações numéricas
+import pandas as pd  # Importa a biblioteca Pandas para manipulação de dados
+
+from .catalog import bookList, publisherList  # Importa as listas de livros e editoras
+from .customers import buildPools, generateCustomerTable  # Importa as funções de geração vetorizada de clientes
+from .dtypes import compactDtypes, salesDomains  # Importa a conversão para a representação compacta
+
+defaultChunkSize = 100_000  # Define o número padrão de linhas por bloco gerado
+salesStartDate = np.datetime64('2024-01-01')  # Define a data inicial das vendas
+salesNumDays = 365  # Define o número de dias cobertos pelas vendas
+
+def buildProductLookup(categoriesList):
+    """Monta a tabela de consulta de produtos por categoria.
+
+    Args:
+        categoriesList (dict): Dicionário com categorias e produtos.
+
+    Returns:
+        tuple: Array com as categorias, matriz (categoria x produto) com os nomes dos produtos
+            e array com a quantidade de produtos de cada categoria.
+    """
+    categories = np.array(list(categoriesList.keys()), dtype=object)  # Cria o array de categorias
+    productCounts = np.array([len(products) for products in categoriesList.values()])  # Conta os produtos de cada categoria
+    productTable = np.full((len(categories), productCounts.max()), None, dtype=object)  # Cria a matriz de produtos vazia
+    for catIdx, products in enumerate(categoriesList.values()):  # Itera sobre as categorias (apenas uma vez, fora dos blocos)
+        productTable[catIdx, :len(products)] = products  # Preenche a linha da categoria com seus produtos
+    return categories, productTable, productCounts  # Retorna a tabela de consulta
+
+def generateSalesChunks(numRows, customers, categoriesList, rng, chunkSize=defaultChunkSize, startDate=salesStartDate, numDays=salesNumDays):
+    """Gera dados de vendas fictícias em blocos de tamanho fixo.
+
+    Args:
+        numRows (int): Número total de linhas de dados a serem geradas.
+        customers (pandas.DataFrame): Tabela de clientes (veja `customers.generateCustomerTable`).
+        categoriesList (dict): Dicionário com categorias e produtos.
+        rng (numpy.random.Generator): Gerador de números aleatórios usado em todos os sorteios.
+        chunkSize (int, optional): Número máximo de linhas por bloco. Padrão é 100.000.
+        startDate (numpy.datetime64, optional): Primeiro dia das vendas. Padrão é 2024-01-01.
+        numDays (int, optional): Número de dias cobertos pelas vendas. Padrão é 365.
+
+    Yields:
+        pandas.DataFrame: Um bloco com até `chunkSize` linhas de vendas.
+    """
+    startDate = np.datetime64(startDate, 'D')  # Normaliza a data inicial para dias
+    categories, productTable, productCounts = buildProductLookup(categoriesList)  # Monta a tabela de consulta de produtos
+    customerCols = {col: customers[col].to_numpy() for col in ['customer', 'customer_id', 'city', 'email', 'customer_birth_date']}  # Extrai as colunas dos clientes como arrays
+    numCustomer = len(customers)  # Obtém o número de clientes
+
+    for start in range(0, numRows, chunkSize):  # Itera sobre os blocos
+        size = min(chunkSize, numRows - start)  # Calcula o tamanho do bloco atual
+        catIdx = rng.integers(0, len(categories), size)  # Sorteia o índice da categoria de cada venda
+        prodIdx = (rng.random(size) * productCounts[catIdx]).astype(np.int64)  # Sorteia o índice do produto dentro da categoria
+        custIdx = rng.integers(0, numCustomer, size)  # Sorteia o índice do cliente de cada venda
+        discount = np.round(rng.uniform(0, 10, size), 1)  # Sorteia os descontos
+        unitPrice = np.round(rng.uniform(25, 600, size), 2)  # Sorteia os preços unitários
+        quantity = rng.integers(1, 14, size)  # Sorteia as quantidades vendidas
+        salesDate = startDate + rng.integers(0, numDays, size).astype('timedelta64[D]')  # Sorteia as datas das vendas
+        salesCode = rng.integers(0, 2**32, size)  # Sorteia códigos de venda inteiros de 32 bits
+        salesValue = quantity * unitPrice  # Calcula o valor total das vendas
+
+        yield pd.DataFrame({'category': categories[catIdx],
+                            '%_discount': discount,
+                            'unit_price': unitPrice,
+                            'sales_quantity': quantity,
+                            'sales_date': salesDate.astype('datetime64[ns]'),
+                            'customer': customerCols['customer'][custIdx],
+                            'sales_code': salesCode,
+                            'customer_id': customerCols['customer_id'][custIdx],
+                            'city': customerCols['city'][custIdx],
+                            'email': customerCols['email'][custIdx],
+                            'customer_birth_date': customerCols['customer_birth_date'][custIdx],
+                            'sales_value': salesValue,
+                            'product': productTable[catIdx, prodIdx],
+                            'total_price': np.round(salesValue * (1 - discount / 100), 2)
+                            })  # Entrega o bloco como DataFrame
+
+def generateSalesData(numRows, customers, categoriesList, rng=None, compact=False):
+    """Gera dados de vendas fictícias em um único DataFrame.
+
+    Args:
+        numRows (int): Número de linhas de dados a serem geradas.
+        customers (pandas.DataFrame): Tabela de clientes (veja `customers.generateCustomerTable`).
+        categoriesList (dict): Dicionário com categorias e produtos.
+        rng (numpy.random.Generator, optional): Gerador de números aleatórios. Padrão é um gerador sem seed.
+        compact (bool, optional): Se o DataFrame deve usar a representação compacta (veja `dtypes.py`). Padrão é False.
+
+    Returns:
+        pandas.DataFrame: Um DataFrame contendo dados de vendas.
+    """
+    rng = rng if rng is not None else np.random.default_rng()  # Cria um gerador caso nenhum tenha sido informado
+    df = next(generateSalesChunks(numRows, customers, categoriesList, rng, chunkSize=max(numRows, 1)))  # Gera todas as linhas em um único bloco
+    return compactDtypes(df, salesDomains(customers, categoriesList)) if compact else df  # Retorna o DataFrame (na representação compacta, se pedido)
+
+def buildBookDimensions(numCustomer, rng):
+    """Gera as dimensões compartilhadas pelas vendas da livraria (clientes, autores e IDs dos livros).
+
+    Args:
+        numCustomer (int): Número de clientes únicos a serem gerados.
+        rng (numpy.random.Generator): Gerador de números aleatórios usado em todos os sorteios.
+
+    Returns:
+        dict: Dicionário com a tabela 'customers', o array 'authors' e o array 'bookIds'.
+    """
+    pools = buildPools(rng, locale='en_US')  # Sorteia os pools de nomes do Faker em inglês (EUA)
+    customers = generateCustomerTable(numCustomer, rng, pools=pools)  # Gera a tabela de clientes a partir dos pools
+    authors = np.char.add(np.char.add(rng.choice(pools['firstNames'], len(bookList)), ' '), rng.choice(pools['lastNames'], len(bookList)))  # Compõe os nomes dos autores a partir dos pools
+    bookIds = rng.choice(np.arange(1001, 2000), len(bookList), replace=False)  # Gera IDs aleatórios para os livros
+    return {'customers': customers, 'authors': authors.astype(object), 'bookIds': bookIds}  # Retorna as dimensões
+
+def generateBookSalesChunks(numRows, dimensions, rng, chunkSize=defaultChunkSize):
+    """Gera dados de vendas de livros em blocos de tamanho fixo.
+
+    Args:
+        numRows (int): Número total de linhas de dados a serem geradas.
+        dimensions (dict): Dimensões geradas por `buildBookDimensions`.
+        rng (numpy.random.Generator): Gerador de números aleatórios usado em todos os sorteios.
+        chunkSize (int, optional): Número máximo de linhas por bloco. Padrão é 100.000.
+
+    Yields:
+        pandas.DataFrame: Um bloco com até `chunkSize` linhas de vendas de livros.
+    """
+    books = np.array(bookList, dtype=object)  # Cria o array de títulos de livros
+    publishers = np.array(publisherList, dtype=object)  # Cria o array de editoras
+    customerNames = dimensions['customers']['customer'].to_numpy()  # Obtém os nomes dos clientes
+    customerBirths = dimensions['customers']['customer_birth_date'].to_numpy()  # Obtém as datas de nascimento dos clientes
+    numCustomer = len(customerNames)  # Obtém o número de clientes
+
+    for start in range(0, numRows, chunkSize):  # Itera sobre os blocos
+        size = min(chunkSize, numRows - start)  # Calcula o tamanho do bloco atual
+        bookIdx = rng.integers(0, len(books), size)  # Sorteia o índice do livro de cada venda
+        custIdx = rng.integers(0, numCustomer, size)  # Sorteia o índice do cliente de cada venda
+        unitPrice = np.round(rng.uniform(25, 250, size), 2)  # Sorteia os preços unitários
+        quantity = rng.integers(1, 14, size)  # Sorteia as quantidades vendidas
+        salesDate = np.datetime64('2024-01-01') + rng.integers(0, 366, size).astype('timedelta64[D]')  # Sorteia as datas das vendas
+        discount = np.round(rng.uniform(0, 10, size), 1)  # Sorteia os descontos
+        salesValue = quantity * unitPrice  # Calcula o valor total das vendas
+
+        yield pd.DataFrame({'book': books[bookIdx],
+                            'publisher': publishers[rng.integers(0, len(publishers), size)],
+                            'author': dimensions['authors'][rng.integers(0, len(books), size)],
+                            'unit_price': unitPrice,
+                            'sales_quantity': quantity,
+                            'sales_date': salesDate.astype('datetime64[ns]'),
+                            'customer': customerNames[custIdx],
+                            'birth_date': customerBirths[custIdx],
+                            'book_id': dimensions['bookIds'][bookIdx],
+                            'sales_value': salesValue,
+                            '%_discount': discount,
+                            'total_price': np.round(salesValue * (1 - discount / 100), 2)
+                            })  # Entrega o bloco como DataFrame
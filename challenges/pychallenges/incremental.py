@@ -0,0 +1,250 @@
+"""
+Carga incremental diária do banco 'salesEcommerce.db'.
+
+Depois da carga inicial, `appendDays` gera apenas os próximos dias de vendas e os acrescenta
+ao banco sem reescrever o histórico. A tabela `load_state` guarda a marca d'água da carga (o
+último `sales_day` carregado e o maior `customer_id`); cada janela nova começa no dia seguinte
+e pode incluir clientes recém-cadastrados, com IDs a partir do maior ID existente. As linhas
+novas entram com `INSERT` na tabela existente (os índices de cobertura são atualizados linha a
+linha) e os rollups recebem apenas os agregados da janela. Os compradores são sorteados pelos
+IDs e só as linhas sorteadas da tabela de clientes são lidas, então o custo de cada atualização
+é proporcional aos dados novos e não ao histórico nem à base de clientes.
+"""
+
+import json  # Importa a biblioteca json para enviar a lista de IDs em um único parâmetro
+import time  # Importa a biblioteca time para medir a duração da carga
+
+import numpy as np  # Importa a biblioteca NumPy para operações numéricas
+import pandas as pd  # Importa a biblioteca Pandas para manipulação de dados
+
+from .catalog import categoriesList as defaultCategories  # Importa o catálogo de categorias e produtos
+from .customers import defaultPoolSize, generateCustomerTable  # Importa a função de geração vetorizada de clientes
+from .generator import defaultChunkSize, generateSalesChunks  # Importa a função de geração vetorizada de vendas
+from .loader import dtypeDict, loadSales, salesIndexes  # Importa a função de carga em massa no SQLite
+from .rollups import markRollupsFresh, rollupsFresh, withRollups  # Importa a manutenção incremental dos rollups
+from .schema import dimensionsDdl, loadStarSchema, migrateDateColumns, salesSource, upsertDimension  # Importa a carga no esquema estrela, a gravação das dimensões e a atualização de bancos antigos
+
+customerColumns = ['customer_id', 'customer', 'city', 'email', 'customer_birth_date']  # Define as colunas da tabela de clientes
+
+def createLoadState(conn):
+    """Cria a tabela com a marca d'água da carga incremental, caso ainda não exista.
+
+    Args:
+        conn (sqlite3.Connection): Conexão com o banco de dados.
+    """
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS load_state (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            last_sales_day INTEGER NOT NULL,
+            last_customer_id INTEGER NOT NULL,
+            batches INTEGER NOT NULL
+        )
+    ''')  # Cria a tabela de controle da carga incremental
+
+def ensureCustomers(conn):
+    """Garante a tabela 'customers' com os clientes já carregados.
+
+    No esquema estrela a dimensão já existe. No layout plano ela é montada uma única vez a
+    partir das vendas; depois disso cada janela só acrescenta os clientes novos.
+
+    Args:
+        conn (sqlite3.Connection): Conexão com o banco de dados.
+    """
+    exists = conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'customers'").fetchone()  # Procura a tabela de clientes
+    if exists:  # Verifica se a tabela já existe
+        return  # Não há nada a montar
+    conn.execute(dimensionsDdl[2])  # Cria a tabela de clientes
+    conn.execute('''
+        INSERT OR IGNORE INTO customers (customer_id, customer, city, email, customer_birth_date)
+        SELECT DISTINCT CAST(customer_id AS INTEGER), customer, city, email, customer_birth_date
+        FROM sales
+    ''')  # Preenche a tabela com os clientes das vendas (uma única vez)
+    conn.commit()  # Confirma a criação da tabela
+
+def loadWatermark(conn):
+    """Lê a marca d'água da carga incremental, calculando-a a partir dos dados na primeira vez.
+
+    Args:
+        conn (sqlite3.Connection): Conexão com o banco de dados.
+
+    Returns:
+        dict: Dicionário com 'lastSalesDay' (dias desde 1970-01-01), 'lastCustomerId' e 'batches'.
+
+    Raises:
+        ValueError: Se o banco ainda não tem vendas (faça antes a carga inicial).
+    """
+    if not conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'sales'").fetchone():  # Verifica se a tabela de vendas existe
+        raise ValueError("O banco não tem a tabela 'sales'; faça antes a carga inicial")  # Interrompe caso não haja histórico
+    migrateDateColumns(conn)  # Adiciona as colunas inteiras de data a um banco plano antigo (uma única vez)
+    createLoadState(conn)  # Cria a tabela de controle caso não exista
+    state = conn.execute("SELECT last_sales_day, last_customer_id, batches FROM load_state WHERE id = 1").fetchone()  # Lê a marca d'água gravada
+    if state is None:  # Verifica se é a primeira carga incremental
+        ensureCustomers(conn)  # Garante a tabela de clientes
+        lastDay = conn.execute("SELECT MAX(sales_day) FROM sales").fetchone()[0]  # Lê o último dia carregado (busca no índice 'day_cover')
+        lastId = conn.execute("SELECT MAX(customer_id) FROM customers").fetchone()[0]  # Lê o maior ID de cliente (busca na chave primária)
+        if lastDay is None:  # Verifica se a tabela de vendas está vazia
+            raise ValueError("A tabela 'sales' está vazia; faça antes a carga inicial")  # Interrompe caso não haja histórico
+        state = (lastDay, lastId or 1000, 0)  # Monta a marca d'água a partir dos dados
+    return {'lastSalesDay': int(state[0]), 'lastCustomerId': int(state[1]), 'batches': int(state[2])}  # Retorna a marca d'água
+
+def saveWatermark(conn, lastSalesDay, lastCustomerId, batches):
+    """Grava a marca d'água da carga incremental.
+
+    Args:
+        conn (sqlite3.Connection): Conexão com o banco de dados.
+        lastSalesDay (int): Último dia carregado (dias desde 1970-01-01).
+        lastCustomerId (int): Maior `customer_id` carregado.
+        batches (int): Número de cargas incrementais feitas.
+    """
+    conn.execute("INSERT OR REPLACE INTO load_state (id, last_sales_day, last_customer_id, batches) VALUES (1, ?, ?, ?)",
+                 (lastSalesDay, lastCustomerId, batches))  # Grava a marca d'água
+    conn.commit()  # Confirma a gravação
+
+def resetWatermark(conn):
+    """Descarta a marca d'água depois de uma carga completa, que reescreve o histórico.
+
+    No layout plano as tabelas de dimensão também são descartadas: 'categories' e 'products'
+    sobram de uma carga anterior no esquema estrela, e 'customers' só existe para a carga
+    incremental e é montada de novo a partir das vendas.
+
+    Args:
+        conn (sqlite3.Connection): Conexão com o banco de dados.
+    """
+    conn.execute("DROP TABLE IF EXISTS load_state")  # Remove a marca d'água anterior
+    if salesSource(conn) == 'sales':  # Verifica se o banco está no layout plano
+        for tableName in ('customers', 'products', 'categories'):  # Itera sobre as dimensões do esquema estrela
+            conn.execute(f"DROP TABLE IF EXISTS {tableName}")  # Remove a dimensão, que não descreve as vendas planas novas
+    conn.commit()  # Confirma a remoção
+
+def readCustomers(conn, customerIds):
+    """Lê apenas os clientes com os IDs informados (busca pela chave primária).
+
+    Args:
+        conn (sqlite3.Connection): Conexão com o banco de dados.
+        customerIds (numpy.ndarray): IDs dos clientes.
+
+    Returns:
+        pandas.DataFrame: Clientes encontrados, no formato de `customers.generateCustomerTable`.
+    """
+    query = f"SELECT {', '.join(customerColumns)} FROM customers WHERE customer_id IN (SELECT value FROM json_each(?)) ORDER BY customer_id"  # Define a consulta dos clientes pelos IDs
+    customers = pd.read_sql(query, conn, params=(json.dumps([int(customerId) for customerId in customerIds]),))  # Lê os clientes
+    customers['customer_birth_date'] = pd.to_datetime(customers['customer_birth_date']).astype('datetime64[ns]')  # Converte as datas de nascimento
+    return customers  # Retorna os clientes
+
+def sampleExistingIds(conn, numSamples, rng):
+    """Sorteia IDs de clientes já carregados, uniformemente e com reposição.
+
+    IDs são sorteados no intervalo entre o menor e o maior ID e só os que existem são aceitos,
+    repetindo o sorteio até obter `numSamples` acertos; cada acerto é uniforme entre os
+    clientes existentes, qualquer que seja a densidade dos IDs. Quando os IDs são tão esparsos
+    que o sorteio leria mais IDs do que a tabela tem, apenas a coluna de IDs é lida e o sorteio
+    é feito sobre ela.
+
+    Args:
+        conn (sqlite3.Connection): Conexão com o banco de dados.
+        numSamples (int): Número de IDs sorteados.
+        rng (numpy.random.Generator): Gerador de números aleatórios.
+
+    Returns:
+        numpy.ndarray: IDs sorteados (com repetição).
+    """
+    minId, maxId, numExisting = conn.execute("SELECT MIN(customer_id), MAX(customer_id), COUNT(*) FROM customers").fetchone()  # Lê o intervalo e o número de clientes (chave primária)
+    if numSamples == 0 or numExisting == 0:  # Verifica se há o que sortear
+        return np.empty(0, dtype=np.int64)  # Retorna nenhum ID
+    idsPerHit = (maxId - minId + 1) / numExisting  # Calcula quantos IDs sorteados custam, em média, um acerto
+    if numSamples * idsPerHit > numExisting:  # Verifica se ler a coluna de IDs é mais barato que os sorteios
+        allIds = np.fromiter((row[0] for row in conn.execute("SELECT customer_id FROM customers")), dtype=np.int64, count=numExisting)  # Lê apenas os IDs
+        return rng.choice(allIds, numSamples)  # Sorteia entre os IDs existentes
+
+    hits = []  # Inicializa os IDs aceitos
+    remaining = numSamples  # Inicializa o número de IDs que faltam
+    while remaining > 0:  # Repete até obter todos os acertos
+        candidates = rng.integers(minId, maxId + 1, int(np.ceil(remaining * idsPerHit * 1.2)) + 1)  # Sorteia IDs candidatos com folga para as lacunas
+        query = "SELECT customer_id FROM customers WHERE customer_id IN (SELECT value FROM json_each(?))"  # Define a consulta dos IDs que existem
+        found = [row[0] for row in conn.execute(query, (json.dumps(candidates.tolist()),))]  # Busca os candidatos na chave primária
+        accepted = candidates[np.isin(candidates, found)][:remaining]  # Mantém os candidatos existentes, na ordem do sorteio
+        hits.append(accepted)  # Guarda os acertos
+        remaining -= len(accepted)  # Atualiza o número de IDs que faltam
+    return np.concatenate(hits)  # Retorna os IDs sorteados
+
+def sampleCustomers(conn, numSamples, newCustomers, rng):
+    """Sorteia os compradores da janela sem ler a tabela de clientes inteira.
+
+    Cada sorteio escolhe, com a mesma probabilidade, qualquer cliente já carregado ou novo;
+    apenas as linhas dos clientes já carregados que foram sorteados são lidas do SQLite.
+
+    Args:
+        conn (sqlite3.Connection): Conexão com o banco de dados.
+        numSamples (int): Número de sorteios (normalmente o número de vendas da janela).
+        newCustomers (pandas.DataFrame): Clientes novos da janela, ainda não gravados.
+        rng (numpy.random.Generator): Gerador de números aleatórios.
+
+    Returns:
+        pandas.DataFrame: Clientes sorteados, sem repetição, entre os quais as vendas são distribuídas.
+
+    Raises:
+        ValueError: Se não há clientes carregados nem novos.
+    """
+    numExisting = conn.execute("SELECT COUNT(*) FROM customers").fetchone()[0]  # Conta os clientes já carregados
+    numClients = numExisting + len(newCustomers)  # Calcula o número total de clientes
+    if numClients == 0:  # Verifica se há clientes
+        raise ValueError("Não há clientes para gerar as vendas")  # Interrompe caso não haja clientes
+    ordinals = rng.integers(0, numClients, max(numSamples, 1))  # Sorteia a posição de cada comprador entre todos os clientes
+    isNew = ordinals >= numExisting  # Identifica os sorteios que caíram nos clientes novos
+    existingIds = sampleExistingIds(conn, int((~isNew).sum()), rng)  # Sorteia os clientes já carregados
+    return pd.concat([readCustomers(conn, np.unique(existingIds)),
+                      newCustomers.iloc[np.unique(ordinals[isNew] - numExisting)]], ignore_index=True)  # Junta os clientes sorteados já carregados e os novos
+
+def appendDays(conn, numDays, ordersPerDay, newCustomersPerDay=0, categoriesList=defaultCategories, seed=42, chunkSize=defaultChunkSize):
+    """Gera e acrescenta ao banco os próximos dias de vendas.
+
+    Args:
+        conn (sqlite3.Connection): Conexão com o banco de dados (já com a carga inicial).
+        numDays (int): Número de dias novos a partir do dia seguinte ao último carregado.
+        ordersPerDay (int): Número médio de vendas por dia.
+        newCustomersPerDay (int, optional): Número de clientes cadastrados por dia. Padrão é 0.
+        categoriesList (dict, optional): Dicionário com categorias e produtos. Padrão é o catálogo do pacote.
+        seed (int, optional): Seed base; cada janela usa o seed combinado com o seu primeiro dia,
+            então repetir a mesma janela gera os mesmos dados. Padrão é 42.
+        chunkSize (int, optional): Número máximo de linhas por bloco gerado. Padrão é 100.000.
+
+    Returns:
+        dict: Estatísticas com 'startDate', 'endDate', 'rows', 'newCustomers', 'seconds' e
+            'rowsPerSecond'.
+    """
+    start = time.perf_counter()  # Marca o início da carga
+    watermark = loadWatermark(conn)  # Lê a marca d'água da carga
+    firstDay = watermark['lastSalesDay'] + 1  # Define o primeiro dia da janela nova
+    rng = np.random.default_rng([seed, firstDay])  # Cria o gerador da janela a partir do seed e do primeiro dia
+
+    ensureCustomers(conn)  # Garante a tabela de clientes
+    numNew = numDays * newCustomersPerDay  # Calcula o número de clientes novos
+    poolSize = min(defaultPoolSize, max(numNew, 1))  # Limita os pools do Faker ao número de clientes novos
+    newCustomers = generateCustomerTable(numNew, rng, poolSize=poolSize, firstId=watermark['lastCustomerId'] + 1)  # Gera os clientes novos com IDs após o maior existente
+    numRows = numDays * ordersPerDay  # Calcula o número de vendas da janela
+    customers = sampleCustomers(conn, numRows, newCustomers, rng)  # Sorteia os compradores lendo apenas as linhas sorteadas
+    startDate = np.datetime64(firstDay, 'D')  # Converte o primeiro dia para data
+    chunks = generateSalesChunks(numRows, customers, categoriesList, rng, chunkSize, startDate=startDate, numDays=numDays)  # Gera apenas as vendas da janela
+    fresh = rollupsFresh(conn)  # Verifica se os rollups estavam atualizados antes da carga
+    if fresh:  # Verifica se os rollups devem ser mantidos
+        chunks = withRollups(conn, chunks)  # Soma cada bloco aos rollups na mesma transação da inserção
+
+    if salesSource(conn) == 'sales_flat':  # Verifica se o banco está no esquema estrela
+        stats = loadStarSchema(conn, chunks, newCustomers, categoriesList, mode='append')  # Acrescenta os clientes novos e as vendas à tabela fato
+    else:
+        upsertDimension(conn, 'customers', newCustomers[customerColumns])  # Acrescenta os clientes novos à tabela de clientes
+        conn.commit()  # Confirma os clientes novos antes das vendas
+        stats = loadSales(conn, chunks, 'sales', mode='append', dtype=dtypeDict, indexes=salesIndexes)  # Acrescenta as vendas à tabela existente
+    if fresh:  # Verifica se os rollups foram mantidos
+        markRollupsFresh(conn)  # Avança a marca d'água dos rollups
+
+    lastCustomerId = watermark['lastCustomerId'] + numNew  # Calcula o novo maior ID de cliente
+    saveWatermark(conn, firstDay + numDays - 1, lastCustomerId, watermark['batches'] + 1)  # Avança a marca d'água da carga
+    seconds = time.perf_counter() - start  # Calcula a duração da carga
+    return {'startDate': str(startDate),
+            'endDate': str(startDate + np.timedelta64(numDays - 1, 'D')),
+            'rows': stats['rows'],
+            'newCustomers': numNew,
+            'seconds': seconds,
+            'rowsPerSecond': stats['rows'] / seconds if seconds > 0 else float('inf')
+            }  # Retorna as estatísticas da carga
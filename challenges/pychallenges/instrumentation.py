@@ -0,0 +1,167 @@
+"""
+Instrumentação das consultas do dashboard e registro de consultas lentas.
+
+`QueryLog` guarda, para cada consulta executada, o tempo total, o tempo gasto no SQLite
+(execução e leitura das linhas), o tempo de conversão para DataFrame, o número de linhas e os
+parâmetros. As últimas medições ficam em um buffer circular e os totais por consulta em
+contadores, então o custo é de alguns `perf_counter` por consulta. Consultas acima do limite
+configurado vão para o registro de consultas lentas com o `EXPLAIN QUERY PLAN` anexado (o plano
+só é calculado para elas) e são emitidas no logger 'pychallenges.queries'.
+"""
+
+import logging  # Importa a biblioteca logging para emitir as consultas lentas
+import threading  # Importa a biblioteca threading para proteger os registros compartilhados
+import time  # Importa a biblioteca time para medir a duração das consultas
+from collections import deque  # Importa o deque para os buffers circulares de medições
+
+import pandas as pd  # Importa a biblioteca Pandas para manipulação de dados
+
+logger = logging.getLogger('pychallenges.queries')  # Cria o logger das consultas lentas
+
+def readFrame(conn, sql, params=()):
+    """Executa uma consulta medindo separadamente o SQLite e a conversão para DataFrame.
+
+    Args:
+        conn (sqlite3.Connection): Conexão com o banco de dados.
+        sql (str): Consulta SQL.
+        params (tuple, optional): Parâmetros da consulta SQL. Padrão é ().
+
+    Returns:
+        tuple: DataFrame com o resultado, segundos no SQLite e segundos na conversão.
+    """
+    start = time.perf_counter()  # Marca o início da execução
+    cursor = conn.execute(sql, params)  # Executa a consulta
+    rows = cursor.fetchall()  # Lê todas as linhas do resultado
+    fetched = time.perf_counter()  # Marca o fim da leitura no SQLite
+    frame = pd.DataFrame.from_records(rows, columns=[col[0] for col in cursor.description])  # Converte as linhas para DataFrame
+    return frame, fetched - start, time.perf_counter() - fetched  # Retorna o resultado e as durações
+
+class QueryLog:
+    """Registro das medições de consultas com log de consultas lentas.
+
+    Args:
+        slowSeconds (float, optional): Duração a partir da qual a consulta é considerada lenta. Padrão é 0.2.
+        maxRecords (int, optional): Número de medições recentes guardadas. Padrão é 500.
+        maxSlow (int, optional): Número de consultas lentas guardadas. Padrão é 100.
+    """
+
+    def __init__(self, slowSeconds=0.2, maxRecords=500, maxSlow=100):
+        self.slowSeconds = slowSeconds  # Guarda o limite de consulta lenta
+        self.records = deque(maxlen=maxRecords)  # Inicializa o buffer das medições recentes
+        self.slow = deque(maxlen=maxSlow)  # Inicializa o buffer das consultas lentas
+        self.totals = {}  # Inicializa os totais por chave de consulta
+        self.lock = threading.Lock()  # Cria a trava que protege os registros
+        self.counter = 0  # Inicializa o número sequencial das medições
+
+    def record(self, queryKey, sql, params, rows, wallSeconds, sqliteSeconds=0.0, convertSeconds=0.0, cached=False, plan=None, thread=None):
+        """Registra a medição de uma consulta.
+
+        Args:
+            queryKey (str): Chave da consulta.
+            sql (str): Consulta SQL executada.
+            params (tuple): Parâmetros da consulta SQL.
+            rows (int): Número de linhas retornadas.
+            wallSeconds (float): Duração total da chamada.
+            sqliteSeconds (float, optional): Duração da execução e leitura no SQLite. Padrão é 0.
+            convertSeconds (float, optional): Duração da conversão para DataFrame. Padrão é 0.
+            cached (bool, optional): Se o resultado veio do cache. Padrão é False.
+            plan (list, optional): Plano de execução (anexado às consultas lentas). Padrão é None.
+            thread (int, optional): Thread que pediu a consulta. Padrão é a thread atual.
+
+        Returns:
+            dict: Medição registrada.
+        """
+        with self.lock:  # Usa os registros com exclusividade
+            self.counter += 1  # Avança o número sequencial
+            entry = {'seq': self.counter,
+                     'thread': thread if thread is not None else threading.get_ident(),
+                     'queryKey': queryKey,
+                     'rows': rows,
+                     'wallMs': wallSeconds * 1000,
+                     'sqliteMs': sqliteSeconds * 1000,
+                     'convertMs': convertSeconds * 1000,
+                     'cached': cached,
+                     'params': tuple(params)
+                     }  # Monta a medição
+            self.records.append(entry)  # Guarda a medição recente
+            total = self.totals.setdefault(queryKey, {'calls': 0, 'cacheHits': 0, 'wallMs': 0.0, 'maxMs': 0.0, 'rows': 0})  # Obtém os totais da consulta
+            total['calls'] += 1  # Conta a chamada
+            total['cacheHits'] += cached  # Conta o acerto do cache
+            total['wallMs'] += entry['wallMs']  # Soma a duração
+            total['maxMs'] = max(total['maxMs'], entry['wallMs'])  # Atualiza a maior duração
+            total['rows'] += rows  # Soma as linhas retornadas
+            if plan is not None:  # Verifica se a consulta foi lenta
+                self.slow.append(dict(entry, sql=sql.strip(), plan=plan, at=time.time()))  # Guarda a consulta lenta com o plano
+        if plan is not None:  # Verifica se a consulta foi lenta
+            logger.warning("Consulta lenta %s: %.1f ms, %d linhas, params=%s, plano=%s", queryKey, entry['wallMs'], rows, entry['params'], plan)  # Emite a consulta lenta no logger
+        return entry  # Retorna a medição
+
+    def isSlow(self, wallSeconds):
+        """Verifica se uma duração passa do limite de consulta lenta.
+
+        Args:
+            wallSeconds (float): Duração da consulta.
+
+        Returns:
+            bool: True se a consulta é lenta.
+        """
+        return self.slowSeconds is not None and wallSeconds >= self.slowSeconds  # Compara com o limite
+
+    def mark(self):
+        """Obtém o número da última medição, para listar depois apenas as medições seguintes.
+
+        Returns:
+            int: Número sequencial da última medição.
+        """
+        with self.lock:  # Usa os registros com exclusividade
+            return self.counter  # Retorna o número da última medição
+
+    def since(self, mark, currentThread=True):
+        """Lista as medições feitas depois de uma marca.
+
+        Args:
+            mark (int): Marca obtida com `mark`.
+            currentThread (bool, optional): Se apenas as medições da thread atual (a sessão do
+                Streamlit) devem ser listadas. Padrão é True.
+
+        Returns:
+            pandas.DataFrame: Medições em ordem de execução.
+        """
+        thread = threading.get_ident()  # Obtém a thread atual
+        with self.lock:  # Usa os registros com exclusividade
+            entries = [entry for entry in self.records if entry['seq'] > mark and (not currentThread or entry['thread'] == thread)]  # Seleciona as medições
+        return pd.DataFrame(entries, columns=['seq', 'queryKey', 'rows', 'wallMs', 'sqliteMs', 'convertMs', 'cached', 'params'])  # Retorna as medições
+
+    def summary(self):
+        """Resume as medições por chave de consulta desde o início.
+
+        Returns:
+            pandas.DataFrame: Chamadas, acertos do cache, duração média e máxima e linhas por consulta.
+        """
+        with self.lock:  # Usa os registros com exclusividade
+            frame = pd.DataFrame.from_dict(self.totals, orient='index', columns=['calls', 'cacheHits', 'wallMs', 'maxMs', 'rows'])  # Copia os totais
+        frame['avgMs'] = frame['wallMs'] / frame['calls']  # Calcula a duração média
+        return frame.rename_axis('queryKey').sort_values('wallMs', ascending=False)  # Retorna os totais da consulta mais custosa para a menos
+
+    def slowQueries(self):
+        """Lista as consultas lentas registradas.
+
+        Returns:
+            pandas.DataFrame: Consultas lentas com SQL, parâmetros e plano de execução (mais recentes primeiro).
+        """
+        with self.lock:  # Usa os registros com exclusividade
+            entries = list(self.slow)[::-1]  # Copia as consultas lentas, da mais recente para a mais antiga
+        return pd.DataFrame(entries, columns=['at', 'queryKey', 'wallMs', 'sqliteMs', 'convertMs', 'rows', 'params', 'sql', 'plan'])  # Retorna as consultas lentas
+
+def queryPlan(conn, sql, params=()):
+    """Obtém o `EXPLAIN QUERY PLAN` de uma consulta.
+
+    Args:
+        conn (sqlite3.Connection): Conexão com o banco de dados.
+        sql (str): Consulta SQL.
+        params (tuple, optional): Parâmetros da consulta SQL. Padrão é ().
+
+    Returns:
+        list: Linhas do plano de execução.
+    """
+    return [row[-1] for row in conn.execute("EXPLAIN QUERY PLAN " + sql, params)]  # Retorna os passos do plano
@@ -0,0 +1,282 @@
+"""
+Carga em massa dos dados de vendas no SQLite.
+
+Os blocos gerados são gravados com `executemany` em transações grandes, com pragmas
+ajustados para carga (WAL, synchronous, cache_size e temp_store). A carga pode acrescentar
+linhas à tabela existente ('append') ou montar uma tabela de staging e trocá-la pela tabela
+final em uma única transação ('replace'), para que o dashboard nunca fique sem a tabela.
+Ao final, synchronous, cache_size e temp_store voltam aos valores anteriores da conexão; o
+journal_mode WAL é gravado no arquivo do banco e permanece ativo (é ele que permite leituras
+do dashboard durante a carga).
+"""
+
+import time  # Importa a biblioteca time para medir a duração da carga
+
+import numpy as np  # Importa a biblioteca NumPy para operações numéricas
+import pandas as pd  # Importa a biblioteca Pandas para manipulação de dados
+
+dtypeDict = {'category': 'TEXT',
+             '%_discount': 'REAL',
+             'unit_price': 'REAL',
+             'sales_code': 'TEXT',
+             'sales_quantity': 'INTEGER',
+             'sales_date': 'DATE',
+             'customer': 'TEXT',
+             'customer_id': 'TEXT',
+             'city': 'TEXT',
+             'email': 'TEXT',
+             'customer_birth_date': 'DATE',
+             'sales_value': 'REAL',
+             'product': 'TEXT',
+             'total_price': 'REAL',
+             'sales_year': 'INTEGER',
+             'sales_month': 'INTEGER',
+             'sales_day': 'INTEGER'
+             }  # Define um dicionário com os tipos de dados para cada coluna da tabela 'sales'
+
+salesIndexes = {'product_cover': ['product', 'sales_day', 'sales_quantity', 'total_price'],
+                'customer_cover': ['customer', 'sales_day', 'sales_quantity', 'total_price'],
+                'category_cover': ['category', 'sales_day', 'total_price'],
+                'day_cover': ['sales_day', 'sales_year', 'sales_month', 'total_price']
+                }  # Define os índices de cobertura da tabela 'sales' no layout plano
+
+loadPragmas = {'journal_mode': 'WAL',
+               'synchronous': 'OFF',
+               'cache_size': -262144,
+               'temp_store': 'MEMORY'
+               }  # Define os pragmas usados durante a carga (cache de 256 MB)
+
+restoredPragmas = ['synchronous', 'cache_size', 'temp_store']  # Define os pragmas da conexão restaurados após a carga (o WAL persiste no arquivo)
+
+defaultBatchRows = 500_000  # Define o número padrão de linhas por transação
+
+def applyPragmas(conn, pragmas):
+    """Aplica um conjunto de pragmas na conexão.
+
+    Args:
+        conn (sqlite3.Connection): Conexão com o banco de dados.
+        pragmas (dict): Dicionário com o nome e o valor de cada pragma.
+    """
+    for name, value in pragmas.items():  # Itera sobre os pragmas
+        conn.execute(f"PRAGMA {name} = {value}")  # Aplica o pragma
+
+def readPragmas(conn, names):
+    """Lê os valores atuais de um conjunto de pragmas.
+
+    Args:
+        conn (sqlite3.Connection): Conexão com o banco de dados.
+        names (list): Nomes dos pragmas.
+
+    Returns:
+        dict: Dicionário com o nome e o valor de cada pragma.
+    """
+    return {name: conn.execute(f"PRAGMA {name}").fetchone()[0] for name in names}  # Lê o valor de cada pragma
+
+def columnType(series, dtype):
+    """Define o tipo SQLite de uma coluna.
+
+    Args:
+        series (pandas.Series): Coluna do DataFrame.
+        dtype (dict): Dicionário com os tipos de dados de cada coluna.
+
+    Returns:
+        str: Tipo SQLite da coluna.
+    """
+    if series.name in dtype:  # Verifica se a coluna tem um tipo definido no dicionário
+        return dtype[series.name]  # Retorna o tipo definido
+    if pd.api.types.is_datetime64_any_dtype(series):  # Verifica se a coluna é de datas
+        return 'DATE'  # Retorna o tipo de datas
+    if pd.api.types.is_integer_dtype(series):  # Verifica se a coluna é de inteiros
+        return 'INTEGER'  # Retorna o tipo de inteiros
+    if pd.api.types.is_float_dtype(series):  # Verifica se a coluna é de números reais
+        return 'REAL'  # Retorna o tipo de números reais
+    return 'TEXT'  # Retorna o tipo de textos para as demais colunas
+
+def createTable(conn, tableName, chunk, dtype):
+    """Cria uma tabela com as colunas de um bloco, caso ela ainda não exista.
+
+    Args:
+        conn (sqlite3.Connection): Conexão com o banco de dados.
+        tableName (str): Nome da tabela.
+        chunk (pandas.DataFrame): Bloco com as colunas da tabela.
+        dtype (dict): Dicionário com os tipos de dados de cada coluna.
+    """
+    columns = ', '.join(f'"{col}" {columnType(chunk[col], dtype)}' for col in chunk.columns)  # Monta a definição das colunas
+    conn.execute(f'CREATE TABLE IF NOT EXISTS "{tableName}" ({columns})')  # Cria a tabela
+
+def createTableFromDtype(conn, tableName, dtype):
+    """Cria uma tabela com as colunas do dicionário de tipos, caso ela ainda não exista.
+
+    Args:
+        conn (sqlite3.Connection): Conexão com o banco de dados.
+        tableName (str): Nome da tabela.
+        dtype (dict): Dicionário com os tipos de dados de cada coluna.
+    """
+    columns = ', '.join(f'"{col}" {colType}' for col, colType in dtype.items())  # Monta a definição das colunas
+    conn.execute(f'CREATE TABLE IF NOT EXISTS "{tableName}" ({columns})')  # Cria a tabela
+
+def addDateColumns(chunk):
+    """Adiciona ao bloco as colunas inteiras de data derivadas de 'sales_date'.
+
+    As colunas 'sales_year', 'sales_month' e 'sales_day' (dias desde 1970-01-01) permitem
+    filtrar e agrupar por período com predicados de intervalo, sem `STRFTIME` por linha.
+
+    Args:
+        chunk (pandas.DataFrame): Bloco com a coluna 'sales_date'.
+
+    Returns:
+        pandas.DataFrame: Bloco com as colunas de data adicionadas.
+    """
+    days = chunk['sales_date'].to_numpy().astype('datetime64[D]')  # Converte as datas das vendas para dias
+    months = days.astype('datetime64[M]')  # Converte as datas das vendas para meses
+    return chunk.assign(sales_year=months.astype('datetime64[Y]').astype(np.int64) + 1970,
+                        sales_month=months.astype(np.int64) % 12 + 1,
+                        sales_day=days.astype(np.int64))  # Adiciona o ano, o mês e o dia (época) de forma vetorizada
+
+def createIndexes(conn, tableName, indexes):
+    """Cria os índices de uma tabela, caso ainda não existam.
+
+    Args:
+        conn (sqlite3.Connection): Conexão com o banco de dados.
+        tableName (str): Nome da tabela.
+        indexes (dict): Dicionário com o nome e as colunas de cada índice.
+    """
+    for name, columns in indexes.items():  # Itera sobre os índices
+        columnList = ', '.join(f'"{col}"' for col in columns)  # Monta a lista de colunas do índice
+        conn.execute(f'CREATE INDEX IF NOT EXISTS "idx_{tableName}_{name}" ON "{tableName}" ({columnList})')  # Cria o índice
+
+def chunkRows(chunk):
+    """Converte um bloco em linhas prontas para o `executemany`.
+
+    Args:
+        chunk (pandas.DataFrame): Bloco com os dados.
+
+    Returns:
+        iterator: Iterador de tuplas com os valores de cada linha.
+    """
+    columns = []  # Inicializa a lista de colunas convertidas
+    for col in chunk.columns:  # Itera sobre as colunas do bloco
+        values = chunk[col]  # Obtém os valores da coluna
+        if pd.api.types.is_datetime64_any_dtype(values):  # Verifica se a coluna é de datas
+            columns.append(np.datetime_as_string(values.to_numpy().astype('datetime64[D]')).tolist())  # Converte as datas para texto ISO de forma vetorizada
+        else:
+            columns.append(values.to_numpy().tolist())  # Converte os valores para tipos nativos do Python
+    return zip(*columns)  # Retorna as linhas como tuplas
+
+def insertChunks(conn, tableName, chunks, dtype, batchRows):
+    """Insere os blocos em uma tabela usando transações grandes.
+
+    Args:
+        conn (sqlite3.Connection): Conexão com o banco de dados.
+        tableName (str): Nome da tabela.
+        chunks (iterable): Blocos (DataFrames) a serem inseridos.
+        dtype (dict): Dicionário com os tipos de dados de cada coluna.
+        batchRows (int): Número de linhas por transação.
+
+    Returns:
+        int: Número de linhas inseridas.
+    """
+    totalRows = 0  # Inicializa o contador de linhas inseridas
+    pendingRows = 0  # Inicializa o contador de linhas da transação atual
+    for chunk in chunks:  # Itera sobre os blocos
+        if 'sales_date' in chunk and 'sales_day' not in chunk:  # Verifica se o bloco ainda não tem as colunas inteiras de data
+            chunk = addDateColumns(chunk)  # Materializa o ano, o mês e o dia de cada venda
+        createTable(conn, tableName, chunk, dtype)  # Cria a tabela no primeiro bloco
+        placeholders = ', '.join('?' for _ in chunk.columns)  # Monta os marcadores dos parâmetros
+        columns = ', '.join(f'"{col}"' for col in chunk.columns)  # Monta a lista de colunas
+        conn.executemany(f'INSERT INTO "{tableName}" ({columns}) VALUES ({placeholders})', chunkRows(chunk))  # Insere o bloco
+        totalRows += len(chunk)  # Atualiza o contador de linhas inseridas
+        pendingRows += len(chunk)  # Atualiza o contador de linhas da transação atual
+        if pendingRows >= batchRows:  # Verifica se a transação atingiu o tamanho definido
+            conn.commit()  # Confirma a transação
+            pendingRows = 0  # Reinicia o contador da transação
+    conn.commit()  # Confirma as linhas restantes
+    return totalRows  # Retorna o número de linhas inseridas
+
+def swapTable(conn, stagingName, tableName, indexes, views=None, onSwap=None):
+    """Troca a tabela de destino pela tabela de staging em uma única transação.
+
+    Se qualquer passo falhar, a transação é desfeita e a tabela de destino anterior continua
+    intacta. As views sobre a tabela de destino são removidas e recriadas na mesma transação,
+    então os leitores sempre encontram a view (com a tabela anterior ou com a nova). Ao trocar
+    a tabela 'sales', a marca d'água dos rollups (`rollup_state`) é descartada na mesma
+    transação, pois os rollups passam a descrever um histórico que não existe mais.
+
+    Args:
+        conn (sqlite3.Connection): Conexão com o banco de dados.
+        stagingName (str): Nome da tabela de staging.
+        tableName (str): Nome da tabela de destino.
+        indexes (dict): Dicionário com o nome e as colunas de cada índice.
+        views (dict, optional): Nome e definição (`CREATE VIEW`) das views sobre a tabela de
+            destino; uma definição None apenas remove a view. Padrão é nenhuma view.
+        onSwap (callable, optional): Função chamada com a conexão dentro da transação, depois
+            da troca, para gravar outras tabelas junto com ela. Padrão é nenhuma.
+    """
+    views = views or {}  # Considera nenhuma view caso não tenham sido informadas
+    conn.execute("BEGIN")  # Inicia a transação da troca de tabelas
+    try:
+        for viewName in views:  # Itera sobre as views da tabela de destino
+            conn.execute(f'DROP VIEW IF EXISTS "{viewName}"')  # Remove a view para permitir a troca
+        conn.execute(f'DROP TABLE IF EXISTS "{tableName}"')  # Remove a tabela de destino anterior
+        conn.execute(f'ALTER TABLE "{stagingName}" RENAME TO "{tableName}"')  # Renomeia o staging para a tabela de destino
+        createIndexes(conn, tableName, indexes)  # Cria os índices na mesma transação, depois da carga em massa
+        if tableName == 'sales':  # Verifica se a tabela trocada é a base dos rollups
+            conn.execute("DROP TABLE IF EXISTS rollup_state")  # Invalida os rollups (um histórico novo com o mesmo número de linhas repete os rowids)
+        if onSwap is not None:  # Verifica se outras tabelas devem ser gravadas junto com a troca
+            onSwap(conn)  # Grava as outras tabelas na mesma transação
+        for viewSql in views.values():  # Itera sobre as definições das views
+            if viewSql is not None:  # Verifica se a view deve ser recriada
+                conn.execute(viewSql)  # Recria a view sobre a tabela nova
+        conn.commit()  # Confirma a troca de tabelas
+    except Exception:
+        conn.rollback()  # Desfaz a troca, mantendo a tabela de destino anterior
+        raise  # Propaga o erro
+
+def loadSales(conn, chunks, tableName='sales', mode='replace', dtype=dtypeDict, batchRows=defaultBatchRows, indexes=None,
+              views=None, onSwap=None):
+    """Carrega blocos de vendas em uma tabela do SQLite.
+
+    Args:
+        conn (sqlite3.Connection): Conexão com o banco de dados.
+        chunks (iterable): Blocos (DataFrames) a serem carregados.
+        tableName (str, optional): Nome da tabela de destino. Padrão é 'sales'.
+        mode (str, optional): 'replace' para montar uma tabela de staging e trocá-la pela tabela
+            de destino de forma atômica, ou 'append' para acrescentar linhas. Padrão é 'replace'.
+        dtype (dict, optional): Tipos de dados de cada coluna. Padrão é `dtypeDict`.
+        batchRows (int, optional): Número de linhas por transação. Padrão é 500.000.
+        indexes (dict, optional): Índices da tabela de destino. Padrão é nenhum índice.
+        views (dict, optional): Views recriadas na transação da troca (apenas no modo
+            'replace'; veja `swapTable`). Padrão é nenhuma view.
+        onSwap (callable, optional): Função chamada na transação da troca (apenas no modo
+            'replace'; veja `swapTable`). Padrão é nenhuma.
+
+    Returns:
+        dict: Estatísticas da carga com 'rows', 'seconds' e 'rowsPerSecond'.
+    """
+    if mode not in ('replace', 'append'):  # Verifica se o modo de carga é suportado
+        raise ValueError(f"Modo de carga desconhecido: {mode}")  # Interrompe caso o modo não exista
+    start = time.perf_counter()  # Marca o início da carga
+    conn.commit()  # Confirma qualquer transação pendente antes da carga
+    previousPragmas = readPragmas(conn, restoredPragmas)  # Guarda os pragmas da conexão para restaurá-los após a carga
+    applyPragmas(conn, loadPragmas)  # Aplica os pragmas de carga
+
+    indexes = indexes or {}  # Considera nenhum índice caso não tenham sido informados
+    try:
+        if mode == 'append':  # Verifica se a carga é incremental
+            if dtype:  # Verifica se as colunas da tabela são conhecidas antes do primeiro bloco
+                createTableFromDtype(conn, tableName, dtype)  # Cria a tabela de destino caso não exista, mesmo sem blocos
+            rows = insertChunks(conn, tableName, chunks, dtype, batchRows)  # Insere os blocos direto na tabela de destino
+            createIndexes(conn, tableName, indexes)  # Cria os índices que ainda não existem
+            conn.commit()  # Confirma a criação dos índices
+        else:
+            stagingName = f"{tableName}_staging"  # Define o nome da tabela de staging
+            conn.execute(f'DROP TABLE IF EXISTS "{stagingName}"')  # Remove um staging anterior
+            if dtype:  # Verifica se as colunas da tabela são conhecidas antes do primeiro bloco
+                createTableFromDtype(conn, stagingName, dtype)  # Cria o staging antes dos blocos, então uma carga vazia troca por uma tabela vazia
+            rows = insertChunks(conn, stagingName, chunks, dtype, batchRows)  # Insere os blocos no staging
+            swapTable(conn, stagingName, tableName, indexes, views, onSwap)  # Troca o staging pela tabela de destino de forma atômica
+    finally:
+        applyPragmas(conn, previousPragmas)  # Restaura os pragmas da conexão (o WAL permanece ativo no arquivo)
+
+    seconds = time.perf_counter() - start  # Calcula a duração da carga
+    return {'rows': rows, 'seconds': seconds, 'rowsPerSecond': rows / seconds if seconds > 0 else float('inf')}  # Retorna as estatísticas da carga
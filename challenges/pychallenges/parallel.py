@@ -0,0 +1,192 @@
+"""
+Geração paralela dos dados em shards, com seeds determinísticos por shard.
+
+O total de linhas é dividido em `numShards` partes executadas em um pool de processos.
+Um único seed raiz é dividido com `numpy.random.SeedSequence.spawn`: o primeiro filho gera
+as dimensões compartilhadas (clientes, autores...) e cada shard recebe o seu próprio fluxo
+independente. Cada shard grava direto no destino (arquivos CSV por parte, bancos SQLite de
+staging ou arquivos de um conjunto Parquet particionado), então a saída é idêntica byte a
+byte para o mesmo seed e número de shards, qualquer que seja o número de processos usados.
+"""
+
+import os  # Importa a biblioteca os para manipulação de caminhos
+import shutil  # Importa a biblioteca shutil para remover saídas anteriores
+import sqlite3  # Importa a biblioteca SQLite para interação com bancos de dados SQLite
+from concurrent.futures import ProcessPoolExecutor  # Importa o pool de processos da biblioteca padrão
+
+import numpy as np  # Importa a biblioteca NumPy para operações numéricas
+
+from .catalog import categoriesList  # Importa o dicionário de categorias e seus respectivos produtos
+from .customers import generateCustomerTable  # Importa a função de geração vetorizada de clientes
+from .generator import buildBookDimensions, defaultChunkSize, generateBookSalesChunks, generateSalesChunks  # Importa as funções de geração vetorizada
+from .incremental import resetWatermark  # Importa o descarte da marca d'água da carga incremental
+from .loader import dtypeDict, loadSales, salesIndexes, swapTable  # Importa o dicionário de tipos, a carga em massa, os índices e a troca atômica de tabelas no SQLite
+from .rollups import rebuildRollups  # Importa a reconstrução das tabelas de rollup
+from .storage import writeParquet  # Importa a função de gravação em Parquet particionado
+
+workerDimensions = None  # Guarda as dimensões compartilhadas dentro de cada processo do pool
+
+def splitRows(numRows, numShards):
+    """Divide o total de linhas em partes quase iguais.
+
+    Args:
+        numRows (int): Número total de linhas.
+        numShards (int): Número de partes.
+
+    Returns:
+        list: Lista com o número de linhas de cada parte.
+    """
+    base, rest = divmod(numRows, numShards)  # Calcula o tamanho base e o resto da divisão
+    return [base + (1 if shardIdx < rest else 0) for shardIdx in range(numShards)]  # Distribui o resto entre as primeiras partes
+
+def buildDimensions(dataset, rng, numCustomer):
+    """Gera as dimensões compartilhadas por todos os shards de um conjunto de dados.
+
+    Args:
+        dataset (str): Conjunto de dados ('ecommerce' ou 'books').
+        rng (numpy.random.Generator): Gerador de números aleatórios das dimensões.
+        numCustomer (int): Número de clientes únicos a serem gerados.
+
+    Returns:
+        dict: Dimensões usadas pelos geradores de vendas.
+    """
+    if dataset == 'ecommerce':  # Verifica se o conjunto de dados é o do e-commerce
+        return {'customers': generateCustomerTable(numCustomer, rng)}  # Gera apenas a tabela de clientes
+    if dataset == 'books':  # Verifica se o conjunto de dados é o da livraria
+        return buildBookDimensions(numCustomer, rng)  # Gera clientes, autores e IDs dos livros
+    raise ValueError(f"Conjunto de dados desconhecido: {dataset}")  # Interrompe caso o conjunto de dados não exista
+
+def generateChunks(dataset, numRows, dimensions, rng, chunkSize):
+    """Escolhe o gerador de blocos de acordo com o conjunto de dados.
+
+    Args:
+        dataset (str): Conjunto de dados ('ecommerce' ou 'books').
+        numRows (int): Número de linhas a serem geradas.
+        dimensions (dict): Dimensões geradas por `buildDimensions`.
+        rng (numpy.random.Generator): Gerador de números aleatórios do shard.
+        chunkSize (int): Número máximo de linhas por bloco.
+
+    Returns:
+        generator: Gerador de DataFrames com as vendas.
+    """
+    if dataset == 'ecommerce':  # Verifica se o conjunto de dados é o do e-commerce
+        return generateSalesChunks(numRows, dimensions['customers'], categoriesList, rng, chunkSize)  # Retorna o gerador de vendas do e-commerce
+    return generateBookSalesChunks(numRows, dimensions, rng, chunkSize)  # Retorna o gerador de vendas da livraria
+
+def initWorker(dimensions):
+    """Recebe as dimensões compartilhadas uma única vez em cada processo do pool.
+
+    Args:
+        dimensions (dict): Dimensões geradas por `buildDimensions`.
+    """
+    global workerDimensions  # Permite alterar a variável global do processo
+    workerDimensions = dimensions  # Guarda as dimensões para os shards executados neste processo
+
+def runShard(task):
+    """Gera um shard e grava o resultado direto no destino.
+
+    Args:
+        task (tuple): Conjunto de dados, índice do shard, número de linhas, SeedSequence do shard,
+            tamanho do bloco, tipo de destino ('csv', 'sqlite' ou 'parquet') e pasta de saída.
+
+    Returns:
+        str: Caminho do arquivo gravado pelo shard.
+    """
+    dataset, shardIdx, numRows, seedSeq, chunkSize, sink, outputDir = task  # Desempacota a tarefa
+    rng = np.random.default_rng(seedSeq)  # Cria o gerador independente do shard
+    chunks = generateChunks(dataset, numRows, workerDimensions, rng, chunkSize)  # Cria o gerador de blocos do shard
+
+    if sink == 'csv':  # Verifica se o destino é CSV
+        path = os.path.join(outputDir, f"part-{shardIdx:05d}.csv")  # Define o caminho da parte CSV
+        with open(path, 'w', newline='', encoding='utf-8') as file:  # Abre o arquivo da parte
+            for chunkIdx, chunk in enumerate(chunks):  # Itera sobre os blocos gerados
+                chunk.to_csv(file, index=False, header=(chunkIdx == 0))  # Grava o bloco (com cabeçalho apenas no primeiro)
+        return path  # Retorna o caminho da parte
+
+    if sink == 'parquet':  # Verifica se o destino é Parquet
+        path = os.path.join(outputDir, 'sales.parquet')  # Define a pasta do conjunto Parquet compartilhado pelos shards
+        writeParquet(chunks, path, basename=f"part-{shardIdx:05d}")  # Grava os arquivos do shard nas pastas das partições
+        return path  # Retorna a pasta do conjunto
+
+    path = os.path.join(outputDir, f"part-{shardIdx:05d}.db")  # Define o caminho do banco de staging do shard
+    if os.path.exists(path):  # Verifica se já existe um staging anterior
+        os.remove(path)  # Remove o staging anterior
+    conn = sqlite3.connect(path)  # Conecta ao banco de staging do shard
+    loadSales(conn, chunks, 'sales', mode='append', dtype=dtypeDict if dataset == 'ecommerce' else {})  # Grava os blocos no staging com a carga em massa
+    conn.close()  # Fecha a conexão com o banco de staging
+    return path  # Retorna o caminho do staging
+
+def mergeShardDatabases(partPaths, dbPath, tableName='sales', indexes=None, rebuild=False):
+    """Junta os bancos de staging dos shards em uma única tabela, na ordem dos shards.
+
+    As linhas são copiadas para uma tabela de staging no banco final, que é trocada pela tabela
+    final em uma única transação (veja `loader.swapTable`).
+
+    Args:
+        partPaths (list): Caminhos dos bancos de staging, na ordem dos shards.
+        dbPath (str): Caminho do banco de dados final.
+        tableName (str, optional): Nome da tabela final. Padrão é 'sales'.
+        indexes (dict, optional): Índices criados na troca da tabela final. Padrão é nenhum índice.
+        rebuild (bool, optional): Se os rollups devem ser reconstruídos e a marca d'água da
+            carga incremental descartada depois da troca, como em `pipeline.loadEcommerce`.
+            Padrão é False.
+    """
+    stagingName = f"{tableName}_staging"  # Define o nome da tabela de staging
+    conn = sqlite3.connect(dbPath)  # Conecta ao banco de dados final
+    conn.execute(f'DROP TABLE IF EXISTS "{stagingName}"')  # Remove um staging anterior
+    for partIdx, partPath in enumerate(partPaths):  # Itera sobre os staging na ordem dos shards
+        conn.execute("ATTACH DATABASE ? AS part", (partPath,))  # Anexa o staging do shard
+        if partIdx == 0:  # Verifica se é o primeiro shard
+            createSql = conn.execute("SELECT sql FROM part.sqlite_master WHERE type = 'table' AND name = 'sales'").fetchone()[0]  # Obtém a definição da tabela do staging
+            conn.execute(createSql.replace('"sales"', f'"{stagingName}"', 1))  # Cria o staging final com os mesmos tipos do staging dos shards
+        conn.execute(f'INSERT INTO "{stagingName}" SELECT * FROM part.sales')  # Copia as linhas do shard
+        conn.commit()  # Confirma a cópia antes de desanexar
+        conn.execute("DETACH DATABASE part")  # Desanexa o staging do shard
+        os.remove(partPath)  # Remove o staging já copiado
+    swapTable(conn, stagingName, tableName, indexes or {}, views={'sales_flat': None})  # Troca a tabela final com os índices (a tabela juntada é plana, então a view do esquema estrela é removida)
+    if rebuild:  # Verifica se o banco final alimenta o dashboard
+        rebuildRollups(conn)  # Recalcula as tabelas de rollup a partir das vendas juntadas
+        resetWatermark(conn)  # Descarta a marca d'água da carga incremental, pois o histórico foi reescrito
+    conn.close()  # Fecha a conexão com o banco de dados final
+
+def generateParallel(dataset, numRows, outputDir, seed=42, numShards=4, workers=None, sink='csv',
+                     numCustomer=1600, chunkSize=defaultChunkSize, dbPath=None):
+    """Gera um conjunto de dados em shards executados em paralelo.
+
+    Args:
+        dataset (str): Conjunto de dados ('ecommerce' ou 'books').
+        numRows (int): Número total de linhas a serem geradas.
+        outputDir (str): Pasta onde as partes (CSV, staging SQLite ou conjunto Parquet) serão gravadas.
+        seed (int, optional): Seed raiz da geração. Padrão é 42.
+        numShards (int, optional): Número de shards. Padrão é 4.
+        workers (int, optional): Número de processos do pool. Padrão é o número de CPUs.
+        sink (str, optional): Destino dos shards ('csv', 'sqlite' ou 'parquet'). Padrão é 'csv'.
+        numCustomer (int, optional): Número de clientes únicos a serem gerados. Padrão é 1600.
+        chunkSize (int, optional): Número máximo de linhas por bloco. Padrão é 100.000.
+        dbPath (str, optional): Banco final onde os staging SQLite são juntados. Padrão é não juntar.
+
+    Returns:
+        list: Caminhos das partes gravadas, na ordem dos shards (ou `[dbPath]` se os staging forem juntados,
+            ou a pasta do conjunto no destino 'parquet').
+    """
+    if sink not in ('csv', 'sqlite', 'parquet'):  # Verifica se o destino é suportado
+        raise ValueError(f"Destino desconhecido: {sink}")  # Interrompe caso o destino não exista
+    os.makedirs(outputDir, exist_ok=True)  # Cria a pasta de saída caso não exista
+    if sink == 'parquet':  # Verifica se o destino é Parquet
+        shutil.rmtree(os.path.join(outputDir, 'sales.parquet'), ignore_errors=True)  # Remove o conjunto Parquet anterior
+
+    dimensionSeq, *shardSeqs = np.random.SeedSequence(seed).spawn(numShards + 1)  # Divide o seed raiz em um fluxo para as dimensões e um por shard
+    dimensions = buildDimensions(dataset, np.random.default_rng(dimensionSeq), numCustomer)  # Gera as dimensões compartilhadas uma única vez
+    tasks = [(dataset, shardIdx, shardRows, shardSeq, chunkSize, sink, outputDir)
+             for shardIdx, (shardRows, shardSeq) in enumerate(zip(splitRows(numRows, numShards), shardSeqs))]  # Monta as tarefas dos shards
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=initWorker, initargs=(dimensions,)) as executor:  # Cria o pool de processos
+        partPaths = list(executor.map(runShard, tasks))  # Executa os shards em paralelo mantendo a ordem
+
+    if sink == 'sqlite' and dbPath is not None:  # Verifica se os staging devem ser juntados
+        ecommerce = dataset == 'ecommerce'  # Verifica se o banco final é o do e-commerce (índices de cobertura e rollups)
+        mergeShardDatabases(partPaths, dbPath, indexes=salesIndexes if ecommerce else None, rebuild=ecommerce)  # Junta os staging no banco final
+        return [dbPath]  # Retorna o caminho do banco final
+    if sink == 'parquet':  # Verifica se o destino é Parquet
+        return partPaths[:1]  # Retorna a pasta do conjunto (a mesma para todos os shards)
+    return partPaths  # Retorna os caminhos das partes
@@ -0,0 +1,98 @@
+"""
+Etapas reutilizáveis dos desafios: geração, carga no SQLite e relatório.
+
+São as mesmas etapas executadas pelos scripts da pasta `challenges`, expostas como funções
+sem efeitos colaterais na importação, para serem chamadas pela linha de comando
+(`python -m pychallenges`) ou por outros pipelines.
+"""
+
+import numpy as np  # Importa a biblioteca NumPy para operações numéricas
+
+from .analytics import buildReport  # Importa o motor de análise em passagem única
+from .catalog import categoriesList  # Importa o dicionário de categorias e seus respectivos produtos
+from .customers import generateCustomerTable  # Importa a geração vetorizada de clientes
+from .dtypes import bookDomains, salesDomains, withCompactDtypes  # Importa a representação compacta
+from .generator import buildBookDimensions, defaultChunkSize, generateBookSalesChunks, generateSalesChunks  # Importa a geração vetorizada de vendas
+from .incremental import resetWatermark  # Importa o descarte da marca d'água da carga incremental
+from .loader import dtypeDict, loadSales, salesIndexes  # Importa a carga em massa no SQLite
+from .rollups import rebuildRollups  # Importa a reconstrução das tabelas de rollup
+from .schema import loadStarSchema  # Importa a carga no esquema estrela
+from .sketches import ApproxSalesReport, defaultEpsilon  # Importa o relatório com rankings aproximados
+
+def generateEcommerceSales(numRows=3000, numCustomer=1600, seed=42, chunkSize=defaultChunkSize, compact=False):
+    """Gera os clientes e as vendas do e-commerce em blocos.
+
+    Args:
+        numRows (int, optional): Número de vendas. Padrão é 3000.
+        numCustomer (int, optional): Número de clientes únicos. Padrão é 1600.
+        seed (int, optional): Seed da geração. Padrão é 42.
+        chunkSize (int, optional): Número máximo de linhas por bloco. Padrão é 100.000.
+        compact (bool, optional): Se os blocos usam categorias e tipos numéricos reduzidos. Padrão é False.
+
+    Returns:
+        tuple: Tabela de clientes e gerador de blocos (DataFrames) de vendas.
+    """
+    rng = np.random.default_rng(seed)  # Cria o gerador de números aleatórios com o seed definido
+    customers = generateCustomerTable(numCustomer, rng)  # Gera a tabela de clientes a partir dos pools do Faker
+    chunks = generateSalesChunks(numRows, customers, categoriesList, rng, chunkSize)  # Cria o gerador de vendas em blocos
+    if compact:  # Verifica se a representação compacta foi pedida
+        chunks = withCompactDtypes(chunks, salesDomains(customers, categoriesList))  # Converte cada bloco para categorias e tipos numéricos reduzidos
+    return customers, chunks  # Retorna os clientes e o gerador de vendas
+
+def generateBookSales(numRows=1500, numCustomer=1270, rng=None, chunkSize=defaultChunkSize, compact=False):
+    """Gera as vendas da livraria em blocos.
+
+    Args:
+        numRows (int, optional): Número de vendas. Padrão é 1500.
+        numCustomer (int, optional): Número de clientes únicos. Padrão é 1270.
+        rng (numpy.random.Generator, optional): Gerador de números aleatórios. Padrão é um gerador sem seed.
+        chunkSize (int, optional): Número máximo de linhas por bloco. Padrão é 100.000.
+        compact (bool, optional): Se os blocos usam categorias e tipos numéricos reduzidos. Padrão é False.
+
+    Returns:
+        iterator: Gerador de blocos (DataFrames) de vendas de livros.
+    """
+    rng = rng if rng is not None else np.random.default_rng()  # Cria um gerador caso nenhum tenha sido informado
+    dimensions = buildBookDimensions(numCustomer, rng)  # Gera os clientes, autores e IDs dos livros
+    chunks = generateBookSalesChunks(numRows, dimensions, rng, chunkSize)  # Cria o gerador de vendas em blocos
+    if compact:  # Verifica se a representação compacta foi pedida
+        chunks = withCompactDtypes(chunks, bookDomains(dimensions))  # Converte cada bloco para categorias e tipos numéricos reduzidos
+    return chunks  # Retorna o gerador de vendas
+
+def loadEcommerce(conn, chunks, customers, storageMode='flat'):
+    """Carrega as vendas do e-commerce no SQLite, reescrevendo o histórico, e reconstrói os rollups.
+
+    Args:
+        conn (sqlite3.Connection): Conexão com o banco de dados.
+        chunks (iterable): Blocos (DataFrames) de vendas.
+        customers (pandas.DataFrame): Tabela de clientes usada na geração.
+        storageMode (str, optional): Layout do banco: 'flat' (tabela única) ou 'star'
+            (dimensões + tabela fato). Padrão é 'flat'.
+
+    Returns:
+        dict: Estatísticas da carga (veja `loader.loadSales`).
+    """
+    if storageMode == 'star':  # Verifica se o banco deve ser normalizado
+        stats = loadStarSchema(conn, chunks, customers, categoriesList)  # Carrega as dimensões, a tabela fato e a view 'sales_flat'
+    else:
+        stats = loadSales(conn, chunks, 'sales', mode='replace', dtype=dtypeDict, indexes=salesIndexes,
+                          views={'sales_flat': None})  # Carrega as vendas trocando a tabela e removendo a view do modo normalizado na mesma transação
+    rebuildRollups(conn)  # Recalcula as tabelas de rollup usadas pelo dashboard
+    resetWatermark(conn)  # Descarta a marca d'água da carga incremental, pois o histórico foi reescrito
+    return stats  # Retorna as estatísticas da carga
+
+def salesReport(chunks, numCustomer=None, approx=False, epsilon=None):
+    """Calcula o relatório de vendas em uma única passagem sobre os blocos.
+
+    Args:
+        chunks (iterable): Blocos (DataFrames) de vendas.
+        numCustomer (int, optional): Número de clientes usado na média de valor gasto. Padrão é
+            o número de clientes que compraram.
+        approx (bool, optional): Se os rankings usam sketches de memória limitada. Padrão é False.
+        epsilon (float, optional): Erro máximo dos rankings aproximados. Padrão é o de `sketches`.
+
+    Returns:
+        dict: Métricas do relatório (veja `analytics.SalesReport.result`).
+    """
+    report = ApproxSalesReport(epsilon if epsilon is not None else defaultEpsilon) if approx else None  # Cria o acumulador aproximado, se pedido
+    return buildReport(chunks, report).result(numCustomer)  # Calcula as métricas do relatório
@@ -0,0 +1,72 @@
+"""
+Pool de conexões somente leitura com o banco de vendas.
+
+Cada conexão é aberta com a URI `file:...?mode=ro`, então não consegue gravar nem trocar o
+modo do journal. Com o banco em modo WAL os leitores não bloqueiam uns aos outros nem a
+carga, e como o módulo `sqlite3` libera o GIL durante a execução das consultas, consultas
+independentes rodam de fato em paralelo, uma em cada conexão do pool.
+"""
+
+import os  # Importa a biblioteca os para montar o caminho absoluto do banco
+import queue  # Importa a biblioteca queue para guardar as conexões livres
+import sqlite3  # Importa a biblioteca SQLite para interação com bancos de dados SQLite
+from contextlib import contextmanager  # Importa o decorador para criar o gerenciador de contexto das conexões
+from urllib.request import pathname2url  # Importa a função que converte o caminho do banco para URI
+
+def readOnlyUri(dbPath):
+    """Monta a URI somente leitura de um banco de dados.
+
+    Args:
+        dbPath (str): Caminho do banco de dados SQLite.
+
+    Returns:
+        str: URI no formato 'file:/caminho?mode=ro'.
+    """
+    return f"file:{pathname2url(os.path.abspath(dbPath))}?mode=ro"  # Retorna a URI somente leitura
+
+def enableWal(dbPath):
+    """Coloca o banco em modo WAL (persistente), para que leitores e a carga não se bloqueiem.
+
+    Args:
+        dbPath (str): Caminho do banco de dados SQLite.
+
+    Returns:
+        str: Modo do journal após a alteração.
+    """
+    conn = sqlite3.connect(dbPath)  # Abre uma conexão de escrita
+    mode = conn.execute("PRAGMA journal_mode = WAL").fetchone()[0]  # Ativa o modo WAL
+    conn.close()  # Fecha a conexão
+    return mode  # Retorna o modo do journal
+
+class ReadOnlyPool:
+    """Pool de conexões somente leitura, compartilhado entre threads.
+
+    Args:
+        dbPath (str): Caminho do banco de dados SQLite.
+        size (int, optional): Número de conexões. Padrão é 4.
+    """
+
+    def __init__(self, dbPath, size=4):
+        self.size = size  # Guarda o número de conexões
+        self.idle = queue.Queue()  # Inicializa a fila de conexões livres
+        for _ in range(size):  # Itera sobre as conexões do pool
+            conn = sqlite3.connect(readOnlyUri(dbPath), uri=True, check_same_thread=False)  # Abre a conexão somente leitura
+            self.idle.put(conn)  # Deixa a conexão livre
+
+    @contextmanager
+    def connection(self):
+        """Empresta uma conexão do pool, esperando se todas estiverem em uso.
+
+        Yields:
+            sqlite3.Connection: Conexão somente leitura.
+        """
+        conn = self.idle.get()  # Obtém uma conexão livre
+        try:
+            yield conn  # Entrega a conexão ao chamador
+        finally:
+            self.idle.put(conn)  # Devolve a conexão ao pool
+
+    def close(self):
+        """Fecha todas as conexões livres do pool."""
+        while not self.idle.empty():  # Verifica se ainda há conexões livres
+            self.idle.get_nowait().close()  # Fecha a conexão
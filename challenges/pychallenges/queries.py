@@ -0,0 +1,260 @@
+"""
+Consultas SQL dos relatórios e do dashboard de vendas.
+
+Os filtros de período usam predicados de intervalo sobre a coluna inteira 'sales_day'
+(dias desde 1970-01-01) e os agrupamentos por mês usam 'sales_year' e 'sales_month'. Assim o
+SQLite consegue usar os índices de cobertura em vez de ler a tabela inteira aplicando
+`STRFTIME` em cada linha.
+"""
+
+import calendar  # Importa a biblioteca calendar para obter o último dia de cada mês
+from datetime import date  # Importa a classe date para manipulação de datas
+
+# Define um dicionário com consultas SQL para diferentes análises
+dicQueries = {
+    "queryTopCustomers": '''
+        SELECT customer, SUM(sales_quantity) AS sum_quantity
+        FROM {salesSource}
+        GROUP BY customer
+        ORDER BY SUM(sales_quantity) DESC
+        LIMIT 10
+    ''',  # Consulta para obter os 10 clientes que mais compraram em quantidade
+    "queryTopProducts": '''
+        SELECT product, SUM(total_price) AS total_revenue
+        FROM {salesSource}
+        GROUP BY product
+        ORDER BY SUM(total_price) DESC
+        LIMIT 5
+    ''',  # Consulta para obter os 5 produtos que geraram mais receita
+    "queryAvgPriceCategory": '''
+        SELECT category, ROUND(AVG(total_price), 2) AS avg_price
+        FROM {salesSource}
+        GROUP BY category
+        ORDER BY AVG(total_price) DESC
+    ''',  # Consulta para obter o preço médio gasto por categoria
+    "queryHalfYear": '''
+        SELECT CASE
+            WHEN sales_month BETWEEN 1 AND 6 THEN 'first half-year'
+            WHEN sales_month BETWEEN 7 AND 12 THEN 'second half-year'
+        END AS half_year, ROUND(SUM(total_price), 2) AS total_revenue
+        FROM {salesSource}
+        WHERE sales_day BETWEEN ? AND ?
+        GROUP BY half_year
+        ORDER BY half_year
+    '''  # Consulta para comparar o faturamento entre o primeiro e o segundo semestre de um ano (parâmetros de `yearRange`)
+}
+
+# Define um dicionário com consultas SQL para visualização dos dados
+dicQueriesViz = {
+    "queryBarTopProducts": '''
+        SELECT product, SUM(sales_quantity) AS total_quantity
+        FROM {salesSource}
+        {whereClause}
+        GROUP BY product
+        ORDER BY SUM(sales_quantity) DESC
+        LIMIT 10
+    ''',  # Consulta para obter os 10 produtos mais vendidos em quantidade
+    "queryLineMonthRevenue": '''
+        SELECT PRINTF('%04d-%02d', sales_year, sales_month) AS month, SUM(total_price) AS total_revenue
+        FROM {salesSource}
+        {whereClause}
+        GROUP BY sales_year, sales_month
+        ORDER BY sales_year, sales_month
+    ''',  # Consulta para obter o faturamento mensal
+    "queryVipCustomers": '''
+        SELECT customer, SUM(sales_quantity) AS total_quantity, SUM(total_price) AS total_amount
+        FROM {salesSource}
+        {whereClause}
+        GROUP BY customer
+        ORDER BY SUM(total_price) DESC, SUM(sales_quantity) DESC, customer
+        LIMIT 10
+    '''  # Consulta para obter os 10 clientes VIPs (que mais compraram em valor e quantidade)
+}
+
+# Define as mesmas consultas respondidas pelas tabelas de rollup (veja `rollups.py`).
+# 'queryTopCustomers' fica de fora: sem filtro de período, o rollup dia x cliente tem quase uma
+# linha por venda e o índice de cobertura de 'sales' responde mais rápido.
+dicQueriesRollup = {
+    "queryTopProducts": '''
+        SELECT product, SUM(total_price) AS total_revenue
+        FROM rollup_daily_product
+        GROUP BY product
+        ORDER BY SUM(total_price) DESC
+        LIMIT 5
+    ''',
+    "queryAvgPriceCategory": '''
+        SELECT category, ROUND(SUM(total_price) / SUM(sales_count), 2) AS avg_price
+        FROM rollup_daily_category
+        GROUP BY category
+        ORDER BY SUM(total_price) / SUM(sales_count) DESC
+    ''',
+    "queryHalfYear": '''
+        SELECT CASE
+            WHEN sales_month BETWEEN 1 AND 6 THEN 'first half-year'
+            WHEN sales_month BETWEEN 7 AND 12 THEN 'second half-year'
+        END AS half_year, ROUND(SUM(total_price), 2) AS total_revenue
+        FROM rollup_daily_category
+        WHERE sales_day BETWEEN ? AND ?
+        GROUP BY half_year
+        ORDER BY half_year
+    ''',
+    "queryBarTopProducts": '''
+        SELECT product, SUM(sales_quantity) AS total_quantity
+        FROM rollup_daily_product
+        {whereClause}
+        GROUP BY product
+        ORDER BY SUM(sales_quantity) DESC
+        LIMIT 10
+    ''',
+    "queryLineMonthRevenue": '''
+        SELECT PRINTF('%04d-%02d', sales_year, sales_month) AS month, SUM(total_price) AS total_revenue
+        FROM rollup_daily_category
+        {whereClause}
+        GROUP BY sales_year, sales_month
+        ORDER BY sales_year, sales_month
+    ''',
+    "queryVipCustomers": '''
+        SELECT customer, SUM(sales_quantity) AS total_quantity, SUM(total_price) AS total_amount
+        FROM rollup_daily_customer
+        {whereClause}
+        GROUP BY customer
+        ORDER BY SUM(total_price) DESC, SUM(sales_quantity) DESC, customer
+        LIMIT 10
+    '''
+}
+
+def renderQuery(queryKey, salesSource='sales', whereClause="", useRollups=False):
+    """Monta o SQL de uma consulta, respondendo pelos rollups quando possível.
+
+    Args:
+        queryKey (str): Chave da consulta em `dicQueries` ou `dicQueriesViz`.
+        salesSource (str, optional): Tabela ou view com as vendas. Padrão é 'sales'.
+        whereClause (str, optional): Cláusula WHERE das consultas de visualização. Padrão é "".
+        useRollups (bool, optional): Se os rollups estão atualizados (veja `rollups.rollupsFresh`). Padrão é False.
+
+    Returns:
+        str: Consulta SQL pronta para execução.
+    """
+    if useRollups and queryKey in dicQueriesRollup:  # Verifica se a consulta pode ser respondida pelos rollups
+        return dicQueriesRollup[queryKey].format(whereClause=whereClause)  # Retorna a consulta sobre os rollups
+    if queryKey in dicQueries:  # Verifica se a consulta é de relatório
+        return dicQueries[queryKey].format(salesSource=salesSource)  # Retorna a consulta de relatório
+    return dicQueriesViz[queryKey].format(salesSource=salesSource, whereClause=whereClause)  # Retorna a consulta de visualização
+
+def epochDay(day):
+    """Converte uma data para o número de dias desde 1970-01-01 (coluna 'sales_day').
+
+    Args:
+        day (datetime.date): Data a ser convertida.
+
+    Returns:
+        int: Número de dias desde 1970-01-01.
+    """
+    return (day - date(1970, 1, 1)).days  # Calcula a diferença em dias
+
+def yearRange(year):
+    """Monta os parâmetros de intervalo de um ano inteiro.
+
+    Args:
+        year (int): Ano desejado.
+
+    Returns:
+        tuple: Primeiro e último dia do ano em dias desde 1970-01-01.
+    """
+    return epochDay(date(year, 1, 1)), epochDay(date(year, 12, 31))  # Retorna o intervalo do ano
+
+def monthRange(year, month):
+    """Define o primeiro e o último dia de um mês.
+
+    Args:
+        year (int): Ano desejado.
+        month (int): Mês desejado (1 a 12).
+
+    Returns:
+        tuple: Primeiro e último dia do mês (datetime.date).
+    """
+    return date(year, month, 1), date(year, month, calendar.monthrange(year, month)[1])  # Retorna o intervalo do mês
+
+def buildWhereClause(startDate=None, endDate=None):
+    """Monta a cláusula WHERE de um período como predicado de intervalo em 'sales_day'.
+
+    Args:
+        startDate (datetime.date, optional): Primeiro dia do período. Padrão é sem limite inicial.
+        endDate (datetime.date, optional): Último dia do período. Padrão é sem limite final.
+
+    Returns:
+        tuple: Cláusula WHERE e tupla de parâmetros da consulta.
+    """
+    if startDate is None and endDate is None:  # Verifica se não há filtro de período
+        return "", ()  # Retorna a consulta sem filtro
+    if endDate is None:  # Verifica se o período não tem limite final
+        return "WHERE sales_day >= ?", (epochDay(startDate),)  # Filtra a partir do primeiro dia
+    if startDate is None:  # Verifica se o período não tem limite inicial
+        return "WHERE sales_day <= ?", (epochDay(endDate),)  # Filtra até o último dia
+    return "WHERE sales_day BETWEEN ? AND ?", (epochDay(startDate), epochDay(endDate))  # Filtra o intervalo completo
+
+def availableMonths(conn, salesSource='sales'):
+    """Lista os meses que têm vendas no banco, usando o índice de datas.
+
+    Args:
+        conn (sqlite3.Connection): Conexão com o banco de dados.
+        salesSource (str, optional): Tabela ou view com as vendas. Padrão é 'sales'.
+
+    Returns:
+        list: Lista de tuplas (ano, mês) em ordem cronológica.
+    """
+    query = f"SELECT DISTINCT sales_year, sales_month FROM {salesSource} ORDER BY sales_year, sales_month"  # Define a consulta dos meses disponíveis
+    return [(int(year), int(month)) for year, month in conn.execute(query)]  # Retorna os meses disponíveis
+
+def queryPlans(conn, salesSource='sales', whereClause="WHERE sales_day BETWEEN ? AND ?", params=None):
+    """Obtém o `EXPLAIN QUERY PLAN` de todas as consultas dos relatórios e do dashboard.
+
+    Args:
+        conn (sqlite3.Connection): Conexão com o banco de dados.
+        salesSource (str, optional): Tabela ou view com as vendas. Padrão é 'sales'.
+        whereClause (str, optional): Cláusula WHERE usada nas consultas de visualização.
+            Padrão é um intervalo em 'sales_day'.
+        params (tuple, optional): Parâmetros da cláusula WHERE. Padrão é o intervalo de 2024.
+
+    Returns:
+        dict: Dicionário com a chave da consulta e a lista de linhas do plano.
+    """
+    params = params if params is not None else yearRange(2024)  # Usa o ano de 2024 como intervalo padrão
+    plans = {}  # Inicializa o dicionário de planos
+    for queryKey, query in dicQueries.items():  # Itera sobre as consultas dos relatórios
+        queryParams = params if '?' in query else ()  # Usa os parâmetros apenas nas consultas que os esperam
+        plans[queryKey] = [row[-1] for row in conn.execute("EXPLAIN QUERY PLAN " + query.format(salesSource=salesSource), queryParams)]  # Guarda o plano da consulta
+    for queryKey, query in dicQueriesViz.items():  # Itera sobre as consultas de visualização
+        sql = query.format(salesSource=salesSource, whereClause=whereClause)  # Monta a consulta com o filtro
+        plans[queryKey] = [row[-1] for row in conn.execute("EXPLAIN QUERY PLAN " + sql, params if whereClause else ())]  # Guarda o plano da consulta
+    return plans  # Retorna os planos
+
+def stepUsesIndex(step):
+    """Verifica se um passo do `EXPLAIN QUERY PLAN` lê a tabela por um índice.
+
+    Contam como uso de índice a busca (`SEARCH ... USING INDEX` ou `USING COVERING INDEX`) e a
+    varredura de um índice de cobertura (`SCAN ... USING COVERING INDEX`), que lê só as páginas
+    do índice em vez das linhas da tabela. Uma varredura simples (`SCAN sales`) não conta.
+
+    Args:
+        step (str): Descrição do passo do plano.
+
+    Returns:
+        bool: True se o passo usa um índice.
+    """
+    if step.startswith('SEARCH'):  # Verifica se o passo é uma busca
+        return 'USING INDEX' in step or 'USING COVERING INDEX' in step  # Retorna se a busca é feita por um índice
+    return step.startswith('SCAN') and 'USING COVERING INDEX' in step  # Retorna se a varredura lê apenas um índice de cobertura
+
+def checkIndexUsage(conn, salesSource='sales'):
+    """Verifica se as consultas leem a tabela de vendas pelos índices, sem varrer a tabela.
+
+    Args:
+        conn (sqlite3.Connection): Conexão com o banco de dados.
+        salesSource (str, optional): Tabela ou view com as vendas. Padrão é 'sales'.
+
+    Returns:
+        dict: Dicionário com a chave da consulta e True se o plano usa um índice.
+    """
+    plans = queryPlans(conn, salesSource)  # Obtém os planos das consultas
+    return {queryKey: any(stepUsesIndex(step) for step in plan) for queryKey, plan in plans.items()}  # Verifica o uso de índices em cada plano
@@ -0,0 +1,219 @@
+"""
+Renderização dos gráficos e do relatório sem interface (servidor ou execução agendada).
+
+Os gráficos (vendas por livro, cidades, faturamento mensal e produtos) são desenhados com a
+API orientada a objetos do Matplotlib (`Figure`, backend Agg), sem `pyplot` nem janela, e a
+tabela de clientes VIP é gravada em HTML. Cada artefato é identificado por um hash dos dados
+de entrada e das opções do gráfico: se o arquivo com esse hash já existe no cache, o gráfico
+não é redesenhado; as versões com hashes antigos são removidas, então o cache guarda um arquivo
+por gráfico e formato. Os artefatos que faltam são desenhados em paralelo em um pool de processos
+e, no final, tudo é reunido em um único arquivo HTML autocontido ('report.html').
+"""
+
+import base64  # Importa a biblioteca base64 para embutir as imagens PNG no HTML
+import hashlib  # Importa a biblioteca hashlib para calcular o hash dos dados de cada gráfico
+import html  # Importa a biblioteca html para escapar os textos do relatório
+import os  # Importa a biblioteca os para manipulação de caminhos
+import shutil  # Importa a biblioteca shutil para copiar os artefatos do cache
+import time  # Importa a biblioteca time para medir a duração da renderização
+from concurrent.futures import ProcessPoolExecutor  # Importa o pool de processos da biblioteca padrão
+
+import pandas as pd  # Importa a biblioteca Pandas para manipulação de dados
+from matplotlib.figure import Figure  # Importa a figura do Matplotlib (desenho sem pyplot, no backend Agg)
+
+renderVersion = 1  # Define a versão do desenho; mudá-la invalida todo o cache
+chartFormats = ('png', 'svg')  # Define os formatos de imagem suportados para os gráficos
+
+def buildCharts(report=None, bookTotals=None):
+    """Monta a definição de cada gráfico do relatório.
+
+    Args:
+        report (dict, optional): Resultado de `analytics.SalesReport.result`. Padrão é nenhum.
+        bookTotals (pandas.Series, optional): Quantidade vendida por livro. Padrão é nenhuma.
+
+    Returns:
+        list: Dicionários com 'name', 'kind' ('bar', 'line' ou 'table'), 'data', 'title',
+            'xlabel' e 'ylabel'.
+    """
+    charts = []  # Inicializa a lista de gráficos
+    if bookTotals is not None:  # Verifica se há vendas de livros
+        charts.append({'name': 'salesByBook', 'kind': 'bar', 'data': bookTotals, 'title': 'Total Sales Quantity by Book', 'xlabel': 'Book Title', 'ylabel': 'Total Sales Quantity'})  # Define o gráfico de vendas por livro
+    if report is not None:  # Verifica se há o relatório do e-commerce
+        charts.append({'name': 'topCities', 'kind': 'bar', 'data': report['topCities'], 'title': 'Total Sales Quantity by Top 10 Cities', 'xlabel': 'City', 'ylabel': 'Total Sales Quantity'})  # Define o gráfico das cidades
+        charts.append({'name': 'monthRevenue', 'kind': 'line', 'data': report['monthRevenue'], 'title': 'Monthly Revenue', 'xlabel': 'Month', 'ylabel': 'Revenue'})  # Define o gráfico do faturamento mensal
+        charts.append({'name': 'topProducts', 'kind': 'bar', 'data': report['topProducts'], 'title': 'Top 10 Products by Sales Quantity', 'xlabel': 'Product', 'ylabel': 'Total Sales Quantity'})  # Define o gráfico dos produtos
+        charts.append({'name': 'vipTable', 'kind': 'table', 'data': report['vips'], 'title': 'VIP Customers', 'xlabel': '', 'ylabel': ''})  # Define a tabela de clientes VIP
+    return charts  # Retorna os gráficos
+
+def chartHash(chart, fmt):
+    """Calcula o hash dos dados de entrada e das opções de um gráfico.
+
+    Args:
+        chart (dict): Definição do gráfico (veja `buildCharts`).
+        fmt (str): Formato do arquivo ('png', 'svg' ou 'html').
+
+    Returns:
+        str: Hash SHA-256 em hexadecimal.
+    """
+    frame = chart['data'].to_frame() if isinstance(chart['data'], pd.Series) else chart['data']  # Trata séries e tabelas da mesma forma
+    digest = hashlib.sha256(repr((renderVersion, chart['name'], chart['kind'], chart['title'], chart['xlabel'], chart['ylabel'], fmt)).encode())  # Inicia o hash com as opções do gráfico
+    digest.update(repr((list(frame.columns), frame.index.name)).encode())  # Acrescenta os nomes das colunas e do índice
+    digest.update(pd.util.hash_pandas_object(frame, index=True).to_numpy().tobytes())  # Acrescenta o hash vetorizado de cada linha (valores e índice)
+    return digest.hexdigest()  # Retorna o hash
+
+def drawArtifact(task):
+    """Desenha um gráfico (ou grava a tabela) em um arquivo.
+
+    Args:
+        task (tuple): Definição do gráfico, formato e caminho do arquivo.
+
+    Returns:
+        tuple: Nome do gráfico, formato e segundos gastos no desenho.
+    """
+    chart, fmt, path = task  # Desempacota a tarefa
+    start = time.perf_counter()  # Marca o início do desenho
+    tmpPath = f"{path}.tmp"  # Define o arquivo temporário (o cache só vê arquivos completos)
+    data = chart['data']  # Obtém os dados do gráfico
+
+    if chart['kind'] == 'table':  # Verifica se o artefato é uma tabela
+        with open(tmpPath, 'w', encoding='utf-8') as file:  # Abre o arquivo temporário
+            file.write(data.to_html(index=False, border=0, classes='vip'))  # Grava a tabela em HTML
+    else:
+        fig = Figure(figsize=(12, 6))  # Cria a figura sem pyplot (nenhuma janela, backend Agg)
+        ax = fig.subplots()  # Cria os eixos do gráfico
+        labels = [str(label) for label in data.index]  # Converte os rótulos do eixo x para texto
+        if chart['kind'] == 'bar':  # Verifica se o gráfico é de barras
+            bars = ax.bar(labels, data.to_numpy(), color='skyblue')  # Cria o gráfico de barras
+            ax.bar_label(bars, fmt='%d')  # Adiciona o valor de todas as barras em uma única chamada
+            ax.set_xticks(range(len(labels)), labels, rotation=90, ha='right')  # Rotaciona os rótulos do eixo x para melhor legibilidade
+        else:
+            ax.plot(labels, data.to_numpy(), marker='o', linestyle='-', color='b', label='Revenue')  # Cria o gráfico de linha
+            ax.set_xticks(range(len(labels)), labels, rotation=45)  # Rotaciona os rótulos do eixo x para melhor legibilidade
+            ax.grid(True, linestyle='--', alpha=0.4)  # Adiciona um grid ao gráfico
+            ax.legend()  # Adiciona uma legenda ao gráfico
+        ax.set_xlabel(chart['xlabel'])  # Define o rótulo do eixo x
+        ax.set_ylabel(chart['ylabel'])  # Define o rótulo do eixo y
+        ax.set_title(chart['title'])  # Define o título do gráfico
+        fig.tight_layout()  # Ajusta o layout do gráfico para evitar sobreposição
+        fig.savefig(tmpPath, format=fmt)  # Grava a figura no formato pedido
+    os.replace(tmpPath, path)  # Publica o arquivo completo no cache
+    return chart['name'], fmt, time.perf_counter() - start  # Retorna o gráfico e a duração do desenho
+
+def embedArtifact(path, fmt):
+    """Converte um artefato para o trecho HTML embutido no relatório.
+
+    Args:
+        path (str): Caminho do artefato.
+        fmt (str): Formato do artefato ('png', 'svg' ou 'html').
+
+    Returns:
+        str: Trecho HTML com a imagem ou a tabela.
+    """
+    if fmt == 'png':  # Verifica se o artefato é uma imagem PNG
+        with open(path, 'rb') as file:  # Abre a imagem
+            encoded = base64.b64encode(file.read()).decode('ascii')  # Codifica a imagem em base64
+        return f'<img src="data:image/png;base64,{encoded}">'  # Retorna a imagem embutida
+    with open(path, encoding='utf-8') as file:  # Abre o SVG ou a tabela
+        content = file.read()  # Lê o conteúdo
+    return content[content.find('<svg'):] if fmt == 'svg' else content  # Retorna o SVG (sem o cabeçalho XML) ou a tabela
+
+def writeBundle(path, charts, artifacts, report=None):
+    """Reúne o resumo, os gráficos e a tabela em um único arquivo HTML autocontido.
+
+    Args:
+        path (str): Caminho do arquivo HTML.
+        charts (list): Definições dos gráficos, na ordem do relatório.
+        artifacts (dict): Caminho do artefato embutido de cada gráfico (nome -> (formato, caminho)).
+        report (dict, optional): Resultado de `analytics.SalesReport.result`, para o resumo. Padrão é nenhum.
+    """
+    parts = ['<!DOCTYPE html><html><head><meta charset="utf-8"><title>Sales Report</title>',
+             '<style>body{font-family:sans-serif;margin:2em} img,svg{max-width:100%;height:auto} table.vip{border-collapse:collapse} table.vip td,table.vip th{padding:2px 8px;border-bottom:1px solid #ddd}</style>',
+             '</head><body><h1>Sales Report</h1>']  # Inicia o HTML
+    if report is not None:  # Verifica se há o resumo do e-commerce
+        summary = {'Número total de vendas': f"{report['numSales']}",
+                   'Quantidade de itens vendidos': f"{report['soldQuantity']}",
+                   'Faturamento total': f"{report['revenue']:.2f}",
+                   'Média de valor gasto por cliente': f"{report['avgPerCustomer']}"
+                   }  # Monta os totais do relatório
+        parts.append('<ul>' + ''.join(f'<li>{html.escape(label)}: {value}</li>' for label, value in summary.items()) + '</ul>')  # Acrescenta os totais
+    for chart in charts:  # Itera sobre os gráficos na ordem do relatório
+        fmt, artifactPath = artifacts[chart['name']]  # Obtém o artefato embutido do gráfico
+        parts.append(f"<h2>{html.escape(chart['title'])}</h2>{embedArtifact(artifactPath, fmt)}")  # Acrescenta o gráfico
+    parts.append('</body></html>')  # Fecha o HTML
+    with open(path, 'w', encoding='utf-8') as file:  # Abre o arquivo do relatório
+        file.write('\n'.join(parts))  # Grava o relatório
+
+def pruneCache(cacheDir, artifacts):
+    """Remove do cache as versões antigas dos artefatos (mesmo gráfico e formato, outro hash).
+
+    Args:
+        cacheDir (str): Pasta do cache de artefatos.
+        artifacts (list): Caminhos dos artefatos atuais; cada gráfico e formato mantém só o seu.
+
+    Returns:
+        int: Número de arquivos removidos.
+    """
+    current = {os.path.basename(path) for path in artifacts}  # Define os arquivos que devem ser mantidos
+    keys = {(name.split('-')[0], os.path.splitext(name)[1]) for name in current}  # Define os pares gráfico e formato atuais
+    removed = 0  # Inicializa o contador de arquivos removidos
+    for name in os.listdir(cacheDir):  # Itera sobre os arquivos do cache
+        if name not in current and (name.split('-')[0], os.path.splitext(name)[1]) in keys:  # Verifica se é uma versão antiga de um artefato atual
+            os.remove(os.path.join(cacheDir, name))  # Remove a versão antiga
+            removed += 1  # Conta o arquivo removido
+    return removed  # Retorna o número de arquivos removidos
+
+def renderReport(outputDir, report=None, bookTotals=None, formats=('png',), workers=None, cacheDir=None):
+    """Renderiza todos os gráficos e o relatório sem interface, reaproveitando o cache.
+
+    Args:
+        outputDir (str): Pasta onde os artefatos e o 'report.html' são gravados.
+        report (dict, optional): Resultado de `analytics.SalesReport.result`. Padrão é nenhum.
+        bookTotals (pandas.Series, optional): Quantidade vendida por livro. Padrão é nenhuma.
+        formats (tuple, optional): Formatos das imagens ('png' e/ou 'svg'); o primeiro é
+            embutido no relatório. Padrão é ('png',).
+        workers (int, optional): Número de processos do pool (1 desenha no próprio processo).
+            Padrão é o número de CPUs.
+        cacheDir (str, optional): Pasta do cache de artefatos (apenas a versão atual de cada
+            artefato é mantida, veja `pruneCache`). Padrão é '<outputDir>/cache'.
+
+    Returns:
+        dict: Dicionário com 'bundle' (caminho do 'report.html'), 'artifacts' (DataFrame com
+            gráfico, formato, caminho, se veio do cache e segundos de desenho) e 'seconds'.
+    """
+    unknown = set(formats) - set(chartFormats)  # Verifica os formatos pedidos
+    if unknown or not formats:  # Verifica se algum formato não é suportado
+        raise ValueError(f"Formatos de imagem suportados: {', '.join(chartFormats)}")  # Interrompe caso o formato não exista
+    start = time.perf_counter()  # Marca o início da renderização
+    cacheDir = cacheDir if cacheDir is not None else os.path.join(outputDir, 'cache')  # Define a pasta do cache
+    os.makedirs(cacheDir, exist_ok=True)  # Cria a pasta do cache (e a de saída)
+
+    charts = buildCharts(report, bookTotals)  # Monta as definições dos gráficos
+    rows = []  # Inicializa a lista de artefatos
+    tasks = []  # Inicializa os artefatos que precisam ser desenhados
+    embedded = {}  # Inicializa o artefato embutido de cada gráfico
+    for chart in charts:  # Itera sobre os gráficos
+        for fmt in (('html',) if chart['kind'] == 'table' else formats):  # Itera sobre os formatos do gráfico
+            path = os.path.join(cacheDir, f"{chart['name']}-{chartHash(chart, fmt)[:16]}.{fmt}")  # Define o arquivo pelo hash dos dados
+            cached = os.path.exists(path)  # Verifica se o artefato já foi desenhado com os mesmos dados
+            rows.append({'chart': chart['name'], 'format': fmt, 'path': path, 'cached': cached, 'seconds': 0.0})  # Registra o artefato
+            embedded.setdefault(chart['name'], (fmt, path))  # Embute o primeiro formato no relatório
+            if not cached:  # Verifica se o artefato precisa ser desenhado
+                tasks.append((chart, fmt, path))  # Agenda o desenho
+
+    if len(tasks) > 1 and workers != 1:  # Verifica se vale a pena desenhar em paralelo
+        with ProcessPoolExecutor(max_workers=workers) as pool:  # Cria o pool de processos
+            drawn = list(pool.map(drawArtifact, tasks))  # Desenha os artefatos em paralelo
+    else:
+        drawn = [drawArtifact(task) for task in tasks]  # Desenha os artefatos no próprio processo
+    seconds = {(name, fmt): elapsed for name, fmt, elapsed in drawn}  # Organiza a duração de cada desenho
+    for row in rows:  # Itera sobre os artefatos
+        row['seconds'] = seconds.get((row['chart'], row['format']), 0.0)  # Registra a duração do desenho
+        shutil.copyfile(row['path'], os.path.join(outputDir, f"{row['chart']}.{row['format']}"))  # Publica o artefato com um nome fixo
+    pruneCache(cacheDir, [row['path'] for row in rows])  # Mantém no cache apenas a versão atual de cada artefato
+
+    bundlePath = os.path.join(outputDir, 'report.html')  # Define o caminho do relatório
+    writeBundle(bundlePath, charts, embedded, report)  # Grava o relatório único
+    return {'bundle': bundlePath,
+            'artifacts': pd.DataFrame(rows, columns=['chart', 'format', 'path', 'cached', 'seconds']),
+            'seconds': time.perf_counter() - start
+            }  # Retorna o relatório e os artefatos
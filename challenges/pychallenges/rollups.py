@@ -0,0 +1,137 @@
+"""
+Tabelas de rollup (pré-agregadas) que alimentam o dashboard.
+
+As vendas são somadas por dia x produto, dia x cliente e dia x categoria. As tabelas são
+mantidas de forma incremental a cada bloco acrescentado (`withRollups`) e podem ser
+reconstruídas do zero a partir da tabela de vendas (`rebuildRollups`). A tabela
+`rollup_state` guarda até qual `rowid` de 'sales' os rollups estão atualizados; as consultas
+só são respondidas pelos rollups quando essa marca bate com a tabela de vendas. Como uma carga
+completa com o mesmo número de linhas repete os mesmos rowids, toda troca da tabela 'sales'
+(`loader.swapTable`) descarta `rollup_state` na mesma transação, até a próxima reconstrução
+(`python -m pychallenges rollups rebuild`).
+"""
+
+from .loader import addDateColumns  # Importa a função que materializa as colunas inteiras de data
+from .schema import salesSource  # Importa a função que define a origem das vendas (tabela plana ou view 'sales_flat')
+
+rollupTables = {'rollup_daily_product': 'product',
+                'rollup_daily_customer': 'customer',
+                'rollup_daily_category': 'category'
+                }  # Define as tabelas de rollup e a coluna agregada junto com o dia
+
+def createRollupTables(conn):
+    """Cria as tabelas de rollup e a tabela de controle, caso ainda não existam.
+
+    Args:
+        conn (sqlite3.Connection): Conexão com o banco de dados.
+    """
+    for tableName, keyColumn in rollupTables.items():  # Itera sobre as tabelas de rollup
+        conn.execute(f'''
+            CREATE TABLE IF NOT EXISTS {tableName} (
+                sales_day INTEGER NOT NULL,
+                sales_year INTEGER NOT NULL,
+                sales_month INTEGER NOT NULL,
+                {keyColumn} TEXT NOT NULL,
+                sales_quantity INTEGER NOT NULL,
+                total_price REAL NOT NULL,
+                sales_count INTEGER NOT NULL,
+                PRIMARY KEY (sales_day, {keyColumn})
+            ) WITHOUT ROWID
+        ''')  # Cria a tabela de rollup com a soma da quantidade, do faturamento e o número de vendas
+    conn.execute("CREATE TABLE IF NOT EXISTS rollup_state (id INTEGER PRIMARY KEY CHECK (id = 1), sales_rowid INTEGER NOT NULL)")  # Cria a tabela de controle dos rollups
+
+def salesWatermark(conn):
+    """Obtém o maior `rowid` da tabela de vendas.
+
+    Args:
+        conn (sqlite3.Connection): Conexão com o banco de dados.
+
+    Returns:
+        int: Maior `rowid` de 'sales' (0 se a tabela estiver vazia).
+    """
+    return conn.execute("SELECT COALESCE(MAX(rowid), 0) FROM sales").fetchone()[0]  # Lê o maior rowid (busca direta na árvore da tabela)
+
+def markRollupsFresh(conn):
+    """Registra que os rollups estão atualizados até a última venda carregada.
+
+    Args:
+        conn (sqlite3.Connection): Conexão com o banco de dados.
+    """
+    conn.execute("INSERT OR REPLACE INTO rollup_state (id, sales_rowid) VALUES (1, ?)", (salesWatermark(conn),))  # Grava a marca d'água dos rollups
+    conn.commit()  # Confirma a gravação
+
+def rollupsFresh(conn):
+    """Verifica se os rollups existem e estão atualizados com a tabela de vendas.
+
+    Args:
+        conn (sqlite3.Connection): Conexão com o banco de dados.
+
+    Returns:
+        bool: True se as consultas podem ser respondidas pelos rollups.
+    """
+    if not conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'rollup_state'").fetchone():  # Verifica se os rollups existem
+        return False  # Os rollups ainda não foram criados
+    state = conn.execute("SELECT sales_rowid FROM rollup_state WHERE id = 1").fetchone()  # Lê a marca d'água dos rollups
+    return state is not None and state[0] == salesWatermark(conn)  # Compara a marca d'água com a tabela de vendas
+
+def upsertRollups(conn, chunk):
+    """Soma um bloco de vendas às tabelas de rollup.
+
+    Args:
+        conn (sqlite3.Connection): Conexão com o banco de dados.
+        chunk (pandas.DataFrame): Bloco com as colunas da tabela plana e as colunas inteiras de data.
+    """
+    for tableName, keyColumn in rollupTables.items():  # Itera sobre as tabelas de rollup
+        grouped = chunk.groupby(['sales_day', 'sales_year', 'sales_month', keyColumn], sort=False, observed=True).agg(
+            sales_quantity=('sales_quantity', 'sum'),
+            total_price=('total_price', 'sum'),
+            sales_count=('total_price', 'size')).reset_index()  # Agrega o bloco por dia e pela coluna do rollup
+        conn.executemany(f'''
+            INSERT INTO {tableName} (sales_day, sales_year, sales_month, {keyColumn}, sales_quantity, total_price, sales_count)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT (sales_day, {keyColumn}) DO UPDATE SET
+                sales_quantity = sales_quantity + excluded.sales_quantity,
+                total_price = total_price + excluded.total_price,
+                sales_count = sales_count + excluded.sales_count
+        ''', grouped.itertuples(index=False, name=None))  # Soma os agregados do bloco aos já existentes
+
+def withRollups(conn, chunks):
+    """Atualiza os rollups a cada bloco entregue para a carga incremental.
+
+    Cada bloco é somado aos rollups na mesma transação em que será inserido em 'sales'.
+    Depois da carga, chame `markRollupsFresh` para liberar o uso dos rollups.
+
+    Args:
+        conn (sqlite3.Connection): Conexão com o banco de dados.
+        chunks (iterable): Blocos (DataFrames) com as colunas da tabela plana.
+
+    Yields:
+        pandas.DataFrame: O mesmo bloco recebido, com as colunas inteiras de data.
+    """
+    createRollupTables(conn)  # Cria as tabelas de rollup caso não existam
+    for chunk in chunks:  # Itera sobre os blocos
+        if 'sales_day' not in chunk:  # Verifica se o bloco ainda não tem as colunas inteiras de data
+            chunk = addDateColumns(chunk)  # Materializa o ano, o mês e o dia de cada venda
+        upsertRollups(conn, chunk)  # Soma o bloco aos rollups
+        yield chunk  # Entrega o bloco para a carga
+
+def rebuildRollups(conn):
+    """Reconstrói todas as tabelas de rollup a partir da tabela de vendas (reparo).
+
+    Args:
+        conn (sqlite3.Connection): Conexão com o banco de dados.
+    """
+    source = salesSource(conn)  # Define se as vendas são lidas da tabela 'sales' ou da view 'sales_flat'
+    conn.commit()  # Confirma qualquer transação pendente antes da reconstrução
+    createRollupTables(conn)  # Cria as tabelas de rollup caso não existam
+    conn.execute("BEGIN")  # Inicia a transação da reconstrução
+    for tableName, keyColumn in rollupTables.items():  # Itera sobre as tabelas de rollup
+        conn.execute(f"DELETE FROM {tableName}")  # Limpa o rollup
+        conn.execute(f'''
+            INSERT INTO {tableName} (sales_day, sales_year, sales_month, {keyColumn}, sales_quantity, total_price, sales_count)
+            SELECT sales_day, sales_year, sales_month, {keyColumn}, SUM(sales_quantity), SUM(total_price), COUNT(*)
+            FROM {source}
+            GROUP BY sales_day, sales_year, sales_month, {keyColumn}
+        ''')  # Recalcula o rollup a partir das vendas
+    conn.execute("INSERT OR REPLACE INTO rollup_state (id, sales_rowid) VALUES (1, ?)", (salesWatermark(conn),))  # Grava a marca d'água dos rollups
+    conn.commit()  # Confirma a reconstrução
@@ -0,0 +1,206 @@
+"""
+Armazenamento normalizado (esquema estrela) do banco 'salesEcommerce.db'.
+
+No modo normalizado os textos repetidos em cada venda ficam nas dimensões `customers`,
+`products` e `categories`, e a tabela `sales` guarda apenas chaves inteiras e valores
+numéricos. A view `sales_flat` reconstrói as colunas da tabela plana, então as consultas
+escritas para o layout plano continuam funcionando lendo de `sales_flat`.
+"""
+
+import pandas as pd  # Importa a biblioteca Pandas para manipulação de dados
+
+from .loader import addDateColumns, createIndexes, loadSales, salesIndexes  # Importa as funções de carga em massa no SQLite
+
+factDtype = {'sales_code': 'INTEGER',
+             'sales_date': 'DATE',
+             'customer_id': 'INTEGER',
+             'product_id': 'INTEGER',
+             '%_discount': 'REAL',
+             'unit_price': 'REAL',
+             'sales_quantity': 'INTEGER',
+             'sales_value': 'REAL',
+             'total_price': 'REAL',
+             'sales_year': 'INTEGER',
+             'sales_month': 'INTEGER',
+             'sales_day': 'INTEGER'
+             }  # Define os tipos de dados da tabela fato 'sales' no modo normalizado
+
+factIndexes = {'product_cover': ['product_id', 'sales_day', 'sales_quantity', 'total_price'],
+               'customer_cover': ['customer_id', 'sales_day', 'sales_quantity', 'total_price'],
+               'day_cover': ['sales_day', 'sales_year', 'sales_month', 'total_price']
+               }  # Define os índices de cobertura da tabela fato 'sales' no modo normalizado
+
+dimensionsDdl = ['''
+        CREATE TABLE IF NOT EXISTS categories (
+            category_id INTEGER PRIMARY KEY,
+            category TEXT NOT NULL UNIQUE
+        )
+    ''', '''
+        CREATE TABLE IF NOT EXISTS products (
+            product_id INTEGER PRIMARY KEY,
+            product TEXT NOT NULL,
+            category_id INTEGER NOT NULL REFERENCES categories (category_id),
+            UNIQUE (category_id, product)
+        )
+    ''', '''
+        CREATE TABLE IF NOT EXISTS customers (
+            customer_id INTEGER PRIMARY KEY,
+            customer TEXT,
+            city TEXT,
+            email TEXT,
+            customer_birth_date DATE
+        )
+    ''']  # Define as tabelas de dimensão do esquema estrela
+
+salesFlatView = '''
+    CREATE VIEW IF NOT EXISTS sales_flat AS
+    SELECT cat.category, s."%_discount", s.unit_price, s.sales_code, s.sales_quantity, s.sales_date,
+           cus.customer, s.customer_id, cus.city, cus.email, cus.customer_birth_date,
+           s.sales_value, prod.product, s.total_price, s.sales_year, s.sales_month, s.sales_day
+    FROM sales AS s
+    LEFT JOIN customers AS cus ON cus.customer_id = s.customer_id
+    LEFT JOIN products AS prod ON prod.product_id = s.product_id
+    LEFT JOIN categories AS cat ON cat.category_id = prod.category_id
+'''  # Define a view de compatibilidade com as colunas da tabela plana
+
+def buildProductDimension(categoriesList):
+    """Monta as dimensões de categorias e produtos com chaves inteiras.
+
+    Args:
+        categoriesList (dict): Dicionário com categorias e produtos.
+
+    Returns:
+        tuple: DataFrame de categorias e DataFrame de produtos.
+    """
+    categories = pd.DataFrame({'category_id': range(1, len(categoriesList) + 1),
+                               'category': list(categoriesList.keys())})  # Cria a dimensão de categorias
+    products = pd.DataFrame([(category, product) for category, productList in categoriesList.items() for product in productList],
+                            columns=['category', 'product'])  # Lista os pares (categoria, produto)
+    products.insert(0, 'product_id', range(1, len(products) + 1))  # Adiciona a chave inteira dos produtos
+    products['category_id'] = products['category'].map(dict(zip(categories['category'], categories['category_id'])))  # Mapeia a categoria de cada produto para a sua chave
+    return categories, products  # Retorna as dimensões
+
+def upsertDimension(conn, tableName, frame):
+    """Grava as linhas de uma dimensão, atualizando as chaves que já existem.
+
+    A chave é a primeira coluna de `frame`. A gravação não confirma a transação, para poder
+    fazer parte da troca de tabelas da carga; quem chama confirma.
+
+    Args:
+        conn (sqlite3.Connection): Conexão com o banco de dados.
+        tableName (str): Nome da tabela de dimensão.
+        frame (pandas.DataFrame): Linhas da dimensão, com a chave na primeira coluna.
+    """
+    key = frame.columns[0]  # Obtém a coluna da chave
+    columns = ', '.join(f'"{col}"' for col in frame.columns)  # Monta a lista de colunas
+    placeholders = ', '.join('?' for _ in frame.columns)  # Monta os marcadores dos parâmetros
+    updates = ', '.join(f'"{col}" = excluded."{col}"' for col in frame.columns[1:])  # Monta a atualização das demais colunas
+    rows = frame.astype(object).where(frame.notna(), None)  # Converte os valores para tipos nativos
+    if 'customer_birth_date' in frame:  # Verifica se a dimensão tem datas de nascimento
+        rows['customer_birth_date'] = pd.to_datetime(frame['customer_birth_date']).dt.strftime('%Y-%m-%d')  # Converte as datas para texto ISO
+    conn.executemany(f'INSERT INTO "{tableName}" ({columns}) VALUES ({placeholders}) ON CONFLICT ("{key}") DO UPDATE SET {updates}',
+                     rows.itertuples(index=False, name=None))  # Grava as linhas novas e atualiza as existentes
+
+def replaceDimensions(conn, dimensions):
+    """Reescreve as dimensões com as linhas informadas (sem confirmar a transação).
+
+    Args:
+        conn (sqlite3.Connection): Conexão com o banco de dados.
+        dimensions (dict): Nome e linhas (DataFrame) de cada dimensão.
+    """
+    for tableName, frame in dimensions.items():  # Itera sobre as dimensões
+        conn.execute(f'DELETE FROM "{tableName}"')  # Remove as linhas da carga anterior
+        upsertDimension(conn, tableName, frame)  # Grava as linhas da carga nova
+
+def factChunks(chunks, products):
+    """Converte blocos de vendas planos em blocos da tabela fato.
+
+    Args:
+        chunks (iterable): Blocos (DataFrames) com as colunas da tabela plana.
+        products (pandas.DataFrame): Dimensão de produtos (veja `buildProductDimension`).
+
+    Yields:
+        pandas.DataFrame: Bloco com as colunas de `factDtype`.
+    """
+    productIndex = pd.MultiIndex.from_frame(products[['category', 'product']])  # Cria o índice (categoria, produto) para mapear as chaves
+    productIds = products['product_id'].to_numpy()  # Obtém as chaves dos produtos
+    for chunk in chunks:  # Itera sobre os blocos planos
+        if 'sales_day' not in chunk:  # Verifica se o bloco ainda não tem as colunas inteiras de data
+            chunk = addDateColumns(chunk)  # Materializa o ano, o mês e o dia de cada venda
+        position = productIndex.get_indexer(pd.MultiIndex.from_arrays([chunk['category'], chunk['product']]))  # Localiza o produto de cada venda de forma vetorizada
+        fact = chunk[[col for col in factDtype if col != 'product_id']].copy()  # Seleciona as colunas numéricas da venda
+        fact.insert(3, 'product_id', productIds[position])  # Adiciona a chave do produto
+        fact['customer_id'] = fact['customer_id'].astype('int64')  # Garante a chave inteira do cliente
+        yield fact[list(factDtype)]  # Entrega o bloco na ordem das colunas da tabela fato
+
+def loadStarSchema(conn, chunks, customers, categoriesList, mode='replace'):
+    """Carrega as vendas no esquema estrela (dimensões, tabela fato e view `sales_flat`).
+
+    Args:
+        conn (sqlite3.Connection): Conexão com o banco de dados.
+        chunks (iterable): Blocos (DataFrames) com as colunas da tabela plana.
+        customers (pandas.DataFrame): Tabela de clientes (veja `customers.generateCustomerTable`).
+        categoriesList (dict): Dicionário com categorias e produtos.
+        mode (str, optional): Modo de carga da tabela fato ('replace' ou 'append'). Padrão é 'replace'.
+
+    Returns:
+        dict: Estatísticas da carga da tabela fato (veja `loader.loadSales`).
+    """
+    categories, products = buildProductDimension(categoriesList)  # Monta as dimensões de categorias e produtos
+    dimensions = {'categories': categories,
+                  'products': products[['product_id', 'product', 'category_id']],
+                  'customers': customers[['customer_id', 'customer', 'city', 'email', 'customer_birth_date']]
+                  }  # Define as linhas de cada dimensão
+    for ddl in dimensionsDdl:  # Itera sobre as definições das dimensões
+        conn.execute(ddl)  # Cria a dimensão caso não exista
+    if mode == 'append':  # Verifica se as vendas são acrescentadas à tabela fato existente
+        for tableName, frame in dimensions.items():  # Itera sobre as dimensões
+            upsertDimension(conn, tableName, frame)  # Grava as linhas novas e atualiza as existentes
+        conn.commit()  # Confirma as dimensões antes das vendas que as referenciam
+        stats = loadSales(conn, factChunks(chunks, products), 'sales', mode=mode, dtype=factDtype, indexes=factIndexes)  # Acrescenta as vendas à tabela fato
+        conn.execute(salesFlatView)  # Cria a view de compatibilidade caso não exista (a view existente não é tocada)
+        conn.commit()  # Confirma a criação da view
+    else:
+        stats = loadSales(conn, factChunks(chunks, products), 'sales', mode=mode, dtype=factDtype, indexes=factIndexes,
+                          views={'sales_flat': salesFlatView},
+                          onSwap=lambda swapConn: replaceDimensions(swapConn, dimensions))  # Troca a tabela fato, reescreve as dimensões e recria a view na mesma transação
+    return stats  # Retorna as estatísticas da carga
+
+def salesSource(conn):
+    """Define de onde as consultas devem ler as vendas com as colunas da tabela plana.
+
+    Args:
+        conn (sqlite3.Connection): Conexão com o banco de dados.
+
+    Returns:
+        str: 'sales_flat' se o banco estiver no modo normalizado, ou 'sales' no layout plano.
+    """
+    found = conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'view' AND name = 'sales_flat'").fetchone()  # Procura a view de compatibilidade
+    return 'sales_flat' if found else 'sales'  # Retorna a origem das vendas
+
+def migrateDateColumns(conn):
+    """Adiciona as colunas inteiras de data e os índices a uma tabela 'sales' plana antiga.
+
+    Bancos gerados antes das colunas 'sales_year', 'sales_month' e 'sales_day' são atualizados
+    uma única vez; em bancos já atualizados a função não faz nada.
+
+    Args:
+        conn (sqlite3.Connection): Conexão com o banco de dados.
+
+    Returns:
+        bool: True se a tabela foi atualizada.
+    """
+    columns = [row[1] for row in conn.execute("PRAGMA table_info(sales)")]  # Lista as colunas da tabela 'sales'
+    if not columns or 'sales_day' in columns:  # Verifica se a tabela não existe ou já está atualizada
+        return False  # Não há nada a atualizar
+    for col in ('sales_year', 'sales_month', 'sales_day'):  # Itera sobre as novas colunas
+        conn.execute(f"ALTER TABLE sales ADD COLUMN {col} INTEGER")  # Adiciona a coluna
+    conn.execute("""
+        UPDATE sales
+        SET sales_year = CAST(STRFTIME('%Y', sales_date) AS INTEGER),
+            sales_month = CAST(STRFTIME('%m', sales_date) AS INTEGER),
+            sales_day = CAST(JULIANDAY(DATE(sales_date)) - 2440587.5 AS INTEGER)
+    """)  # Preenche as colunas a partir de 'sales_date' (uma única vez)
+    createIndexes(conn, 'sales', salesIndexes)  # Cria os índices de cobertura
+    conn.commit()  # Confirma a atualização
+    return True  # Informa que a tabela foi atualizada
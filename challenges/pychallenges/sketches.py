@@ -0,0 +1,318 @@
+"""
+Rankings aproximados com memória limitada (sketches de heavy hitters).
+
+`SpaceSaving` guarda no máximo `capacity` contadores por ranking, então a memória não cresce
+com o número de clientes, produtos ou cidades. Cada bloco é pré-agregado por chave e combinado
+ao resumo com a regra de união do Space-Saving (chaves ausentes de um lado contam como o menor
+contador daquele lado), o que mantém a garantia clássica: a estimativa de cada chave passa do
+valor exato em no máximo `total / capacity` (com `capacity = ceil(1 / epsilon)`, no máximo
+`epsilon` do total). A mesma regra combina resumos de blocos, processos ou cargas diferentes,
+e os resumos podem ser gravados como dicionários simples (JSON).
+
+`ApproxSalesReport` é o `SalesReport` com os rankings por produto, cliente e cidade trocados
+por sketches; o faturamento mensal e os totais continuam exatos.
+"""
+
+import math  # Importa a biblioteca math para calcular a capacidade a partir do erro
+
+import numpy as np  # Importa a biblioteca NumPy para operações numéricas
+import pandas as pd  # Importa a biblioteca Pandas para manipulação de dados
+
+from .analytics import SalesReport, vipThreshold  # Importa o relatório exato e o limite de cliente VIP
+
+defaultEpsilon = 0.001  # Define o erro padrão dos sketches (0,1% do total)
+
+sketchColumns = {'productQuantity': ('product', 'sales_quantity'),
+                 'customerRevenue': ('customer', 'total_price'),
+                 'cityQuantity': ('city', 'sales_quantity')
+                 }  # Define, para cada ranking, a coluna da chave e a coluna somada
+
+exactTopQueries = {'topProducts': '''
+        SELECT product, SUM(sales_quantity) AS total
+        FROM {salesSource}
+        GROUP BY product
+        ORDER BY SUM(sales_quantity) DESC
+        LIMIT ?
+    ''', 'topCustomers': '''
+        SELECT customer, SUM(total_price) AS total
+        FROM {salesSource}
+        GROUP BY customer
+        ORDER BY SUM(total_price) DESC
+        LIMIT ?
+    ''', 'topCities': '''
+        SELECT city, SUM(sales_quantity) AS total
+        FROM {salesSource}
+        GROUP BY city
+        ORDER BY SUM(sales_quantity) DESC
+        LIMIT ?
+    '''}  # Define as consultas exatas usadas para medir a precisão dos rankings aproximados
+
+def plainIndex(series):
+    """Troca um índice categórico pelo índice com os valores, para combinar séries de blocos diferentes.
+
+    Args:
+        series (pandas.Series): Série indexada por chave.
+
+    Returns:
+        pandas.Series: Série com um índice não categórico.
+    """
+    if isinstance(series.index, pd.CategoricalIndex):  # Verifica se o índice é categórico
+        series.index = series.index.astype(series.index.categories.dtype)  # Converte o índice para os valores das categorias
+    return series  # Retorna a série
+
+class SpaceSaving:
+    """Resumo Space-Saving ponderado, combinável e serializável.
+
+    Args:
+        epsilon (float, optional): Erro máximo das estimativas, como fração do total. Padrão é 0.001.
+        capacity (int, optional): Número de contadores; se informado, substitui `epsilon`.
+    """
+
+    def __init__(self, epsilon=defaultEpsilon, capacity=None):
+        self.capacity = capacity if capacity is not None else math.ceil(1 / epsilon)  # Define o número de contadores a partir do erro
+        self.counts = pd.Series(dtype='float64')  # Inicializa as estimativas por chave
+        self.errors = pd.Series(dtype='float64')  # Inicializa o erro máximo de cada estimativa
+        self.total = 0.0  # Inicializa o peso total resumido
+
+    @property
+    def minCount(self):
+        """Maior valor possível de uma chave fora do resumo (0 enquanto há contadores livres).
+
+        Returns:
+            float: Menor contador quando o resumo está cheio, ou 0.
+        """
+        return float(self.counts.min()) if len(self.counts) >= self.capacity else 0.0  # Retorna o menor contador do resumo cheio
+
+    @property
+    def errorBound(self):
+        """Erro máximo garantido de qualquer estimativa.
+
+        Returns:
+            float: Total resumido dividido pelo número de contadores.
+        """
+        return self.total / self.capacity  # Retorna a garantia do Space-Saving
+
+    def combine(self, counts, errors, otherMin, otherTotal):
+        """Combina contadores (de um bloco ou de outro resumo) com o resumo.
+
+        Args:
+            counts (pandas.Series): Contadores por chave.
+            errors (pandas.Series): Erro máximo de cada contador.
+            otherMin (float): Maior valor possível de uma chave ausente em `counts`.
+            otherTotal (float): Peso total representado por `counts`.
+        """
+        selfMin = self.minCount  # Obtém o maior valor possível de uma chave ausente no resumo
+        keys = self.counts.index.union(counts.index)  # Une as chaves dos dois lados
+        merged = self.counts.reindex(keys, fill_value=selfMin) + counts.reindex(keys, fill_value=otherMin)  # Soma as estimativas, completando as ausentes com o menor contador
+        mergedErrors = self.errors.reindex(keys, fill_value=selfMin) + errors.reindex(keys, fill_value=otherMin)  # Soma os erros da mesma forma
+        keep = merged.nlargest(self.capacity).index  # Mantém apenas os maiores contadores
+        self.counts = merged[keep]  # Guarda as estimativas mantidas
+        self.errors = mergedErrors[keep]  # Guarda os erros das estimativas mantidas
+        self.total += otherTotal  # Soma o peso total
+
+    def update(self, keys, weights):
+        """Acumula um bloco de pares chave e peso.
+
+        Args:
+            keys (pandas.Series): Chave de cada linha.
+            weights (pandas.Series): Peso de cada linha (quantidade ou valor).
+
+        Returns:
+            SpaceSaving: O próprio resumo, para encadear chamadas.
+        """
+        grouped = plainIndex(weights.groupby(keys, sort=False, observed=True).sum().astype('float64'))  # Pré-agrega o bloco por chave (valores exatos)
+        self.combine(grouped, pd.Series(0.0, index=grouped.index), 0.0, float(grouped.sum()))  # Combina o bloco com o resumo
+        return self  # Retorna o resumo
+
+    def merge(self, other):
+        """Combina outro resumo com este (mesmo resultado, dentro do erro, de uma passagem única).
+
+        Args:
+            other (SpaceSaving): Resumo calculado sobre outra parte dos dados.
+
+        Returns:
+            SpaceSaving: O próprio resumo, para encadear chamadas.
+        """
+        self.combine(other.counts, other.errors, other.minCount, other.total)  # Combina os contadores do outro resumo
+        return self  # Retorna o resumo
+
+    def top(self, k):
+        """Lista as k chaves com maior estimativa.
+
+        Args:
+            k (int): Número de chaves.
+
+        Returns:
+            pandas.DataFrame: Estimativa, erro máximo e limite inferior de cada chave, em ordem decrescente.
+        """
+        counts = self.counts.sort_values(ascending=False, kind='stable')[:k]  # Seleciona as maiores estimativas
+        errors = self.errors[counts.index]  # Obtém os erros das estimativas
+        return pd.DataFrame({'estimate': counts, 'error': errors, 'lowerBound': counts - errors})  # Retorna o ranking com os limites
+
+    def toDict(self):
+        """Converte o resumo para um dicionário simples (serializável em JSON).
+
+        Returns:
+            dict: Dicionário com 'capacity', 'total', 'keys', 'counts' e 'errors'.
+        """
+        return {'capacity': self.capacity,
+                'total': self.total,
+                'keys': self.counts.index.tolist(),
+                'counts': self.counts.tolist(),
+                'errors': self.errors.tolist()
+                }  # Retorna o resumo como dicionário
+
+    @classmethod
+    def fromDict(cls, data):
+        """Reconstrói um resumo gravado com `toDict`.
+
+        Args:
+            data (dict): Dicionário gerado por `toDict`.
+
+        Returns:
+            SpaceSaving: Resumo reconstruído.
+        """
+        sketch = cls(capacity=data['capacity'])  # Cria o resumo com a mesma capacidade
+        sketch.counts = pd.Series(data['counts'], index=data['keys'], dtype='float64')  # Restaura as estimativas
+        sketch.errors = pd.Series(data['errors'], index=data['keys'], dtype='float64')  # Restaura os erros
+        sketch.total = data['total']  # Restaura o peso total
+        return sketch  # Retorna o resumo
+
+class ApproxSalesReport(SalesReport):
+    """Relatório de vendas com rankings aproximados em memória limitada.
+
+    Args:
+        epsilon (float, optional): Erro máximo dos rankings, como fração do total. Padrão é 0.001.
+    """
+
+    def __init__(self, epsilon=defaultEpsilon):
+        super().__init__()  # Inicializa o faturamento mensal e os totais exatos
+        self.epsilon = epsilon  # Guarda o erro máximo
+        self.sketches = {name: SpaceSaving(epsilon) for name in sketchColumns}  # Cria um resumo por ranking
+
+    def updateRankings(self, chunk):
+        """Acumula os rankings aproximados de um bloco.
+
+        Args:
+            chunk (pandas.DataFrame): Bloco de vendas.
+        """
+        for name, (keyColumn, valueColumn) in sketchColumns.items():  # Itera sobre os rankings
+            self.sketches[name].update(chunk[keyColumn], chunk[valueColumn])  # Acumula o bloco no resumo
+
+    def mergeRankings(self, other):
+        """Combina os rankings aproximados de outro relatório parcial.
+
+        Args:
+            other (ApproxSalesReport): Relatório parcial calculado sobre outra parte dos dados.
+        """
+        for name, sketch in self.sketches.items():  # Itera sobre os rankings
+            sketch.merge(other.sketches[name])  # Combina o resumo
+
+    def result(self, numCustomer=None):
+        """Monta as métricas finais do relatório com os rankings aproximados.
+
+        Args:
+            numCustomer (int, optional): Número de clientes usado na média de valor gasto. Sem
+                ele a média fica em 0, pois o resumo não conta os clientes distintos.
+
+        Returns:
+            dict: As mesmas chaves de `SalesReport.result`, com 'vips' listando os candidatos
+                ('Sim' quando garantido, 'Talvez' quando depende do erro), mais 'vipsComplete'
+                (True se nenhum VIP pode ter ficado fora do resumo) e 'errorBounds'.
+        """
+        report = super().result(numCustomer)  # Monta o faturamento mensal e os totais exatos
+        for key, name, k in (('topProducts', 'productQuantity', 10), ('topCustomers', 'customerRevenue', 5), ('topCities', 'cityQuantity', 10)):  # Itera sobre os rankings do relatório
+            keyColumn, valueColumn = sketchColumns[name]  # Obtém as colunas do ranking
+            ranking = self.sketches[name].top(k)['estimate'].rename(valueColumn).rename_axis(keyColumn)  # Monta o ranking a partir do resumo
+            report[key] = ranking.round().astype('int64') if valueColumn == 'sales_quantity' else ranking  # Volta as quantidades para inteiros
+
+        customers = self.sketches['customerRevenue']  # Obtém o resumo do valor gasto por cliente
+        candidates = customers.top(customers.capacity)  # Lista todos os clientes do resumo
+        candidates = candidates[candidates['estimate'] > vipThreshold].sort_index()  # Mantém os clientes que podem ser VIP
+        report['vips'] = pd.DataFrame({'customer': candidates.index,
+                                       'total_price': candidates['estimate'].to_numpy(),
+                                       'vip': np.where(candidates['lowerBound'] > vipThreshold, 'Sim', 'Talvez')
+                                       })  # Marca os VIPs garantidos e os incertos
+        report['vipsComplete'] = customers.minCount <= vipThreshold  # Verifica se um VIP pode ter ficado fora do resumo
+        report['errorBounds'] = {name: sketch.errorBound for name, sketch in self.sketches.items()}  # Guarda o erro máximo de cada ranking
+        return report  # Retorna as métricas do relatório
+
+    def toDict(self):
+        """Converte os resumos para um dicionário simples (serializável em JSON).
+
+        Returns:
+            dict: Dicionário com 'epsilon' e o resumo de cada ranking.
+        """
+        return {'epsilon': self.epsilon, 'sketches': {name: sketch.toDict() for name, sketch in self.sketches.items()}}  # Retorna os resumos
+
+    @classmethod
+    def fromDict(cls, data):
+        """Reconstrói os resumos gravados com `toDict` (os totais exatos não são gravados).
+
+        Args:
+            data (dict): Dicionário gerado por `toDict`.
+
+        Returns:
+            ApproxSalesReport: Relatório com os resumos restaurados.
+        """
+        report = cls(data['epsilon'])  # Cria o relatório com o mesmo erro
+        report.sketches = {name: SpaceSaving.fromDict(sketch) for name, sketch in data['sketches'].items()}  # Restaura os resumos
+        return report  # Retorna o relatório
+
+def vipCountLabel(report):
+    """Formata o número de clientes VIP de um relatório, exato ou aproximado.
+
+    No relatório aproximado a lista de VIPs é limitada à capacidade do sketch de clientes;
+    quando `vipsComplete` é False, VIPs podem ter ficado fora do resumo e o número é apenas um
+    limite inferior.
+
+    Args:
+        report (dict): Resultado de `SalesReport.result` ou de `ApproxSalesReport.result`.
+
+    Returns:
+        str: Número de VIPs confirmados, os incertos ('Talvez') e o aviso de limite inferior.
+    """
+    confirmed = int((report['vips']['vip'] == 'Sim').sum())  # Conta os VIPs confirmados
+    uncertain = int((report['vips']['vip'] == 'Talvez').sum())  # Conta os VIPs incertos (apenas no modo aproximado)
+    label = f"{confirmed}" + (f" (+{uncertain} incertos)" if uncertain else "")  # Monta o número de VIPs
+    if report.get('vipsComplete', True):  # Verifica se a lista de VIPs está completa
+        return label  # Retorna o número de VIPs
+    return f"pelo menos {label}; o resumo aproximado descartou clientes acima do limite VIP (use um epsilon menor ou o relatório exato)"  # Retorna o limite inferior com o aviso
+
+def compareTopK(approx, exact):
+    """Compara um ranking aproximado com o ranking exato.
+
+    Args:
+        approx (pandas.Series): Ranking aproximado (chave e estimativa).
+        exact (pandas.Series): Ranking exato (chave e total), com o mesmo tamanho.
+
+    Returns:
+        dict: Dicionário com 'k', 'recall' (fração das chaves exatas encontradas), 'sameOrder'
+            e 'maxRelativeError' (maior erro relativo das chaves em comum). Empates na última
+            posição podem reduzir o recall mesmo com estimativas exatas.
+    """
+    common = exact.index.intersection(approx.index)  # Obtém as chaves presentes nos dois rankings
+    relative = (approx[common] - exact[common]).abs() / exact[common]  # Calcula o erro relativo das chaves em comum
+    return {'k': len(exact),
+            'recall': len(common) / len(exact) if len(exact) else 1.0,
+            'sameOrder': list(approx.index) == list(exact.index),
+            'maxRelativeError': float(relative.max()) if len(common) else 0.0
+            }  # Retorna as medidas de precisão
+
+def compareWithSql(conn, report, salesSource='sales'):
+    """Mede a precisão dos rankings aproximados contra as consultas exatas no SQLite.
+
+    Args:
+        conn (sqlite3.Connection): Conexão com o banco de dados.
+        report (dict): Resultado de `ApproxSalesReport.result`.
+        salesSource (str, optional): Tabela ou view com as vendas. Padrão é 'sales'.
+
+    Returns:
+        pandas.DataFrame: Uma linha por ranking com 'k', 'recall', 'sameOrder' e 'maxRelativeError'.
+    """
+    rows = {}  # Inicializa as medidas por ranking
+    for key, sql in exactTopQueries.items():  # Itera sobre os rankings
+        approx = report[key]  # Obtém o ranking aproximado
+        exact = pd.read_sql(sql.format(salesSource=salesSource), conn, params=(len(approx),))  # Executa a consulta exata com o mesmo tamanho
+        rows[key] = compareTopK(approx, exact.set_index(exact.columns[0])['total'])  # Compara os rankings
+    return pd.DataFrame.from_dict(rows, orient='index')  # Retorna as medidas de precisão
@@ -0,0 +1,284 @@
+"""
+Camada de saída dos dados gerados: CSV (opcionalmente comprimido) ou Parquet particionado.
+
+Os blocos dos geradores são gravados um a um, sem juntar tudo em memória. No Parquet as
+colunas de texto repetitivas viram categorias (codificação de dicionário), as datas ficam
+como datas e os arquivos podem ser particionados por ano e mês da venda
+(`sales_year=2024/sales_month=3/...`). Na leitura é possível escolher só as colunas
+necessárias, descartar partições pelo filtro e mapear os arquivos em memória em vez de
+interpretar texto. O Parquet depende do `pyarrow`, importado apenas quando usado.
+"""
+
+import bz2  # Importa a biblioteca bz2 para gravar CSV comprimido em bzip2
+import gzip  # Importa a biblioteca gzip para gravar CSV comprimido em gzip
+import lzma  # Importa a biblioteca lzma para gravar CSV comprimido em xz
+import os  # Importa a biblioteca os para manipulação de caminhos
+import shutil  # Importa a biblioteca shutil para remover saídas anteriores
+import time  # Importa a biblioteca time para medir a duração da gravação e da leitura
+
+import pandas as pd  # Importa a biblioteca Pandas para manipulação de dados
+
+from .loader import addDateColumns  # Importa a função que materializa as colunas inteiras de data
+
+csvOpeners = {'.gz': gzip.open,
+              '.bz2': bz2.open,
+              '.xz': lzma.open
+              }  # Define a função de abertura de cada extensão de CSV comprimido
+
+datasetMarker = '_pychallenges'  # Define o arquivo que identifica as pastas Parquet gravadas por `writeParquet` (ignorado na leitura pelo prefixo '_')
+defaultPartitionCols = ['sales_year', 'sales_month']  # Define as colunas de partição padrão do Parquet
+categoryMaxRatio = 0.5  # Define a proporção máxima de valores distintos para uma coluna de texto virar categoria
+
+def importPyarrow():
+    """Importa o `pyarrow` apenas quando o Parquet é usado.
+
+    Returns:
+        tuple: Módulos `pyarrow`, `pyarrow.parquet` e `pyarrow.dataset`.
+    """
+    try:
+        import pyarrow as pa  # Importa o pyarrow
+        import pyarrow.dataset as ds  # Importa a leitura de conjuntos de arquivos do pyarrow
+        import pyarrow.parquet as pq  # Importa a leitura e gravação de Parquet do pyarrow
+    except ImportError as error:
+        raise ImportError("O formato Parquet precisa do pacote 'pyarrow' (pip install pyarrow)") from error  # Interrompe com a instrução de instalação
+    return pa, pq, ds  # Retorna os módulos
+
+def outputFormat(path):
+    """Define o formato de saída a partir do caminho.
+
+    Args:
+        path (str): Caminho do arquivo ou da pasta de saída.
+
+    Returns:
+        str: 'parquet' para caminhos terminados em '.parquet' ou sem extensão, senão 'csv'.
+    """
+    root, ext = os.path.splitext(path)  # Separa a extensão do caminho
+    if ext in csvOpeners:  # Verifica se o caminho é de um CSV comprimido
+        ext = os.path.splitext(root)[1]  # Considera a extensão antes da compressão
+    return 'csv' if ext == '.csv' else 'parquet'  # Retorna o formato de saída
+
+def categoryColumns(chunk):
+    """Seleciona as colunas de texto com muitos valores repetidos.
+
+    Args:
+        chunk (pandas.DataFrame): Bloco de vendas (normalmente o primeiro bloco gerado).
+
+    Returns:
+        list: Nomes das colunas que devem ser gravadas como categoria.
+    """
+    return [col for col in chunk.columns
+            if pd.api.types.is_string_dtype(chunk[col]) and chunk[col].nunique() <= categoryMaxRatio * len(chunk)]  # Retorna as colunas de texto repetitivas
+
+def compactChunk(chunk, categoryCols):
+    """Ajusta os tipos de um bloco para gravação em Parquet.
+
+    Args:
+        chunk (pandas.DataFrame): Bloco de vendas.
+        categoryCols (list): Colunas convertidas para categoria (as mesmas em todos os blocos).
+
+    Returns:
+        pandas.DataFrame: Bloco com textos repetitivos como categoria e as colunas inteiras de data.
+    """
+    if 'sales_date' in chunk and 'sales_day' not in chunk:  # Verifica se o bloco ainda não tem as colunas inteiras de data
+        chunk = addDateColumns(chunk)  # Materializa o ano, o mês e o dia de cada venda
+    return chunk.astype({col: 'category' for col in categoryCols})  # Retorna o bloco com as colunas de texto repetitivas como categoria
+
+def writeCsv(chunks, path):
+    """Grava os blocos em um único CSV, comprimido de acordo com a extensão do arquivo.
+
+    Args:
+        chunks (iterable): Blocos (DataFrames) a serem gravados.
+        path (str): Caminho do CSV ('.csv', '.csv.gz', '.csv.bz2' ou '.csv.xz').
+
+    Returns:
+        int: Número de linhas gravadas.
+    """
+    opener = csvOpeners.get(os.path.splitext(path)[1], open)  # Escolhe a função de abertura pela extensão
+    rows = 0  # Inicializa o contador de linhas gravadas
+    with opener(path, 'wt', newline='', encoding='utf-8') as file:  # Abre o arquivo de saída em modo texto
+        for chunkIdx, chunk in enumerate(chunks):  # Itera sobre os blocos
+            chunk.to_csv(file, index=False, header=(chunkIdx == 0))  # Grava o bloco (com cabeçalho apenas no primeiro)
+            rows += len(chunk)  # Atualiza o contador de linhas gravadas
+    return rows  # Retorna o número de linhas gravadas
+
+def writeParquet(chunks, path, partitionCols=defaultPartitionCols, compression='zstd', basename='part'):
+    """Grava os blocos como um conjunto de arquivos Parquet, opcionalmente particionado.
+
+    Args:
+        chunks (iterable): Blocos (DataFrames) a serem gravados.
+        path (str): Pasta de saída (ou arquivo, quando não há partição).
+        partitionCols (list, optional): Colunas de partição. Padrão é ano e mês da venda.
+        compression (str, optional): Codec de compressão do Parquet. Padrão é 'zstd'.
+        basename (str, optional): Prefixo dos arquivos gravados (útil para shards na mesma pasta). Padrão é 'part'.
+
+    Returns:
+        int: Número de linhas gravadas.
+    """
+    pa, pq, _ = importPyarrow()  # Importa o pyarrow
+    if partitionCols:  # Verifica se a saída é uma pasta de partições
+        os.makedirs(path, exist_ok=True)  # Cria a pasta do conjunto (mesmo sem nenhum bloco)
+        open(os.path.join(path, datasetMarker), 'w').close()  # Marca a pasta como um conjunto gravado por esta função
+    rows = 0  # Inicializa o contador de linhas gravadas
+    writer = None  # Inicializa o gravador do arquivo único (sem partição)
+    categoryCols = None  # Inicializa as colunas gravadas como categoria
+    for chunkIdx, chunk in enumerate(chunks):  # Itera sobre os blocos
+        if categoryCols is None:  # Verifica se é o primeiro bloco
+            categoryCols = categoryColumns(chunk)  # Define as colunas de categoria pelo primeiro bloco, para que todos os arquivos tenham o mesmo esquema
+        table = pa.Table.from_pandas(compactChunk(chunk, categoryCols), preserve_index=False)  # Converte o bloco para uma tabela do Arrow
+        if partitionCols:  # Verifica se a saída é particionada
+            pq.write_to_dataset(table, path, partition_cols=partitionCols, compression=compression,
+                                basename_template=f"{basename}-{chunkIdx:05d}-{{i}}.parquet")  # Grava o bloco nas pastas das partições
+        else:
+            if writer is None:  # Verifica se é o primeiro bloco
+                writer = pq.ParquetWriter(path, table.schema, compression=compression)  # Abre o arquivo com o esquema do primeiro bloco
+            writer.write_table(table.cast(writer.schema))  # Grava o bloco como um novo grupo de linhas
+        rows += len(chunk)  # Atualiza o contador de linhas gravadas
+    if writer is not None:  # Verifica se o arquivo único foi aberto
+        writer.close()  # Fecha o arquivo
+    return rows  # Retorna o número de linhas gravadas
+
+def removeOutput(path):
+    """Remove a saída anterior de `writeSales`.
+
+    Pastas só são removidas se forem reconhecidamente um conjunto Parquet: terminadas em
+    '.parquet' ou marcadas por `writeParquet`. Qualquer outra pasta (por exemplo '.' ou
+    'data') é preservada e a gravação é recusada.
+
+    Args:
+        path (str): Caminho do arquivo ou da pasta de saída.
+
+    Raises:
+        FileExistsError: Se o caminho é uma pasta que não é um conjunto Parquet.
+    """
+    if os.path.isdir(path):  # Verifica se existe uma pasta no caminho
+        if not (path.rstrip(os.sep).endswith('.parquet') or os.path.exists(os.path.join(path, datasetMarker))):  # Verifica se a pasta é um conjunto Parquet
+            raise FileExistsError(f"A pasta '{path}' não é um conjunto Parquet gravado por writeSales; escolha outro caminho de saída")  # Recusa remover uma pasta qualquer
+        shutil.rmtree(path)  # Remove o conjunto anterior
+    elif os.path.exists(path):  # Verifica se existe um arquivo anterior
+        os.remove(path)  # Remove o arquivo anterior
+
+def writeSales(chunks, path, partitionCols=defaultPartitionCols, compression='zstd', overwrite=True, fmt=None):
+    """Grava os blocos de vendas no formato definido pela extensão do caminho (ou por `fmt`).
+
+    Args:
+        chunks (iterable): Blocos (DataFrames) a serem gravados.
+        path (str): Caminho de saída. '.csv', '.csv.gz', '.csv.bz2' ou '.csv.xz' gravam CSV;
+            uma pasta ou '.parquet' grava Parquet.
+        partitionCols (list, optional): Colunas de partição do Parquet. Padrão é ano e mês da venda.
+        compression (str, optional): Codec de compressão do Parquet. Padrão é 'zstd'.
+        overwrite (bool, optional): Se a saída anterior deve ser removida. Padrão é True.
+        fmt (str, optional): Formato de saída ('csv' ou 'parquet'). Padrão é o definido pela extensão.
+
+    Returns:
+        dict: Estatísticas da gravação com 'rows', 'bytes' e 'seconds'.
+
+    Raises:
+        FileExistsError: Se o caminho é uma pasta que não é um conjunto Parquet (veja `removeOutput`).
+    """
+    start = time.perf_counter()  # Marca o início da gravação
+    if os.path.dirname(path):  # Verifica se o caminho tem uma pasta
+        os.makedirs(os.path.dirname(path), exist_ok=True)  # Cria a pasta de saída caso não exista
+    if overwrite:  # Verifica se a saída anterior deve ser removida
+        removeOutput(path)  # Remove a saída anterior (apenas conjuntos Parquet reconhecíveis, no caso de pastas)
+
+    if (fmt or outputFormat(path)) == 'csv':  # Verifica se a saída é CSV
+        rows = writeCsv(chunks, path)  # Grava o CSV
+    else:
+        rows = writeParquet(chunks, path, partitionCols, compression)  # Grava o Parquet
+    return {'rows': rows, 'bytes': pathSize(path), 'seconds': time.perf_counter() - start}  # Retorna as estatísticas da gravação
+
+def pathSize(path):
+    """Calcula o tamanho em bytes de um arquivo ou de uma pasta.
+
+    Args:
+        path (str): Caminho do arquivo ou da pasta.
+
+    Returns:
+        int: Tamanho total em bytes (0 se nada foi gravado).
+    """
+    if not os.path.exists(path):  # Verifica se a gravação não criou nada (nenhum bloco)
+        return 0  # Nada foi gravado
+    if not os.path.isdir(path):  # Verifica se o caminho é um arquivo
+        return os.path.getsize(path)  # Retorna o tamanho do arquivo
+    return sum(os.path.getsize(os.path.join(root, name)) for root, _, names in os.walk(path) for name in names)  # Soma o tamanho dos arquivos da pasta
+
+def parquetDataset(path):
+    """Abre um conjunto Parquet (particionado no padrão 'coluna=valor' ou arquivo único).
+
+    Args:
+        path (str): Pasta ou arquivo Parquet.
+
+    Returns:
+        pyarrow.dataset.Dataset: Conjunto de dados para leitura.
+    """
+    _, _, ds = importPyarrow()  # Importa o pyarrow
+    return ds.dataset(path, format='parquet', partitioning='hive')  # Abre o conjunto com as partições no nome das pastas
+
+def readSales(path, columns=None, filters=None, memoryMap=True):
+    """Lê as vendas gravadas por `writeSales`.
+
+    Args:
+        path (str): Caminho do CSV ou do conjunto Parquet.
+        columns (list, optional): Colunas lidas (projeção). Padrão é todas.
+        filters (list, optional): Filtros do Parquet no formato [('coluna', 'op', valor), ...];
+            filtros nas colunas de partição descartam pastas inteiras sem abri-las. Padrão é nenhum.
+        memoryMap (bool, optional): Se os arquivos Parquet devem ser mapeados em memória. Padrão é True.
+
+    Returns:
+        pandas.DataFrame: DataFrame com as vendas.
+    """
+    if outputFormat(path) == 'csv':  # Verifica se a origem é CSV
+        if filters:  # Verifica se foram pedidos filtros
+            raise ValueError("Filtros só são suportados na leitura de Parquet")  # Interrompe, pois o CSV não tem partições
+        header = pd.read_csv(path, nrows=0).columns  # Lê apenas o cabeçalho do CSV
+        dateCols = [col for col in header if col.endswith('date') and (columns is None or col in columns)]  # Seleciona as colunas de data lidas
+        return pd.read_csv(path, usecols=columns, parse_dates=dateCols)  # Lê o CSV interpretando as datas
+    _, pq, _ = importPyarrow()  # Importa o pyarrow
+    table = pq.read_table(path, columns=columns, filters=filters, memory_map=memoryMap, partitioning='hive')  # Lê apenas as colunas e partições pedidas
+    return table.to_pandas()  # Converte para DataFrame
+
+def readParquetChunks(path, columns=None, filters=None, batchSize=200_000):
+    """Lê um conjunto Parquet em partes, para análises sobre dados maiores que a memória.
+
+    Args:
+        path (str): Pasta ou arquivo Parquet.
+        columns (list, optional): Colunas lidas (projeção). Padrão é todas.
+        filters (list, optional): Filtros no formato [('coluna', 'op', valor), ...]. Padrão é nenhum.
+        batchSize (int, optional): Número máximo de linhas por parte. Padrão é 200.000.
+
+    Yields:
+        pandas.DataFrame: Uma parte das vendas.
+    """
+    _, pq, _ = importPyarrow()  # Importa o pyarrow
+    expression = pq.filters_to_expression(filters) if filters else None  # Converte os filtros para uma expressão do Arrow
+    for batch in parquetDataset(path).to_batches(columns=columns, filter=expression, batch_size=batchSize):  # Itera sobre as partes lidas
+        yield batch.to_pandas()  # Entrega a parte como DataFrame
+
+def benchmarkFormats(makeChunks, outputDir, paths=('sales.csv', 'sales.csv.gz', 'sales.parquet'), columns=None, filters=None):
+    """Compara tamanho em disco e tempo de gravação e leitura de cada formato de saída.
+
+    Args:
+        makeChunks (callable): Função sem argumentos que retorna um novo gerador de blocos (mesmos dados a cada chamada).
+        outputDir (str): Pasta onde os arquivos de teste são gravados.
+        paths (tuple, optional): Nomes de saída comparados (a extensão define o formato).
+        columns (list, optional): Colunas da leitura parcial. Padrão é ['product', 'sales_quantity'].
+        filters (list, optional): Filtros da leitura parcial no Parquet. Padrão é o mês 3.
+
+    Returns:
+        pandas.DataFrame: Uma linha por formato com 'bytes', 'writeSeconds', 'readSeconds' e 'readPartialSeconds'.
+    """
+    columns = columns or ['product', 'sales_quantity']  # Define as colunas da leitura parcial
+    filters = filters if filters is not None else [('sales_month', '=', 3)]  # Define o filtro da leitura parcial
+    results = []  # Inicializa a lista de resultados
+    for name in paths:  # Itera sobre os formatos comparados
+        path = os.path.join(outputDir, name)  # Define o caminho de saída
+        stats = writeSales(makeChunks(), path)  # Grava os dados no formato
+        start = time.perf_counter()  # Marca o início da leitura completa
+        readSales(path)  # Lê todos os dados
+        readSeconds = time.perf_counter() - start  # Calcula a duração da leitura completa
+        start = time.perf_counter()  # Marca o início da leitura parcial
+        isParquet = outputFormat(path) == 'parquet'  # Verifica se o formato aceita filtros
+        readSales(path, columns=columns, filters=filters if isParquet else None)  # Lê apenas as colunas (e partições) pedidas
+        results.append({'format': name, 'rows': stats['rows'], 'bytes': stats['bytes'], 'writeSeconds': stats['seconds'],
+                        'readSeconds': readSeconds, 'readPartialSeconds': time.perf_counter() - start})  # Guarda as medições do formato
+    return pd.DataFrame(results)  # Retorna a comparação